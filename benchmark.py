@@ -0,0 +1,1260 @@
+import argparse
+import collections
+import json
+import math
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+"""Roda sem janela (driver de vídeo dummy do SDL)"""
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from constants import WIDTH, HEIGHT, FPS, SIM_RATE, SIM_DT, MAX_SIM_STEPS, TASK_DURATION, GAME_STATE_PLAYING
+from camera import Camera
+from graphics import Graphics, FanSpriteCache, texture_color, rect_segments, fan_model
+from viewport import Viewport
+from menu import MenuSystem
+from player import Player
+from game import Game
+from collision import CollisionGrid
+from clipping import cohen_sutherland_clip, cohen_sutherland_clip_many
+from level import load_level
+from main import draw_background, render_background, draw_frame, create_game as create_main_game, BACKGROUND_CACHE
+from render_thread import SnapshotBuffer, FrameBuffer, RenderThread
+from tiles import TileRenderer
+from transformations import Affine
+from dirty import DirtyRegion
+
+
+"""Resultados de todos os benchmarks executados (gravados em JSON com --json)"""
+RESULTS = {}
+
+"""Passo de tempo fixo (s) usado nos frames roteirizados, para resultados determinísticos"""
+FRAME_DT = 1.0 / 60
+
+
+def measure(func, repeat=5):
+    """
+    Mede o tempo de uma função
+    ---------------------------
+    Executa func repeat vezes e retorna o melhor tempo em milissegundos.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000.0
+
+
+def report(title, results):
+    """Imprime uma tabela com os tempos (ms) e o ganho em relação à primeira linha."""
+    print(title)
+    baseline = results[0][1]
+    for name, ms in results:
+        speedup = baseline / ms if ms > 0 else float("inf")
+        print(f"  {name:<28} {ms:10.3f} ms   {speedup:8.1f}x")
+    RESULTS[title] = {name: ms for name, ms in results}
+
+
+def percentile(values, p):
+    """Percentil p (0-100) de values pelo método do posto mais próximo."""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * p // 100))
+    return ordered[int(rank) - 1]
+
+
+def report_percentiles(title, times):
+    """
+    Imprime os percentis (ms) de cada etapa do frame
+    -------------------------------------------------
+    times: dicionário etapa -> lista de tempos (ms), um por frame.
+    """
+    print(title)
+    print(f"  {'etapa':<12} {'p50':>9} {'p90':>9} {'p99':>9} {'máx':>9}   (ms)")
+    stats = {}
+    for stage, values in times.items():
+        stats[stage] = {
+            "p50": percentile(values, 50),
+            "p90": percentile(values, 90),
+            "p99": percentile(values, 99),
+            "max": max(values),
+            "mean": sum(values) / len(values),
+            "frames": len(values),
+        }
+        row = stats[stage]
+        print(f"  {stage:<12} {row['p50']:9.3f} {row['p90']:9.3f} {row['p99']:9.3f} {row['max']:9.3f}")
+    RESULTS[title] = stats
+
+
+def run_frames(stages, frames, before_frame):
+    """
+    Executa frames roteirizados medindo cada etapa
+    -----------------------------------------------
+    stages: lista de (nome, função) desenhada a cada frame, na ordem
+    before_frame: função chamada com o número do frame antes de desenhar
+    (posiciona câmera/jogador, anima portas...), fora da medição.
+    Retorna etapa -> lista de tempos (ms), com o total do frame em "frame".
+    """
+    times = {name: [] for name, _ in stages}
+    times["frame"] = []
+    for frame in range(frames):
+        before_frame(frame)
+        frame_start = time.perf_counter()
+        for name, draw in stages:
+            start = time.perf_counter()
+            draw()
+            times[name].append((time.perf_counter() - start) * 1000.0)
+        times["frame"].append((time.perf_counter() - frame_start) * 1000.0)
+    return times
+
+
+def create_game(screen, camera, graphics):
+    """Cria Viewport, MenuSystem, Player e Game como em main.py."""
+    viewport = Viewport(screen, graphics)
+    menu_system = MenuSystem(screen, graphics)
+    player = Player(395, 240, graphics.draw_line, graphics.fill_rect,
+                    graphics.get_camera, screen, blit=graphics.blit,
+                    render_text=graphics.render_text,
+                    world_to_screen=graphics.world_to_screen)
+    game = Game(screen, graphics, camera, player, menu_system, viewport)
+    return game
+
+
+def setup():
+    """Cria tela, câmera e Graphics para os benchmarks."""
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    camera = Camera()
+    graphics = Graphics(screen, camera)
+    return screen, camera, graphics
+
+
+def bench_fill_rect(screen, camera, graphics):
+    """
+    Benchmark do fill_rect
+    -----------------------
+    Compara o laço antigo pixel a pixel (set_at) com a escrita de spans
+    por linha e com o bloco inteiro (fill_rect).
+    Casos: sala (400x180 no mundo, zoom 2) e tela cheia.
+    """
+    color = (160, 80, 60)
+    cases = [
+        ("sala 400x180 (zoom 2)", (20, 20, 400, 180), True),
+        ("tela cheia 900x700", (0, 0, WIDTH, HEIGHT), False),
+    ]
+
+    for title, (x, y, w, h), use_camera in cases:
+        if use_camera:
+            camera.update(x + w / 2, y + h / 2)
+            sx, sy = camera.world_to_screen(x, y)
+            sw, sh = int(w * camera.zoom), int(h * camera.zoom)
+        else:
+            sx, sy, sw, sh = x, y, w, h
+        start_x, end_x = max(0, sx), min(WIDTH, sx + sw)
+        start_y, end_y = max(0, sy), min(HEIGHT, sy + sh)
+
+        def per_pixel():
+            graphics.flush()
+            for py in range(start_y, end_y):
+                for px in range(start_x, end_x):
+                    screen.set_at((px, py), color)
+
+        def spans():
+            pixels = graphics.lock()
+            for py in range(start_y, end_y):
+                pixels[start_x:end_x, py] = color
+            graphics.flush()
+
+        def block():
+            graphics.fill_rect(x, y, w, h, color, use_camera)
+            graphics.flush()
+
+        report(f"fill_rect: {title}", [
+            ("laço set_at (antigo)", measure(per_pixel, repeat=3)),
+            ("spans por linha", measure(spans)),
+            ("bloco recortado", measure(block)),
+        ])
+
+
+def bench_fill_rect_textured(screen, camera, graphics):
+    """
+    Benchmark do fill_rect_textured
+    --------------------------------
+    Compara o cálculo do padrão pixel a pixel (texture_color + set_at)
+    com a cópia da textura em cache, em tela cheia (fundo do menu).
+    """
+    for texture_type in ("checker", "brick"):
+        def per_pixel():
+            graphics.flush()
+            for py in range(HEIGHT):
+                for px in range(WIDTH):
+                    screen.set_at((px, py), texture_color(texture_type, px, py))
+
+        def cached():
+            graphics.fill_rect_textured(0, 0, WIDTH, HEIGHT, texture_type, use_camera=False)
+            graphics.flush()
+
+        report(f"fill_rect_textured: {texture_type} tela cheia", [
+            ("padrão por pixel (antigo)", measure(per_pixel, repeat=1)),
+            ("textura em cache", measure(cached)),
+        ])
+
+
+def bench_minimap(screen, camera, graphics):
+    """
+    Benchmark do mini-mapa
+    -----------------------
+    Custo por frame da matriz do mini-mapa com o jogador andando e uma porta
+    abrindo: matriz refeita do zero (create_matrix) contra a matriz
+    persistente com atualização das células alteradas (update_matrix).
+    """
+    game = create_game(screen, camera, graphics)
+    viewport, player = game.viewport, game.player
+    frames = 120
+
+    def run(update):
+        player.x, player.y = 395, 240
+        game.rooms[0].door_progress = 0.0
+        for frame in range(frames):
+            player.x += 2
+            game.rooms[0].door_progress = min(1.0, frame / 60)
+            update(player, game.rooms, game.walls, game.fan_positions)
+
+    viewport.update_matrix(player, game.rooms, game.walls, game.fan_positions)
+    report(f"minimap: {frames} frames (ms por frame)", [
+        ("create_matrix (antigo)", measure(lambda: run(viewport.create_matrix)) / frames),
+        ("update_matrix", measure(lambda: run(viewport.update_matrix)) / frames),
+    ])
+
+
+def bench_collision(screen, camera, graphics):
+    """
+    Benchmark da colisão
+    ---------------------
+    Custo de uma consulta de colisão do jogador contra mapas com cada vez
+    mais salas (4 paredes por sala): lista linear (antigo) contra CollisionGrid.
+    Depois, o passo inteiro de Game.update_playing em fases de 5 a 2000 salas,
+    que deve ficar constante: portas e lousas também são buscadas em grades.
+    """
+    player = pygame.Rect(395, 240, 20, 32)
+    queries = 1000
+    for room_count in (5, 100, 500):
+        walls = []
+        columns = int(room_count ** 0.5) + 1
+        for n in range(room_count):
+            x, y = (n % columns) * 460, (n // columns) * 280
+            walls += [pygame.Rect(x, y, 400, 4), pygame.Rect(x, y + 176, 400, 4),
+                      pygame.Rect(x, y, 4, 180), pygame.Rect(x + 396, y, 4, 180)]
+        grid = CollisionGrid()
+        for wall in walls:
+            grid.insert(wall)
+
+        def linear():
+            for _ in range(queries):
+                for wall in walls:
+                    if player.colliderect(wall):
+                        break
+
+        def indexed():
+            for _ in range(queries):
+                for wall in grid.query(player):
+                    if player.colliderect(wall):
+                        break
+
+        report(f"colisão: {room_count} salas, {len(walls)} paredes (ms por consulta)", [
+            ("lista linear (antigo)", measure(linear) / queries),
+            ("CollisionGrid", measure(indexed) / queries),
+        ])
+
+    """Passo completo de Game.update_playing (colisão, portas e lousas) andando com E apertado"""
+    keys = collections.defaultdict(bool, {pygame.K_d: True, pygame.K_e: True})
+    steps = 200
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for room_count in (5, 100, 500, 2000):
+            game = create_level_game(screen, camera, graphics, write_level(directory, room_count))
+            start = game.player.x
+
+            def simulate():
+                game.player.x = start
+                for _ in range(steps):
+                    game.update_playing(SIM_DT, keys)
+
+            results.append((f"{room_count} salas", measure(simulate) / steps))
+    report("colisão: Game.update_playing (ms por passo)", results)
+    camera.reset_zoom()
+
+
+def write_level(directory, room_count):
+    """
+    Gera uma fase sintética em directory com room_count salas em grade
+    (400x180, porta embaixo) e retorna o caminho do arquivo JSON.
+    """
+    rooms = []
+    columns = int(room_count ** 0.5) + 1
+    for n in range(room_count):
+        x, y = 20 + (n % columns) * 460, 20 + (n // columns) * 280
+        rooms.append({"text": f"Sala {n}", "rect": [x, y, 400, 180],
+                      "door": [x + 160, y + 170, 50, 10], "board": [x + 50, y + 15, 100, 30]})
+
+    path = os.path.join(directory, f"grande_{room_count}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"name": "Grande", "player_start": [200, 240], "rooms": rooms}, f)
+    return path
+
+
+def create_level_game(screen, camera, graphics, path):
+    """Cria um Game (com jogador, menus e mini-mapa próprios) sobre a fase em path."""
+    viewport = Viewport(screen, graphics)
+    menu_system = MenuSystem(screen, graphics)
+    player = Player(0, 0, graphics.draw_line, graphics.fill_rect,
+                    graphics.get_camera, screen, blit=graphics.blit,
+                    render_text=graphics.render_text,
+                    world_to_screen=graphics.world_to_screen)
+    return Game(screen, graphics, camera, player, menu_system, viewport, level_path=path)
+
+
+def bench_level(screen, camera, graphics):
+    """
+    Benchmark do carregamento de fase
+    ----------------------------------
+    Gera uma fase sintética com 500 salas e compara o carregamento a partir
+    do JSON (validação + dados derivados) com a leitura do cache binário.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        path = write_level(directory, 500)
+
+        def cold():
+            if os.path.exists(path + ".cache"):
+                os.remove(path + ".cache")
+            load_level(path)
+
+        def warm():
+            load_level(path)
+
+        report("fase: 500 salas", [
+            ("JSON + validação + cache", measure(cold)),
+            ("cache binário", measure(warm)),
+        ])
+
+
+def bench_culling(screen, camera, graphics):
+    """
+    Benchmark do culling
+    ---------------------
+    Custo de Game.draw_playing em uma fase grande (100 salas) com a câmera
+    parada sobre uma sala, com e sem a etapa de culling (Game.cull).
+    Com culling só as camadas das salas visíveis são desenhadas e ficam em
+    cache. Sem culling as 100 camadas são desenhadas a cada frame: nos zooms
+    2 e 5 elas somam cerca de 29 M e 181 M pixels (115 MB e 725 MB), bem acima
+    do orçamento da RoomLayerCache (max_pixels), então são refeitas a cada
+    frame e o caso mede também essa rasterização.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        game = create_level_game(screen, camera, graphics, write_level(directory, 100))
+
+    for zoom in (2.0, 5.0):
+        camera.zoom = zoom
+        camera.update(game.player.x + game.player.w / 2, game.player.y + game.player.h / 2)
+
+        def frame(culling):
+            game.culling = culling
+            game.draw_playing()
+            graphics.flush()
+
+        frame(False)
+        results = [
+            ("sem culling", measure(lambda: frame(False))),
+            ("com culling", measure(lambda: frame(True))),
+        ]
+        report(f"culling: 100 salas, zoom {zoom:g} ({game.culled_count} objetos descartados)", results)
+        print(f"  camadas em cache: {len(game.room_layers.layers)}, "
+              f"{game.room_layers.pixels * 4 / 2 ** 20:.1f} MB")
+    camera.reset_zoom()
+
+
+def bench_lines(screen, camera, graphics):
+    """
+    Benchmark das linhas
+    ---------------------
+    Segmentos desenhados um a um (draw_line) contra o lote (draw_lines):
+    bordas de 100 retângulos (mesas, cadeiras, molduras) no zoom 2
+    e as 12 linhas diagonais de 20 ventiladores.
+    """
+    camera.reset_zoom()
+    camera.update(450, 350)
+    borders = []
+    for n in range(100):
+        borders += rect_segments(20 + (n % 10) * 45, 20 + (n // 10) * 35, 40, 20)
+    blades = []
+    for n in range(20):
+        cx, cy = 250 + (n % 5) * 100, 200 + (n // 5) * 80
+        for i in range(12):
+            angle = i * 0.5236
+            blades.append((cx, cy, cx + 12 * math.cos(angle), cy + 12 * math.sin(angle)))
+
+    for title, segments in (("bordas de 100 retângulos", borders), ("20 ventiladores", blades)):
+        def single():
+            for x0, y0, x1, y1 in segments:
+                graphics.draw_line(x0, y0, x1, y1, (0, 0, 0))
+            graphics.flush()
+
+        def batched():
+            graphics.draw_lines(segments, (0, 0, 0))
+            graphics.flush()
+
+        report(f"linhas: {title} ({len(segments)} segmentos)", [
+            ("draw_line um a um", measure(single)),
+            ("draw_lines", measure(batched)),
+        ])
+
+
+def bench_clipping(screen, camera, graphics):
+    """
+    Benchmark do Cohen-Sutherland
+    ------------------------------
+    cohen_sutherland_clip em cada segmento contra cohen_sutherland_clip_many no lote:
+    - 5000 segmentos aleatórios (parte dentro, parte cruzando e parte fora da tela)
+    - bordas das paredes de um mapa com 500 salas em coordenadas de tela (zoom 2),
+      a maioria fora da tela e rejeitada trivialmente
+    """
+    rnd = random.Random(0)
+    random_segments = [(rnd.uniform(-WIDTH, 2 * WIDTH), rnd.uniform(-HEIGHT, 2 * HEIGHT),
+                        rnd.uniform(-WIDTH, 2 * WIDTH), rnd.uniform(-HEIGHT, 2 * HEIGHT))
+                       for _ in range(5000)]
+
+    camera.reset_zoom()
+    camera.update(450, 350)
+    map_segments = []
+    for n in range(500):
+        x, y = (n % 25) * 460, (n // 25) * 280
+        for x0, y0, x1, y1 in rect_segments(x, y, 400, 180) + rect_segments(x + 10, y + 10, 380, 160):
+            map_segments.append(camera.world_to_screen(x0, y0) + camera.world_to_screen(x1, y1))
+
+    for title, segments in (("aleatórios", random_segments), ("paredes de 500 salas", map_segments)):
+        columns = list(zip(*segments))
+
+        def scalar():
+            for x0, y0, x1, y1 in segments:
+                cohen_sutherland_clip(x0, y0, x1, y1, 0, 0, WIDTH - 1, HEIGHT - 1)
+
+        def batched():
+            cohen_sutherland_clip_many(*columns, 0, 0, WIDTH - 1, HEIGHT - 1)
+
+        report(f"clipping: {len(segments)} segmentos {title}", [
+            ("cohen_sutherland_clip", measure(scalar, repeat=20)),
+            ("cohen_sutherland_clip_many", measure(batched, repeat=20)),
+        ])
+
+
+def bench_clip_fills(screen, camera, graphics):
+    """
+    Benchmark do recorte das formas preenchidas
+    --------------------------------------------
+    - fill_circle com teste 0 <= px < largura em cada pixel (antigo) contra o
+      círculo recortado uma vez (linhas fora da tela puladas, spans recortados)
+    """
+    color = (139, 90, 43)
+
+    def per_pixel_circle(scx, scy, sr):
+        pixels = graphics.lock()
+        for y in range(-sr, sr + 1):
+            half_width = int(math.sqrt(max(0, sr * sr - y * y)))
+            for x in range(-half_width, half_width + 1):
+                px, py = scx + x, scy + y
+                if 0 <= px < WIDTH and 0 <= py < HEIGHT:
+                    pixels[px, py] = color
+        graphics.flush()
+
+    for title, (scx, scy, sr) in (("mesa no zoom 5 (r=150)", (450, 350, 150)),
+                                  ("metade fora da tela (r=300)", (WIDTH, 350, 300))):
+        def clipped():
+            graphics.fill_circle(scx, scy, sr, color, use_camera=False)
+            graphics.flush()
+
+        report(f"fill_circle: {title}", [
+            ("teste por pixel (antigo)", measure(lambda: per_pixel_circle(scx, scy, sr), repeat=3)),
+            ("recortado uma vez", measure(clipped)),
+        ])
+
+
+def flood_fill_visited(graphics, x, y, fill_color, boundary_color=None):
+    """
+    Flood fill anterior (referência): pilha de pixels com os 4 vizinhos de cada
+    um e um conjunto de visitados. Mesmo resultado de Graphics.flood_fill.
+    """
+    width, height = graphics.width, graphics.height
+    pixels = graphics.lock()
+    map_rgb = graphics.screen.map_rgb
+    original_color = pixels[x, y]
+    fill_value = map_rgb(fill_color[:3])
+    boundary_value = map_rgb(boundary_color[:3]) if boundary_color is not None else None
+    if original_color == fill_value:
+        return
+    stack = [(x, y)]
+    visited = set()
+    while stack:
+        cx, cy = stack.pop()
+        if not (0 <= cx < width and 0 <= cy < height) or (cx, cy) in visited:
+            continue
+        current_color = pixels[cx, cy]
+        if boundary_value is not None:
+            if current_color == boundary_value or current_color == fill_value:
+                continue
+        elif current_color != original_color:
+            continue
+        visited.add((cx, cy))
+        pixels[cx, cy] = fill_value
+        stack += ((cx + 1, cy), (cx - 1, cy), (cx, cy + 1), (cx, cy - 1))
+
+
+def bench_flood_fill(screen, camera, graphics):
+    """
+    Benchmark do flood fill
+    ------------------------
+    Flood fill anterior (pixel a pixel com conjunto de visitados) contra o
+    flood fill por spans (Graphics.flood_fill) em três regiões:
+    - a caixa 400x350 do menu principal (boundary fill, como em flood_fill_rect)
+    - a tela inteira (flood fill da cor original)
+    - um pente: região côncava com 40 dentes verticais ligados por baixo
+    """
+    BORDER, FILL = (255, 255, 255), (80, 80, 80)
+
+    def menu_box():
+        screen.fill((0, 0, 0))
+        graphics.draw_rect(250, 175, 400, 350, BORDER, use_camera=False)
+        graphics.flush()
+        return 450, 350, BORDER
+
+    def whole_screen():
+        screen.fill((0, 0, 0))
+        return 10, 10, None
+
+    def comb():
+        screen.fill((0, 0, 0))
+        graphics.draw_rect(100, 100, 700, 500, BORDER, use_camera=False)
+        for i in range(40):
+            x = 110 + i * 17
+            if i % 2:
+                graphics.fill_rect(x, 100, 8, 470, BORDER, use_camera=False)
+            else:
+                graphics.fill_rect(x, 130, 8, 470, BORDER, use_camera=False)
+        graphics.flush()
+        return 105, 590, BORDER
+
+    for title, prepare in (("caixa do menu 400x350", menu_box),
+                           ("tela inteira 900x700", whole_screen),
+                           ("pente côncavo 700x500", comb)):
+        def visited_set():
+            x, y, boundary = prepare()
+            flood_fill_visited(graphics, x, y, FILL, boundary)
+            graphics.flush()
+
+        def spans():
+            x, y, boundary = prepare()
+            graphics.flood_fill(x, y, FILL, boundary)
+            graphics.flush()
+
+        report(f"flood fill: {title}", [
+            ("pixels + visitados", measure(visited_set, repeat=3)),
+            ("spans (Smith/Heckbert)", measure(spans, repeat=3)),
+        ])
+
+
+def bench_circles(screen, camera, graphics):
+    """
+    Benchmark das tabelas de círculos
+    ----------------------------------
+    200 círculos com os raios que o jogo usa (centro dos ventiladores, marcadores
+    dos menus, mesa) nos zooms 1, 2 e 3.7: contorno e preenchimento calculados
+    a cada chamada como antes (8 pontos por passo do Midpoint com teste por
+    pixel; math.sqrt por linha) contra as tabelas por raio em cache (CircleCache).
+    """
+    color = (139, 90, 43)
+    rng = random.Random(21)
+    circles = [(rng.randint(0, WIDTH), rng.randint(0, HEIGHT), int(r * zoom))
+               for r in (3, 6, 8, 30) for zoom in (1.0, 2.0, 3.7) for _ in range(17)][:200]
+
+    def computed():
+        pixels = graphics.lock()
+        for scx, scy, sr in circles:
+            x, y, d = 0, sr, 3 - 2 * sr
+            while x <= y:
+                for px, py in ((scx + x, scy + y), (scx - x, scy + y), (scx + x, scy - y), (scx - x, scy - y),
+                               (scx + y, scy + x), (scx - y, scy + x), (scx + y, scy - x), (scx - y, scy - x)):
+                    if 0 <= px < WIDTH and 0 <= py < HEIGHT:
+                        pixels[px, py] = color
+                if d < 0:
+                    d = d + 4 * x + 6
+                else:
+                    d = d + 4 * (x - y) + 10
+                    y -= 1
+                x += 1
+            for y in range(max(-sr, -scy), min(sr, HEIGHT - 1 - scy) + 1):
+                half_width = int(math.sqrt(max(0, sr * sr - y * y)))
+                start, end = max(0, scx - half_width), min(WIDTH, scx + half_width + 1)
+                if start < end:
+                    pixels[start:end, scy + y] = color
+        graphics.flush()
+
+    def cached():
+        for scx, scy, sr in circles:
+            graphics.draw_circle(scx, scy, sr, color, use_camera=False)
+            graphics.fill_circle(scx, scy, sr, color, use_camera=False)
+        graphics.flush()
+
+    report("círculos: 200 contornos + preenchimentos", [
+        ("calculados a cada chamada", measure(computed)),
+        ("tabelas por raio em cache", measure(cached)),
+    ])
+
+
+def bench_fans(screen, camera, graphics, frames=120):
+    """
+    Benchmark dos quadros de rotação dos ventiladores
+    --------------------------------------------------
+    Os 5 ventiladores do jogo (raio 12, zoom 2) e os 2 do menu (raios 25 e 20)
+    girando por frames frames: pás desenhadas a cada frame (draw_fan) contra o
+    blit do quadro pré-renderizado mais próximo (blit_fan, cache já preenchido).
+    Também informa a memória dos quadros de um ventilador para cada precisão.
+    """
+    camera.zoom = 2.0
+    camera.update(450, 350)
+    fans = [(300 + i * 70, 300 + (i % 2) * 80, 12, (255, 255, 255), True, 1.0 + i * 0.3) for i in range(5)]
+    fans += [(575, 225, 25, (255, 255, 255), False, 1.0), (275, 475, 20, (50, 50, 200), False, -1.5)]
+
+    def run(draw):
+        def frames_loop():
+            for frame in range(frames):
+                angle = frame * 3.0 * FRAME_DT
+                for cx, cy, radius, color, use_camera, speed in fans:
+                    draw(cx, cy, radius, angle * speed, color, use_camera)
+            graphics.flush()
+        return frames_loop
+
+    run(graphics.blit_fan)()
+    report(f"ventiladores: 7 ventiladores x {frames} frames", [
+        ("draw_fan (pás a cada frame)", measure(run(graphics.draw_fan), repeat=3)),
+        ("blit_fan (quadros em cache)", measure(run(graphics.blit_fan), repeat=3)),
+    ])
+
+    print("  memória dos quadros de um ventilador (raio 12, zoom 2):")
+    for rotation_frames in (16, 32, 64, 128, 256):
+        cache = FanSpriteCache(graphics, rotation_frames, max_sprites=1024)
+        for index in range(rotation_frames):
+            cache.get_sprite(12, (255, 255, 255), 2.0, cache.frame_index(index * 2 * math.pi / rotation_frames))
+        size = sum(surface.get_width() * surface.get_height() * surface.get_bytesize()
+                   for surface, _ in cache.sprites.values())
+        print(f"    {rotation_frames:4d} quadros/volta (passo {360 / rotation_frames:5.2f} graus): "
+              f"{len(cache.sprites):3d} quadros, {size / 1024:7.1f} KiB")
+    camera.reset_zoom()
+
+
+def bench_text(screen, camera, graphics):
+    """
+    Benchmark dos textos
+    ---------------------
+    Custo dos textos de um frame de gameplay (lousas com fonte escalada pelo zoom,
+    nome na camisa, HUD e mini-mapa): fonte criada e texto renderizado a cada
+    frame (antigo) contra o cache compartilhado (Graphics.render_text).
+    """
+    zoom = 2.0
+    texts = [("Tarefa 1", int(12 * zoom), False), ("Tarefa 2", int(12 * zoom), False),
+             ("Concluído!", int(12 * zoom), False), ("GESAD", int(5 * zoom), False),
+             ("Task em progresso...", 18, True), ("Tarefas: 1/5", 14, False),
+             ("WASD: Mover | SHIFT: Correr | E: Interagir | ESC: Pausar | + Zoom in | - Zoom out", 14, False),
+             ("MAPA NC2A", 12, False)]
+    frames = 20
+
+    def uncached():
+        for _ in range(frames):
+            for text, size, bold in texts:
+                pygame.font.SysFont("Arial", size, bold=bold).render(text, True, (240, 240, 230))
+
+    def cached():
+        for _ in range(frames):
+            for text, size, bold in texts:
+                graphics.render_text(text, size, (240, 240, 230), bold)
+
+    report(f"textos: {len(texts)} por frame (ms por frame)", [
+        ("SysFont + render (antigo)", measure(uncached) / frames),
+        ("cache de textos", measure(cached) / frames),
+    ])
+
+
+def bench_player(screen, camera, graphics):
+    """
+    Benchmark do personagem
+    ------------------------
+    Desenho do personagem com fill_rect/draw_line e spans dos detalhes faciais
+    a cada frame (Player.draw) contra a cópia da superfície em cache por zoom
+    (PlayerSpriteCache).
+    """
+    game = create_game(screen, camera, graphics)
+    player = game.player
+    for zoom in (2.0, 3.7, 5.0):
+        camera.zoom = zoom
+        camera.update(player.x + player.w / 2, player.y + player.h / 2)
+
+        def direct():
+            player.draw()
+            graphics.flush()
+
+        def cached():
+            game.player_sprite.draw(player)
+            graphics.flush()
+
+        report(f"personagem: zoom {zoom:g}", [
+            ("Player.draw", measure(direct)),
+            ("superfície em cache", measure(cached)),
+        ])
+    camera.reset_zoom()
+
+
+def bench_transform(screen, camera, graphics):
+    """
+    Benchmark das transformações afins
+    -----------------------------------
+    Pás de 50 ventiladores calculadas como antes (seno e cosseno por pá e por
+    traço, câmera aplicada depois em draw_lines) contra o modelo local levado
+    ao mundo por uma matriz por ventilador (Affine) e convertido para a tela
+    em lote (world_to_screen_segments).
+    """
+    camera.zoom = 2.0
+    camera.update(450, 350)
+    fans = [(250 + (n % 10) * 50, 200 + (n // 10) * 60, n * 0.37) for n in range(50)]
+
+    def per_blade():
+        cam_x, cam_y, zoom, width, height = camera.get_camera()
+        half_w, half_h = width / 2, height / 2
+        out = []
+        for cx, cy, angle in fans:
+            for i in range(4):
+                blade_angle = angle + (i * math.pi / 2)
+                end_x = cx + 12 * math.cos(blade_angle)
+                end_y = cy + 12 * math.sin(blade_angle)
+                for offset in [-1, 0, 1]:
+                    ox = offset * math.cos(blade_angle + math.pi/2)
+                    oy = offset * math.sin(blade_angle + math.pi/2)
+                    out.append((int((cx + ox - cam_x) * zoom + half_w), int((cy + oy - cam_y) * zoom + half_h),
+                                int((end_x + ox - cam_x) * zoom + half_w), int((end_y + oy - cam_y) * zoom + half_h)))
+        return out
+
+    def matrix():
+        model = fan_model(12)
+        out = []
+        for cx, cy, angle in fans:
+            transform = Affine.translation(cx, cy) @ Affine.rotation(angle)
+            out += camera.world_to_screen_segments(transform.apply_segments(model))
+        return out
+
+    report("transformações: pás de 50 ventiladores (600 segmentos)", [
+        ("seno/cosseno por pá e traço", measure(per_blade)),
+        ("matriz afim por ventilador", measure(matrix)),
+    ])
+
+    def draw_all():
+        for cx, cy, angle in fans:
+            graphics.draw_fan(cx, cy, 12, angle, (0, 0, 0))
+        graphics.flush()
+
+    report("transformações: draw_fan de 50 ventiladores", [
+        ("draw_fan", measure(draw_all)),
+    ])
+    camera.reset_zoom()
+
+
+def bench_camera(screen, camera, graphics):
+    """
+    Benchmark da câmera
+    --------------------
+    Conversão mundo -> tela de 2000 pontos: fórmula recalculada por ponto
+    (como world_to_screen fazia), world_to_screen com os termos em cache
+    (metade da largura e da altura) e world_to_screen_many em uma passada.
+    """
+    camera.zoom = 1.44
+    camera.update(450.5, 350.25)
+    rng = random.Random(17)
+    points = [(rng.uniform(0, 1500), rng.uniform(0, 1000)) for _ in range(2000)]
+
+    def formula():
+        return [(int((x - camera.x) * camera.zoom + camera.width / 2),
+                 int((y - camera.y) * camera.zoom + camera.height / 2)) for x, y in points]
+
+    def single():
+        world_to_screen = camera.world_to_screen
+        return [world_to_screen(x, y) for x, y in points]
+
+    def many():
+        return camera.world_to_screen_many(points)
+
+    report("câmera: 2000 pontos mundo -> tela", [
+        ("fórmula por ponto", measure(formula)),
+        ("world_to_screen", measure(single)),
+        ("world_to_screen_many", measure(many)),
+    ])
+    camera.reset_zoom()
+
+
+def bench_dirty(screen, camera, graphics, frames=30):
+    """
+    Benchmark do modo de retângulos sujos
+    --------------------------------------
+    Para cada estado, frames roteirizados como no loop principal:
+    tela inteira redesenhada e apresentada com pygame.display.flip() contra o
+    modo de retângulos sujos (main.py --dirty-rects), em que só os retângulos
+    alterados são apresentados com pygame.display.update(rects) e as telas
+    estáticas deixam de ser redesenhadas depois do primeiro frame.
+    Informa o tempo médio por frame e a fração média da tela apresentada.
+    """
+    random.seed(0)
+    camera.reset_zoom()
+    game = create_game(screen, camera, graphics)
+    menu, player = game.menu_system, game.player
+    start_x, start_y = player.x, player.y
+
+    def walk(frame):
+        player.x = start_x + 2 * frame
+        player.y = start_y + frame
+        camera.update(player.x + player.w / 2, player.y + player.h / 2)
+        game.update(FRAME_DT)
+
+    def idle(frame):
+        menu.selected = frame // 20 % 3
+        game.update(FRAME_DT)
+
+    def play():
+        for _, draw in game.draw_stages():
+            draw()
+
+    """(estado, desenho, tela estática, com fundo em gradiente, roteiro) como em main.py"""
+    scenarios = [
+        ("splash", menu.draw_splash_screen, True, False, idle),
+        ("menu", lambda: menu.draw_main_menu(game.rotation_angle), False, False, idle),
+        ("controles", menu.draw_controls_screen, True, False, idle),
+        ("parabéns", menu.draw_congrats_screen, True, False, idle),
+        ("jogando", play, False, True, walk),
+        ("jogando parado", play, False, True, idle),
+    ]
+
+    for state, draw, static, background, before_frame in scenarios:
+        def full():
+            for frame in range(frames):
+                before_frame(frame)
+                if background:
+                    draw_background(screen, WIDTH, HEIGHT)
+                draw()
+                graphics.flush()
+                pygame.display.flip()
+
+        ratios = []
+
+        def dirty_rects():
+            dirty = DirtyRegion(WIDTH, HEIGHT)
+            dirty.mark_all()
+            graphics.dirty = dirty
+            ratios.clear()
+            for frame in range(frames):
+                before_frame(frame)
+                if static and frame > 0:
+                    dirty.skip()
+                else:
+                    if background:
+                        draw_background(screen, WIDTH, HEIGHT)
+                    draw()
+                    graphics.flush()
+                    pygame.display.update(dirty.present())
+                ratios.append(dirty.ratio)
+            graphics.dirty = None
+
+        player.x, player.y = start_x, start_y
+        title = f"retângulos sujos: {state} ({frames} frames)"
+        report(title, [
+            ("flip, ms/frame", measure(full, repeat=3) / frames),
+            ("retângulos sujos, ms/frame", measure(dirty_rects, repeat=3) / frames),
+        ])
+        print(f"  área suja média: {sum(ratios) / len(ratios):.1%}")
+    player.x, player.y = start_x, start_y
+    camera.reset_zoom()
+
+
+def bench_background(screen, camera, graphics):
+    """
+    Benchmark do fundo
+    -------------------
+    Gradiente desenhado linha a linha a cada frame (pygame.draw.line em cada
+    uma das linhas da tela) contra a cópia da superfície em cache por tamanho
+    de tela (draw_background).
+    """
+    def per_row():
+        screen.blit(render_background(WIDTH, HEIGHT, screen), (0, 0))
+
+    def cached():
+        draw_background(screen, WIDTH, HEIGHT)
+
+    BACKGROUND_CACHE.clear()
+    report(f"fundo: gradiente {WIDTH}x{HEIGHT}", [
+        ("linha a linha", measure(per_row)),
+        ("superfície em cache", measure(cached)),
+    ])
+
+
+def bench_timestep(screen, camera, graphics):
+    """
+    Benchmark da simulação em passo fixo
+    -------------------------------------
+    Custo de um passo de simulação (Game.update + update_playing, andando na
+    diagonal) e de um desenho interpolado entre dois passos (Game.interpolated).
+    Depois simula o acumulador de main.py com a renderização a 60, 30, 15 e
+    5 FPS e informa quanto tempo real leva uma tarefa na lousa: no loop antigo
+    a barra andava 1/FPS por frame desenhado (a tarefa ficava mais lenta com o
+    FPS baixo); em passo fixo ela dura TASK_DURATION em qualquer taxa de frames.
+    """
+    camera.reset_zoom()
+    game = create_game(screen, camera, graphics)
+    game.state = GAME_STATE_PLAYING
+    player = game.player
+    start_x, start_y = player.x, player.y
+    keys = collections.defaultdict(bool)
+
+    def steps():
+        keys[pygame.K_d] = keys[pygame.K_s] = True
+        for step in range(60):
+            if step % 20 == 0:
+                player.x, player.y = start_x, start_y
+            game.save_previous()
+            game.update(SIM_DT)
+            game.update_playing(SIM_DT, keys)
+        keys.clear()
+
+    def interpolated_frames():
+        for frame in range(10):
+            with game.interpolated(frame / 10):
+                game.draw_playing()
+        graphics.flush()
+
+    report("passo fixo: simulação e desenho interpolado", [
+        ("desenho interpolado, ms/frame", measure(interpolated_frames, repeat=3) / 10),
+        ("passo de simulação, ms/passo", measure(steps) / 60),
+    ])
+
+    print("passo fixo: duração real de uma tarefa por FPS de renderização")
+    for render_fps in (60, 30, 15, 5):
+        game.reset_game()
+        game.task_active, game.active_room = True, game.rooms[0]
+        accumulator, elapsed = 0.0, 0.0
+        while game.task_active:
+            accumulator += 1.0 / render_fps
+            elapsed += 1.0 / render_fps
+            count = 0
+            while accumulator >= SIM_DT and count < MAX_SIM_STEPS and game.task_active:
+                game.save_previous()
+                game.update(SIM_DT)
+                game.update_playing(SIM_DT, keys)
+                accumulator -= SIM_DT
+                count += 1
+        print(f"  {render_fps:>3} FPS   loop antigo {FPS / render_fps:6.2f} s   passo fixo {elapsed:6.2f} s"
+              f"   (TASK_DURATION = {TASK_DURATION} s)")
+    game.reset_game()
+    camera.reset_zoom()
+
+
+def bench_threads(screen, camera, graphics, seconds=2.0):
+    """
+    Benchmark da thread de renderização
+    ------------------------------------
+    Roda o loop principal (entrada + simulação em passo fixo) por seconds
+    segundos com o jogador andando e o zoom mudando a cada meio segundo (o que
+    refaz as camadas das salas e os quadros dos ventiladores, os frames mais
+    lentos da rasterização):
+    - uma thread: cada volta simula e desenha o frame (draw_frame), como main.py;
+    - duas threads: cada volta só simula e publica a captura (main.py --threaded),
+      e a RenderThread desenha em paralelo.
+    Informa o intervalo entre duas leituras da entrada (latência da entrada) e
+    quantos frames foram desenhados por segundo.
+    """
+    zooms = [2.0, 0.5, 1.0, 3.0, 5.0, 0.8]
+
+    def run(game, renderer=None):
+        game.state = GAME_STATE_PLAYING
+        game.camera.reset_zoom()
+        keys = collections.defaultdict(bool)
+        clock = pygame.time.Clock()
+        intervals, drawn = [], 0
+        accumulator, step = 0.0, 0
+        start = last = time.perf_counter()
+        while last - start < seconds:
+            accumulator += clock.tick(SIM_RATE) / 1000.0
+            pygame.event.pump()
+            now = time.perf_counter()
+            intervals.append(now - last)
+            last = now
+            while accumulator >= SIM_DT:
+                keys.clear()
+                keys[(pygame.K_d, pygame.K_s, pygame.K_a, pygame.K_w)[step // 45 % 4]] = True
+                if step % (SIM_RATE // 2) == 0:
+                    game.camera.zoom = zooms[step // (SIM_RATE // 2) % len(zooms)]
+                game.save_previous()
+                game.update(SIM_DT)
+                game.update_playing(SIM_DT, keys)
+                accumulator -= SIM_DT
+                step += 1
+            if renderer is None:
+                with game.interpolated(accumulator / SIM_DT):
+                    draw_frame(game, False)
+                game.graphics.flush()
+                drawn += 1
+            else:
+                renderer.snapshots.publish(game.capture())
+                renderer.frames.present(screen)
+        if renderer is not None:
+            renderer.stop()
+            drawn = renderer.rendered
+        intervals.sort()
+        return intervals, drawn / (last - start)
+
+    single, single_fps = run(create_main_game(screen)[3])
+    frames = FrameBuffer(screen)
+    renderer = RenderThread(create_main_game(frames.canvas)[3], SnapshotBuffer(), frames, draw_frame)
+    renderer.start()
+    threaded, threaded_fps = run(create_main_game(screen)[3], renderer)
+
+    def percentile(values, p):
+        return values[min(len(values) - 1, int(len(values) * p))] * 1000.0
+
+    report(f"thread de renderização: maior intervalo entre leituras da entrada ({seconds:.0f} s)", [
+        ("uma thread", percentile(single, 1.0)),
+        ("duas threads", percentile(threaded, 1.0)),
+    ])
+    for name, intervals, fps in (("uma thread", single, single_fps), ("duas threads", threaded, threaded_fps)):
+        print(f"  {name:<14} entrada p50 {percentile(intervals, 0.5):6.1f} ms   p99 {percentile(intervals, 0.99):6.1f} ms"
+              f"   desenho {fps:5.1f} frames/s")
+    camera.reset_zoom()
+
+
+def bench_tiles(screen, camera, graphics, worker_counts=(1, 2, 4, 8)):
+    """
+    Benchmark da renderização em tiles
+    -----------------------------------
+    Primeiro compara o pontilhado do menu de pausa pixel a pixel (set_at, como
+    era em MenuSystem.draw_pause_menu) com fill_dither. Depois mede os
+    preenchimentos de tela cheia (fundo xadrez do menu, pontilhado da pausa
+    e um fill_rect) em um processo só e com 1, 2, 4 e 8 processos de
+    renderização (TileRenderer), para ver a escala com o número de núcleos
+    (os.cpu_count() é informado; acima dele os processos dividem núcleos).
+    Nos processos cada passe inclui o envio dos comandos e a espera pela
+    resposta de todos.
+    """
+    def per_pixel():
+        graphics.flush()
+        for y in range(0, HEIGHT, 2):
+            for x in range(0, WIDTH, 2):
+                screen.set_at((x, y), (0, 0, 0))
+
+    def dither():
+        graphics.fill_dither(0, 0, WIDTH, HEIGHT, (0, 0, 0), 2, use_camera=False)
+        graphics.flush()
+
+    report("pontilhado da pausa: tela cheia", [
+        ("set_at por pixel (antigo)", measure(per_pixel, repeat=3)),
+        ("fill_dither", measure(dither)),
+    ])
+
+    passes = [
+        ("xadrez", lambda g: g.fill_rect_textured(0, 0, WIDTH, HEIGHT, "checker", use_camera=False)),
+        ("pontilhado", lambda g: g.fill_dither(0, 0, WIDTH, HEIGHT, (0, 0, 0), 2, use_camera=False)),
+        ("fill_rect", lambda g: g.fill_rect(0, 0, WIDTH, HEIGHT, (90, 90, 90), use_camera=False)),
+    ]
+
+    def run(target):
+        def frame():
+            for _, draw in passes:
+                for _ in range(10):
+                    draw(target)
+            target.flush()
+        return frame
+
+    print(f"tiles: núcleos disponíveis (os.cpu_count): {os.cpu_count()}")
+    results = [("1 processo (sem tiles)", measure(run(graphics)) / 10)]
+    for workers in worker_counts:
+        tiles = TileRenderer(WIDTH, HEIGHT, workers, min_area=0)
+        tiled = Graphics(tiles.surface, Camera())
+        tiled.tiles = tiles
+        results.append((f"{workers} processo(s) de tiles", measure(run(tiled)) / 10))
+        del tiled
+        tiles.close()
+    report("tiles: xadrez + pontilhado + fill_rect em tela cheia, ms por conjunto", results)
+
+
+def bench_frames(screen, camera, graphics, frames=240):
+    """
+    Benchmark do loop de renderização
+    ----------------------------------
+    Monta Camera, Graphics, Viewport, MenuSystem, Player e Game como em main.py
+    e repete frames roteirizados e determinísticos (passo de tempo fixo):
+    - jogando: o jogador percorre o centro de todas as salas, com o zoom
+      passando por 0.5, 1, 2, 3.5 e 5, portas abrindo/fechando e uma tarefa em progresso
+    - pausado: o mesmo jogo congelado com o menu de pausa por cima
+    - menus: splash, menu principal, controles e parabéns
+    Mede cada etapa do frame (fundo, salas, ventiladores, jogador, mini-mapa,
+    HUD, menus e apresentação) e informa os percentis por estado.
+    """
+    random.seed(0)
+    camera.reset_zoom()
+    game = create_game(screen, camera, graphics)
+    menu, player, rooms = game.menu_system, game.player, game.rooms
+
+    """Caminho da câmera: início da fase -> centro de cada sala -> início"""
+    start = game.level["player_start"]
+    path = [start] + [(r.x + r.w / 2, r.y + r.h / 2) for r in rooms] + [start]
+    zooms = (0.5, 1.0, 2.0, 3.5, 5.0)
+
+    def background():
+        draw_background(screen, WIDTH, HEIGHT)
+
+    def present():
+        graphics.flush()
+        pygame.display.flip()
+
+    def play_frame(frame):
+        t = frame / frames * (len(path) - 1)
+        segment = min(int(t), len(path) - 2)
+        f = t - segment
+        (x0, y0), (x1, y1) = path[segment], path[segment + 1]
+        player.x = x0 + (x1 - x0) * f - player.w / 2
+        player.y = y0 + (y1 - y0) * f - player.h / 2
+        camera.zoom = zooms[frame * len(zooms) // frames]
+        camera.update(player.x + player.w / 2, player.y + player.h / 2)
+
+        if frame % 30 == 0:
+            rooms[frame // 30 % len(rooms)].interact_door()
+        for room in rooms:
+            room.update_door(FRAME_DT)
+        game.task_active = frame % 60 < 30
+        game.active_room = rooms[0] if game.task_active else None
+        game.task_progress = (frame % 30) / 30
+        game.update(FRAME_DT)
+
+    def menu_frame(frame):
+        menu.selected = frame % 3
+        game.update(FRAME_DT)
+
+    """Telas que pintam a tela inteira não desenham o fundo (main.STATE_BACKGROUNDS)"""
+    playing = [("background", background)] + game.draw_stages()
+    scenarios = [
+        ("jogando", playing + [("present", present)], frames, play_frame),
+        ("pausado", playing + [("menus", menu.draw_pause_menu), ("present", present)], frames, play_frame),
+        ("splash", [("menus", menu.draw_splash_screen), ("present", present)], frames // 4, menu_frame),
+        ("menu", [("menus", lambda: menu.draw_main_menu(game.rotation_angle)),
+                  ("present", present)], frames // 4, menu_frame),
+        ("controles", [("menus", menu.draw_controls_screen), ("present", present)], frames // 4, menu_frame),
+        ("parabéns", [("menus", menu.draw_congrats_screen), ("present", present)], frames // 4, menu_frame),
+    ]
+
+    for state, stages, count, before_frame in scenarios:
+        times = run_frames(stages, count, before_frame)
+        report_percentiles(f"frames: {state} ({count} frames)", times)
+    camera.reset_zoom()
+
+
+BENCHMARKS = {
+    "fill_rect": bench_fill_rect,
+    "fill_rect_textured": bench_fill_rect_textured,
+    "minimap": bench_minimap,
+    "collision": bench_collision,
+    "level": bench_level,
+    "culling": bench_culling,
+    "lines": bench_lines,
+    "clipping": bench_clipping,
+    "clip_fills": bench_clip_fills,
+    "flood_fill": bench_flood_fill,
+    "circles": bench_circles,
+    "fans": bench_fans,
+    "text": bench_text,
+    "player": bench_player,
+    "transform": bench_transform,
+    "camera": bench_camera,
+    "dirty": bench_dirty,
+    "background": bench_background,
+    "timestep": bench_timestep,
+    "threads": bench_threads,
+    "tiles": bench_tiles,
+    "frames": bench_frames,
+}
+
+
+def write_results(path):
+    """Grava RESULTS em JSON (tempos em ms) com os dados do ambiente."""
+    data = {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "platform": platform.platform(),
+        "screen": [WIDTH, HEIGHT],
+        "results": RESULTS,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def compare_results(path, tolerance):
+    """
+    Compara RESULTS com um arquivo JSON gravado antes (--json)
+    -----------------------------------------------------------
+    Lista as etapas (p50) e os casos cujo tempo piorou mais que tolerance
+    (fração, ex: 0.2 = 20%). Retorna o número de regressões encontradas.
+    """
+    with open(path, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+
+    regressions = 0
+    print(f"comparação com {path} (tolerância {tolerance:.0%})")
+    for title, current in RESULTS.items():
+        for name, value in current.items():
+            old = baseline.get(title, {}).get(name)
+            if old is None:
+                continue
+            if isinstance(value, dict):
+                value, old = value["p50"], old["p50"]
+            if old > 0 and value > old * (1 + tolerance):
+                regressions += 1
+                print(f"  REGRESSÃO {title} / {name}: {old:.3f} ms -> {value:.3f} ms")
+    print(f"  {regressions} regressão(ões)")
+    return regressions
+
+
+def main(argv):
+    """
+    Executa os benchmarks pedidos na linha de comando (todos, se nenhum).
+    Uso: python benchmark.py [fill_rect ...] [--json resultados.json] [--baseline antigo.json]
+    Com --baseline, o programa termina com código 1 se algum tempo piorou.
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks de desempenho (sem janela)")
+    parser.add_argument("names", nargs="*", help=f"benchmarks a executar: {', '.join(BENCHMARKS)}")
+    parser.add_argument("--json", metavar="ARQUIVO", help="grava os resultados em JSON")
+    parser.add_argument("--baseline", metavar="ARQUIVO", help="compara com resultados gravados antes")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="piora aceita na comparação (padrão: 0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    screen, camera, graphics = setup()
+    for name in args.names or BENCHMARKS:
+        if name not in BENCHMARKS:
+            print(f"Benchmark desconhecido: {name} (disponíveis: {', '.join(BENCHMARKS)})")
+            continue
+        BENCHMARKS[name](screen, camera, graphics)
+    pygame.quit()
+
+    if args.json:
+        write_results(args.json)
+    if args.baseline and compare_results(args.baseline, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -6,16 +6,45 @@ class Camera:
     --------------
     Gerencia a posição da câmera no mundo e fornece métodos
     para transformação de coordenadas mundo -> tela.
+    A posição da câmera aparece no centro da área de desenho (width x height),
+    que por padrão é a tela inteira.
+    
+    A transformação mundo -> tela é só escala e translação:
+    (x - câmera) * zoom + metade da área. Os termos ficam guardados na câmera
+    (a metade da área é recalculada só quando width ou height mudam) e todas
+    as conversões de coordenadas do jogo passam por aqui (world_to_screen,
+    world_to_screen_many, world_to_screen_segments e screen_to_world), sempre
+    com a conta nessa ordem: o arredondamento é o mesmo em todos os caminhos.
     """
     
-    def __init__(self):
+    def __init__(self, width=WIDTH, height=HEIGHT):
         self.x = 0
         self.y = 0
         self.zoom = ZOOM
+        self.width = width
+        self.height = height
+    
+    @property
+    def width(self):
+        return self._width
+    
+    @width.setter
+    def width(self, value):
+        self._width = value
+        self._half_w = value / 2
+    
+    @property
+    def height(self):
+        return self._height
+    
+    @height.setter
+    def height(self, value):
+        self._height = value
+        self._half_h = value / 2
     
     def get_camera(self):
         """Retorna a posição atual da câmera e configurações."""
-        return self.x, self.y, self.zoom, WIDTH, HEIGHT
+        return self.x, self.y, self.zoom, self._width, self._height
     
     def update(self, target_x, target_y):
         """Atualiza a posição da câmera para seguir um alvo."""
@@ -24,15 +53,28 @@ class Camera:
     
     def world_to_screen(self, x, y):
         """Converte coordenadas do mundo para coordenadas da tela."""
-        screen_x = int((x - self.x) * self.zoom + WIDTH / 2)
-        screen_y = int((y - self.y) * self.zoom + HEIGHT / 2)
-        return screen_x, screen_y
+        return (int((x - self.x) * self.zoom + self._half_w),
+                int((y - self.y) * self.zoom + self._half_h))
+    
+    def world_to_screen_many(self, points):
+        """Converte uma lista de pontos [(x, y), ...] do mundo para a tela em uma passada."""
+        cx, cy, zoom, half_w, half_h = self.x, self.y, self.zoom, self._half_w, self._half_h
+        return [(int((x - cx) * zoom + half_w), int((y - cy) * zoom + half_h)) for x, y in points]
+    
+    def world_to_screen_segments(self, segments):
+        """Converte uma lista de segmentos [(x0, y0, x1, y1), ...] do mundo para a tela em uma passada."""
+        cx, cy, zoom, half_w, half_h = self.x, self.y, self.zoom, self._half_w, self._half_h
+        return [
+            (int((x0 - cx) * zoom + half_w), int((y0 - cy) * zoom + half_h),
+             int((x1 - cx) * zoom + half_w), int((y1 - cy) * zoom + half_h))
+            for x0, y0, x1, y1 in segments
+        ]
     
     def screen_to_world(self, screen_x, screen_y):
         """Converte coordenadas da tela para coordenadas do mundo."""
-        world_x = (screen_x - WIDTH / 2) / self.zoom + self.x
-        world_y = (screen_y - HEIGHT / 2) / self.zoom + self.y
-        return world_x, world_y
+        return ((screen_x - self._half_w) / self.zoom + self.x,
+                (screen_y - self._half_h) / self.zoom + self.y)
+    
     def zoom_in(self, factor=1.2):
         """
         Aumenta o zoom (aproxima a câmera). Equivale a DIMINUIR o tamanho da Janela no mundo.
@@ -55,12 +97,29 @@ class Camera:
     def get_window_bounds(self):
         """
         Retorna os limites da Janela (Window) no mundo. """
-        half_w = (WIDTH / 2) / self.zoom
-        half_h = (HEIGHT / 2) / self.zoom
+        half_w = self._half_w / self.zoom
+        half_h = self._half_h / self.zoom
         
         return (
             self.x - half_w,  # wx_min
             self.y - half_h,  # wy_min
             self.x + half_w,  # wx_max
             self.y + half_h   # wy_max
-        )
\ No newline at end of file
+        )
+    
+    def is_visible(self, x, y, w, h, margin=0):
+        """
+        Teste de visibilidade (culling)
+        ------------------------
+        Verifica se o retângulo (x, y, w, h) do mundo intersecta a Janela
+        (get_window_bounds). Usado para descartar objetos fora da tela antes
+        de qualquer desenho.
+        
+        Parâmetros:
+        - margin: Folga em pixels da tela ao redor da Janela (ex: bordas
+          desenhadas em x + w, margem das camadas em cache)
+        """
+        wx_min, wy_min, wx_max, wy_max = self.get_window_bounds()
+        pad = margin / self.zoom
+        return (x <= wx_max + pad and x + w >= wx_min - pad
+                and y <= wy_max + pad and y + h >= wy_min - pad)
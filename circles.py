@@ -0,0 +1,89 @@
+import math
+from collections import OrderedDict
+
+
+def circle_half_widths(radius):
+    """
+    Meia largura de cada linha de um círculo preenchido de raio inteiro
+    ------------------------
+    Retorna a tupla h onde h[dy] (0 <= dy <= radius) é a meia largura do
+    span na linha dy acima ou abaixo do centro: o span cobre de
+    cx - h[dy] até cx + h[dy].
+    """
+    return tuple(int(math.sqrt(max(0, radius * radius - dy * dy))) for dy in range(radius + 1))
+
+
+def circle_outline_runs(radius):
+    """
+    Contorno de um círculo de raio inteiro (Bresenham / Midpoint Circle)
+    ------------------------
+    Gera os pontos dos 8 octantes em relação ao centro e os agrupa em
+    trechos horizontais contíguos: retorna a tupla de (dy, dx_inicio, dx_fim),
+    com dx_fim exclusivo.
+    """
+    points = set()
+    x = 0
+    y = radius
+    d = 3 - 2 * radius
+    while x <= y:
+        points.update((
+            (x, y), (-x, y), (x, -y), (-x, -y),
+            (y, x), (-y, x), (y, -x), (-y, -x),
+        ))
+        if d < 0:
+            d = d + 4 * x + 6
+        else:
+            d = d + 4 * (x - y) + 10
+            y -= 1
+        x += 1
+
+    runs = []
+    for dx, dy in sorted(points, key=lambda p: (p[1], p[0])):
+        if runs and runs[-1][0] == dy and runs[-1][2] == dx:
+            runs[-1][2] = dx + 1
+        else:
+            runs.append([dy, dx, dx + 1])
+    return tuple((dy, start, end) for dy, start, end in runs)
+
+
+class CircleCache:
+    """
+    Classe CircleCache
+    -------------------
+    Cache das tabelas de círculos por raio inteiro (em pixels de tela).
+    Os círculos do jogo se repetem com poucos raios (centro dos ventiladores,
+    mesa da sala de reunião, marcadores dos menus, e os mesmos raios vezes o
+    zoom), então a meia largura de cada linha (fill_circle) e os trechos do
+    contorno (draw_circle) são calculados uma vez por raio.
+
+    O cache é LRU: acima de max_radii raios, o usado há mais tempo é descartado.
+    """
+
+    def __init__(self, max_radii=64):
+        """
+        Parâmetros:
+        - max_radii: Número máximo de raios guardados em cada tabela
+        """
+        self.max_radii = max_radii
+        self.spans = OrderedDict()
+        self.outlines = OrderedDict()
+
+    def _get(self, table, radius, build):
+        """Busca o raio em table, calculando com build se necessário (LRU)."""
+        value = table.get(radius)
+        if value is not None:
+            table.move_to_end(radius)
+            return value
+
+        value = table[radius] = build(radius)
+        if len(table) > self.max_radii:
+            table.popitem(last=False)
+        return value
+
+    def half_widths(self, radius):
+        """Meias larguras das linhas do círculo preenchido (ver circle_half_widths)."""
+        return self._get(self.spans, radius, circle_half_widths)
+
+    def outline(self, radius):
+        """Trechos horizontais do contorno (ver circle_outline_runs)."""
+        return self._get(self.outlines, radius, circle_outline_runs)
@@ -82,3 +82,102 @@ def cohen_sutherland_clip(x0, y0, x1, y1, xmin, ymin, xmax, ymax):
                 outcode1 = compute_outcode(x1, y1, xmin, ymin, xmax, ymax)
     
     return None
+
+
+def cohen_sutherland_clip_many(x0s, y0s, x1s, y1s, xmin, ymin, xmax, ymax):
+    """
+    Cohen-Sutherland para vários segmentos de uma vez.
+    
+    Versão em lote de cohen_sutherland_clip: os segmentos chegam como listas
+    de coordenadas (um elemento por segmento). Os códigos de região dos dois
+    extremos de todos os segmentos são calculados em uma única passada e
+    guardados juntos em um inteiro (código do início << 4 | código do fim);
+    a partir deles os segmentos trivialmente aceitos e rejeitados são
+    separados em bloco, e só os restantes passam pelo laço de recorte, com as
+    mesmas operações da versão escalar (sem chamadas de função por ponto).
+    O resultado é exatamente igual ao de cohen_sutherland_clip em cada segmento.
+    
+    Quando usar: com muitos segmentos de uma vez, principalmente se a maioria
+    está toda dentro ou toda fora da região (ex: paredes de um mapa, em que
+    quase tudo está fora da tela), onde o ganho é maior. Se quase todos os
+    segmentos cruzam as bordas, o custo é dominado pelo recorte em si e o
+    ganho sobre a versão escalar é pequeno; para poucos segmentos, ou quando
+    eles não estão em listas, prefira cohen_sutherland_clip.
+    
+    Parâmetros:
+    - x0s, y0s, x1s, y1s: Sequências com as coordenadas dos extremos
+    - xmin, ymin, xmax, ymax: Limites da região de clipping
+    
+    Retorna:
+    - Tupla (x0s, y0s, x1s, y1s, accepted): listas com as coordenadas
+      clippadas e a máscara de aceitação (False = segmento totalmente fora;
+      nesse caso as coordenadas não têm significado)
+    """
+    x0s, y0s, x1s, y1s = list(x0s), list(y0s), list(x1s), list(y1s)
+    
+    codes = [
+        ((LEFT if x0 < xmin else RIGHT if x0 > xmax else INSIDE)
+         | (TOP if y0 < ymin else BOTTOM if y0 > ymax else INSIDE)) << 4
+        | (LEFT if x1 < xmin else RIGHT if x1 > xmax else INSIDE)
+        | (TOP if y1 < ymin else BOTTOM if y1 > ymax else INSIDE)
+        for x0, y0, x1, y1 in zip(x0s, y0s, x1s, y1s)
+    ]
+    accepted = [not c for c in codes]
+    """Nem aceitos (c == 0) nem rejeitados (os dois códigos com um bit em comum)"""
+    pending = [(i, c >> 4, c & 15) for i, c in enumerate(codes) if c and not (c >> 4) & c]
+    
+    for i, code0, code1 in pending:
+        x0, y0, x1, y1 = x0s[i], y0s[i], x1s[i], y1s[i]
+
+        while True:
+            outcode_out = code0 if code0 else code1
+            
+            if outcode_out & TOP:
+                x = x0 + (x1 - x0) * (ymin - y0) / (y1 - y0) if y1 != y0 else x0
+                y = ymin
+            elif outcode_out & BOTTOM:
+                x = x0 + (x1 - x0) * (ymax - y0) / (y1 - y0) if y1 != y0 else x0
+                y = ymax
+            elif outcode_out & RIGHT:
+                y = y0 + (y1 - y0) * (xmax - x0) / (x1 - x0) if x1 != x0 else y0
+                x = xmax
+            else:
+                y = y0 + (y1 - y0) * (xmin - x0) / (x1 - x0) if x1 != x0 else y0
+                x = xmin
+            
+            """Código de região do novo ponto (mesmo cálculo de compute_outcode)"""
+            code = (LEFT if x < xmin else RIGHT if x > xmax else INSIDE) \
+                | (TOP if y < ymin else BOTTOM if y > ymax else INSIDE)
+            if outcode_out == code0:
+                x0, y0, code0 = x, y, code
+            else:
+                x1, y1, code1 = x, y, code
+            
+            if not (code0 | code1):
+                accepted[i] = True
+                x0s[i], y0s[i], x1s[i], y1s[i] = x0, y0, x1, y1
+                break
+            if code0 & code1:
+                break
+    
+    return x0s, y0s, x1s, y1s, accepted
+
+
+def clip_rect(x, y, w, h, xmin, ymin, xmax, ymax):
+    """
+    Clipping de um retângulo alinhado aos eixos.
+    
+    Parâmetros:
+    - x, y, w, h: Retângulo de pixels inteiros (colunas x até x + w - 1)
+    - xmin, ymin, xmax, ymax: Limites da região de clipping (inclusivos)
+    
+    Retorna:
+    - None se não há interseção
+    - Tupla (x0, y0, x1, y1) com a área visível, x1 e y1 exclusivos
+      (prontos para fatiar o framebuffer: pixels[x0:x1, y0:y1])
+    """
+    x0, y0 = max(xmin, x), max(ymin, y)
+    x1, y1 = min(xmax + 1, x + w), min(ymax + 1, y + h)
+    if x0 < x1 and y0 < y1:
+        return (x0, y0, x1, y1)
+    return None
@@ -0,0 +1,77 @@
+import pygame
+
+
+class CollisionGrid:
+    """
+    Classe CollisionGrid
+    ---------------------
+    Índice espacial de grade uniforme para os retângulos de colisão (paredes e portas).
+    Cada retângulo é registrado em todas as células da grade que ele cobre,
+    então uma consulta só testa os retângulos próximos da área pesquisada,
+    e o custo por frame não cresce com o número total de paredes do mapa.
+
+    Retângulos podem ser ativados/desativados (portas abertas não bloqueiam).
+    As consultas devolvem os retângulos na ordem de inserção, a mesma ordem
+    da antiga lista linear de colisão.
+    """
+
+    def __init__(self, cell_size=64):
+        """
+        Parâmetros:
+        - cell_size: Tamanho (em pixels do mundo) de cada célula da grade
+        """
+        self.cell_size = cell_size
+        self.rects = []
+        self.active = []
+        self.cells = {}
+
+    def _cell_range(self, rect):
+        """Intervalo de células (cx0, cy0, cx1, cy1), inclusivo, coberto por rect"""
+        size = self.cell_size
+        return (
+            rect.left // size,
+            rect.top // size,
+            (rect.right - 1) // size,
+            (rect.bottom - 1) // size,
+        )
+
+    def insert(self, rect, active=True):
+        """
+        Registra um retângulo (x, y, w, h) na grade.
+        Retorna o índice do retângulo, usado em set_active.
+        """
+        rect = pygame.Rect(rect)
+        index = len(self.rects)
+        self.rects.append(rect)
+        self.active.append(active)
+
+        cx0, cy0, cx1, cy1 = self._cell_range(rect)
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                self.cells.setdefault((cx, cy), []).append(index)
+        return index
+
+    def set_active(self, index, active):
+        """Liga ou desliga o retângulo de índice index (ex: porta aberta/fechada)."""
+        self.active[index] = active
+
+    def query_indices(self, rect):
+        """
+        Retorna os índices (de insert) dos retângulos ativos que estão nas
+        células cobertas por rect, sem repetição e em ordem crescente.
+        """
+        rect = pygame.Rect(rect)
+        cx0, cy0, cx1, cy1 = self._cell_range(rect)
+        found = set()
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                found.update(self.cells.get((cx, cy), ()))
+        return [i for i in sorted(found) if self.active[i]]
+
+    def query(self, rect):
+        """
+        Retorna os retângulos ativos que estão nas células cobertas por rect,
+        sem repetição e na ordem de inserção. São candidatos: o teste
+        exato de colisão (colliderect) continua sendo feito por quem consulta.
+        """
+        return [self.rects[i] for i in self.query_indices(rect)]
@@ -4,6 +4,16 @@ WIDTH = 900
 HEIGHT = 700
 FPS = 60
 
+"""
+Simulação em passo fixo: a lógica do jogo roda SIM_RATE vezes por segundo
+com dt = SIM_DT, independente da taxa de renderização (FPS é só o limite
+de frames desenhados). Com frames lentos vários passos rodam antes de um
+desenho; acima de MAX_SIM_STEPS passos por frame o atraso é descartado.
+"""
+SIM_RATE = 60
+SIM_DT = 1.0 / SIM_RATE
+MAX_SIM_STEPS = 15
+
 """ Cores RGB """
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -28,5 +38,22 @@ GAME_STATE_CONGRATS = 4
 ZOOM = 2.0
 MAX_TASKS = 5
 
+""" Duração (em segundos) de uma tarefa na lousa """
+TASK_DURATION = 1.0
+
+"""
+Renderização em tiles (modo --tiles): lado dos tiles em pixels, e a área
+visível mínima de um preenchimento para ser enviado aos processos (abaixo
+disso o envio custa mais que desenhar no próprio processo).
+"""
+TILE_SIZE = 128
+TILE_MIN_AREA = 200000
+
+"""
+Precisão angular dos ventiladores: quadros pré-renderizados por volta completa.
+Mais quadros = rotação mais suave e mais memória; 0 desenha as pás a cada frame.
+"""
+FAN_ROTATION_FRAMES = 64
+
 """ Configurações de colisão """
 WALL_THICKNESS = 4
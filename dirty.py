@@ -0,0 +1,85 @@
+import pygame
+
+
+class DirtyRegion:
+    """
+    Classe DirtyRegion
+    -------------------
+    Registro dos retângulos sujos (modo de retângulos sujos do loop principal).
+    As primitivas do Graphics e os blits de texto registram aqui o retângulo de
+    tela que alteraram (add); no fim do frame, present() devolve a lista de
+    retângulos que precisam ir para a janela (pygame.display.update(rects))
+    em vez de apresentar a tela inteira com pygame.display.flip().
+
+    O fundo é o mesmo em todos os frames e não é registrado. Por isso um
+    pixel só muda de um frame para o outro se foi desenhado no frame atual
+    ou no anterior (onde o objeto estava antes): present() junta os
+    retângulos dos dois frames.
+
+    ratio guarda a fração da tela apresentada no último frame (0.0 a 1.0).
+    """
+
+    """ Acima deste número de retângulos o frame é apresentado como um único retângulo envolvente """
+    MAX_RECTS = 128
+
+    def __init__(self, width, height):
+        """
+        Parâmetros:
+        - width, height: Tamanho da tela
+        """
+        self.width = width
+        self.height = height
+        self.current = []
+        self.previous = []
+        self.ratio = 0.0
+
+    def add(self, x, y, w, h):
+        """Registra o retângulo (x, y, w, h) de tela alterado no frame atual (recortado na tela)."""
+        x0, y0 = max(0, x), max(0, y)
+        x1, y1 = min(self.width, x + w), min(self.height, y + h)
+        if x0 < x1 and y0 < y1:
+            self.current.append(pygame.Rect(x0, y0, x1 - x0, y1 - y0))
+
+    def mark_all(self):
+        """Marca a tela inteira como suja (primeiro frame, janela exposta, overlays de tela cheia)."""
+        self.current.append(pygame.Rect(0, 0, self.width, self.height))
+
+    def merge(self, rects):
+        """
+        Junta os retângulos que se sobrepõem ou se tocam, para que cada pixel
+        seja apresentado uma vez só e a área somada seja a área real.
+        """
+        if len(rects) > self.MAX_RECTS:
+            return [rects[0].unionall(rects[1:])]
+
+        merged = []
+        for rect in rects:
+            rect = rect.copy()
+            i = 0
+            while i < len(merged):
+                if rect.colliderect(merged[i].inflate(2, 2)):
+                    rect.union_ip(merged.pop(i))
+                    i = 0
+                else:
+                    i += 1
+            merged.append(rect)
+        return merged
+
+    def skip(self):
+        """Frame pulado (nada desenhado nem apresentado): a tela continua a do último frame."""
+        self.current = []
+        self.ratio = 0.0
+
+    def present(self):
+        """
+        Encerra o frame
+        ------------------------
+        Retorna os retângulos a apresentar (frame atual + anterior, já juntos),
+        atualiza ratio e começa um novo frame.
+        """
+        rects = self.merge(self.previous + self.current)
+        area = sum(rect.w * rect.h for rect in rects)
+        self.ratio = min(1.0, area / (self.width * self.height))
+        self.previous = self.current
+        self.current = []
+        return rects
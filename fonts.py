@@ -0,0 +1,71 @@
+from collections import OrderedDict
+
+import pygame
+
+
+class TextCache:
+    """
+    Classe TextCache
+    -----------------
+    Cache compartilhado de fontes e de textos renderizados.
+    Criar uma fonte (pygame.font.SysFont) e renderizar um texto são operações
+    caras; como os textos do jogo (HUD, menus, lousas, nome na camisa) se repetem
+    a cada frame, a superfície renderizada é guardada e reaproveitada.
+
+    As fontes são guardadas por (família, tamanho, negrito) e os textos por
+    (família, tamanho, negrito, texto, cor). Os dois caches são LRU: quando
+    passam do limite, o item usado há mais tempo é descartado (os tamanhos
+    mudam com o zoom, então sem limite o cache cresceria sem parar).
+
+    As superfícies devolvidas são compartilhadas: só devem ser desenhadas (blit),
+    nunca alteradas.
+    """
+
+    def __init__(self, max_fonts=32, max_texts=512):
+        """
+        Parâmetros:
+        - max_fonts: Número máximo de fontes guardadas
+        - max_texts: Número máximo de textos renderizados guardados
+        """
+        pygame.font.init()
+        self.max_fonts = max_fonts
+        self.max_texts = max_texts
+        self.fonts = OrderedDict()
+        self.texts = OrderedDict()
+
+    def get_font(self, size, bold=False, family="Arial"):
+        """Retorna a fonte (família, tamanho, negrito), criando-a se necessário."""
+        key = (family, size, bold)
+        font = self.fonts.get(key)
+        if font is not None:
+            self.fonts.move_to_end(key)
+            return font
+
+        font = pygame.font.SysFont(family, size, bold=bold)
+        self.fonts[key] = font
+        if len(self.fonts) > self.max_fonts:
+            self.fonts.popitem(last=False)
+        return font
+
+    def render(self, text, size, color, bold=False, family="Arial"):
+        """
+        Retorna a superfície do texto renderizado (com antialiasing)
+        ------------------------------------------------------------
+        Parâmetros:
+        - text: Texto a renderizar
+        - size: Tamanho da fonte
+        - color: Cor (r, g, b) do texto
+        - bold: Negrito
+        - family: Família da fonte
+        """
+        key = (family, size, bold, text, tuple(color))
+        surface = self.texts.get(key)
+        if surface is not None:
+            self.texts.move_to_end(key)
+            return surface
+
+        surface = self.get_font(size, bold, family).render(text, True, color)
+        self.texts[key] = surface
+        if len(self.texts) > self.max_texts:
+            self.texts.popitem(last=False)
+        return surface
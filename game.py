@@ -1,10 +1,18 @@
+import math
 import pygame
+from contextlib import contextmanager
 from constants import (
-    WIDTH, HEIGHT, FPS, BLACK, WHITE, GREEN,
-    GAME_STATE_MENU, GAME_STATE_PLAYING, GAME_STATE_PAUSED, GAME_STATE_CONGRATS,
-    WALL_THICKNESS, MAX_TASKS
+    WIDTH, HEIGHT, TASK_DURATION, BLACK, WHITE, GREEN,
+    GAME_STATE_MENU, GAME_STATE_PLAYING, GAME_STATE_PAUSED, GAME_STATE_CONGRATS
 )
-from rooms import Room
+from rooms import Room, RoomLayerCache
+from player import PlayerSpriteCache
+from collision import CollisionGrid
+from level import load_level, DEFAULT_LEVEL
+
+
+""" Raio (no mundo) das hélices dos ventiladores """
+FAN_RADIUS = 12
 
 
 class Game:
@@ -14,7 +22,7 @@ class Game:
     Gerencia todo o estado e lógica do jogo.
     """
     
-    def __init__(self, screen, graphics, camera, player, menu_system, viewport):
+    def __init__(self, screen, graphics, camera, player, menu_system, viewport, level_path=DEFAULT_LEVEL):
         """
         Inicializa o jogo.
         
@@ -25,6 +33,7 @@ class Game:
         - player: Instância da classe Player
         - menu_system: Instância da classe MenuSystem
         - viewport: Instância da classe Viewport
+        - level_path: Arquivo da fase a carregar (ver level.py)
         """
         self.screen = screen
         self.graphics = graphics
@@ -33,16 +42,14 @@ class Game:
         self.menu_system = menu_system
         self.viewport = viewport
         
-        """Fontes"""
-        pygame.font.init()
-        self.game_font = pygame.font.SysFont('Arial', 18, bold=True)
-        self.small_font = pygame.font.SysFont('Arial', 14)
-        
         """Estado do jogo"""
         self.state = GAME_STATE_MENU
         self.show_controls = False
         self.rotation_angle = 0.0
         
+        """Estado do passo de simulação anterior (ver save_previous e interpolated)"""
+        self.previous_state = None
+        
         """Variáveis de tarefa"""
         self.task_active = False
         self.task_progress = 0.0
@@ -51,138 +58,219 @@ class Game:
         """Controle de teclas"""
         self.e_key_pressed = False
         
+        """Carrega a fase (salas, paredes, ventiladores e mini-mapa)"""
+        self.level = load_level(level_path)
+        self.player.x, self.player.y = self.level["player_start"]
+        
         """Cria as salas"""
         self.rooms = self._create_rooms()
+        self.max_tasks = len(self.rooms)
+        
+        """Cache das camadas estáticas das salas (refeito quando o zoom muda)"""
+        self.room_layers = RoomLayerCache(self.graphics, self.camera)
+        
+        """Cache do desenho do personagem (refeito quando o zoom muda)"""
+        self.player_sprite = PlayerSpriteCache(self.graphics, self.camera)
         
         """Cria as paredes"""
         self.walls = self._create_walls()
         
+        """Índice espacial de colisão (paredes fixas + portas que ligam/desligam)"""
+        self.collision_grid, self.door_colliders = self._create_collision_grid()
+        
+        """Grades das áreas de interação (porta e lousa) de cada sala: índice na grade = índice da sala"""
+        self.door_grid = self._create_room_grid(room.get_door_interaction_rect() for room in self.rooms)
+        self.board_grid = self._create_room_grid(room.button for room in self.rooms)
+        
+        """Salas com a porta abrindo ou fechando (só elas são atualizadas a cada passo)"""
+        self.moving_doors = {}
+        
         """Posições dos ventiladores"""
-        self.fan_positions = [
-            (room.x + room.w - 40, room.y + 30) for room in self.rooms
-        ]
+        self.fan_positions = list(self.level["fans"])
+        
+        """Mini-mapa: tamanho da célula e da matriz calculados a partir dos limites da fase"""
+        self.viewport.cell_size, self.minimap_width, self.minimap_height = self.level["minimap"]
+        
+        """Culling: salas e ventiladores fora da Janela não são desenhados"""
+        self.culling = True
+        self.culled_rooms = 0
+        self.culled_fans = 0
+        self.culled_count = 0
+        self.visible_rooms = self.rooms
+        self.visible_fans = []
+        
+        """Depuração (F3): mostra no HUD quantos objetos o culling descartou no frame"""
+        self.show_debug = False
     
     def _create_rooms(self):
         """
-        Cria as 5 salas do jogo
+        Cria as salas da fase
         ------------------------
-        Salas 1-4: Salas de aula com mesas e cadeiras
-        Sala 5: Sala de reunião com mesa circular
-        
-        Lousas posicionadas na FRENTE (parte superior) das salas
-        para ficarem de frente para as mesas e cadeiras.
+        As salas (posição, porta, lousa, texto e tipo) vêm do arquivo da fase
+        (ver level.py); o lado da porta já vem pré-calculado pelo carregador.
+        Salas de aula têm mesas e cadeiras; a sala de reunião tem mesa circular.
         """
-        return [
-            # Sala 1: Prog. Matemática 
-            Room(20, 20, 400, 180, (180, 190, 50, 10), (70, 35, 100, 30),
-                 self.graphics.draw_line, self.graphics.fill_rect, self.screen,
-                 "Prog. Matemática", self.camera.get_camera,
-                 self.graphics.fill_circle, is_meeting_room=False,
-                 fill_rect_textured=self.graphics.fill_rect_textured),
-            
-            # Sala 2: Complexidade 
-            Room(480, 20, 400, 180, (640, 190, 50, 10), (550, 35, 100, 30),
-                 self.graphics.draw_line, self.graphics.fill_rect, self.screen,
-                 "Complexidade", self.camera.get_camera,
-                 self.graphics.fill_circle, is_meeting_room=False,
-                 fill_rect_textured=self.graphics.fill_rect_textured),
-            
-            # Sala 3: Machine Learning
-            Room(20, 300, 400, 180, (180, 300, 50, 10), (70, 315, 100, 30),
-                 self.graphics.draw_line, self.graphics.fill_rect, self.screen,
-                 "Machine Learning", self.camera.get_camera,
-                 self.graphics.fill_circle, is_meeting_room=False,
-                 fill_rect_textured=self.graphics.fill_rect_textured),
-            
-            # Sala 4: Algebra Linear  
-            Room(480, 300, 400, 180, (580, 300, 50, 10), (490, 315, 100, 30),
-                 self.graphics.draw_line, self.graphics.fill_rect, self.screen,
-                    "Algebra Linear", self.camera.get_camera,
-                    self.graphics.fill_circle, is_meeting_room=False,
-                    fill_rect_textured=self.graphics.fill_rect_textured),
-            
-            # Sala 5: Reunião de Equipe no GESAD 
-            Room(250, 520, 400, 150, (410, 520, 50, 10), (300, 530, 80, 25),
-                 self.graphics.draw_line, self.graphics.fill_rect, self.screen,
-                 "Reunião", self.camera.get_camera,
-                 self.graphics.fill_circle, is_meeting_room=True,
-                 fill_rect_textured=self.graphics.fill_rect_textured),
-        ]
+        rooms = []
+        for data in self.level["rooms"]:
+            x, y, w, h = data["rect"]
+            rooms.append(
+                Room(x, y, w, h, data["door"], data["board"],
+                     self.graphics.draw_line, self.graphics.fill_rect, self.screen,
+                     data["text"], self.graphics.get_camera,
+                     self.graphics.fill_circle, is_meeting_room=data["meeting"],
+                     fill_rect_textured=self.graphics.fill_rect_textured,
+                     blit=self.graphics.blit, door_side=data["door_side"],
+                     render_text=self.graphics.render_text,
+                     draw_lines=self.graphics.draw_lines,
+                     world_to_screen=self.graphics.world_to_screen,
+                     on_door_blocking=self._door_blocking_changed)
+            )
+        return rooms
     
     def _create_walls(self):
-        """Cria as paredes das salas"""
-        walls = []
+        """Cria as paredes das salas (retângulos pré-calculados pelo carregador da fase)"""
+        return [pygame.Rect(wall) for wall in self.level["walls"]]
+    
+    def _create_collision_grid(self):
+        """
+        Cria o índice espacial de colisão
+        ------------------------
+        Registra as paredes e a porta de cada sala em uma CollisionGrid.
+        Retorna a grade e o dicionário sala -> índice da porta na grade; a
+        porta é ativada/desativada só quando is_door_blocking() muda
+        (Room.update_door chama _door_blocking_changed).
+        """
+        grid = CollisionGrid()
+        for wall in self.walls:
+            grid.insert(wall)
         
+        door_colliders = {}
         for room in self.rooms:
-            x, y, w, h = room.x, room.y, room.w, room.h
-            dx, dy, dw, dh = room.door
-            side = room.door_side
-            
-            """ Parede superior """
-            if side == "top":
-                door_start = dx
-                door_end = dx + dw
-                if door_start > x:
-                    walls.append(pygame.Rect(x, y, door_start - x, WALL_THICKNESS))
-                if door_end < x + w:
-                    walls.append(pygame.Rect(door_end, y, (x + w) - door_end, WALL_THICKNESS))
-            else:
-                walls.append(pygame.Rect(x, y, w, WALL_THICKNESS))
-            
-            """ Parede inferior """
-            if side == "bottom":
-                door_start = dx
-                door_end = dx + dw
-                if door_start > x:
-                    walls.append(pygame.Rect(x, y + h - WALL_THICKNESS, door_start - x, WALL_THICKNESS))
-                if door_end < x + w:
-                    walls.append(pygame.Rect(door_end, y + h - WALL_THICKNESS, (x + w) - door_end, WALL_THICKNESS))
-            else:
-                walls.append(pygame.Rect(x, y + h - WALL_THICKNESS, w, WALL_THICKNESS))
-            
-            """ Parede esquerda """
-            if side == "left":
-                door_start = dy
-                door_end = dy + dh
-                if door_start > y:
-                    walls.append(pygame.Rect(x, y, WALL_THICKNESS, door_start - y))
-                if door_end < y + h:
-                    walls.append(pygame.Rect(x, door_end, WALL_THICKNESS, (y + h) - door_end))
-            else:
-                walls.append(pygame.Rect(x, y, WALL_THICKNESS, h))
-            
-            """ Parede direita """
-            if side == "right":
-                door_start = dy
-                door_end = dy + dh
-                if door_start > y:
-                    walls.append(pygame.Rect(x + w - WALL_THICKNESS, y, WALL_THICKNESS, door_start - y))
-                if door_end < y + h:
-                    walls.append(pygame.Rect(x + w - WALL_THICKNESS, door_end, WALL_THICKNESS, (y + h) - door_end))
-            else:
-                walls.append(pygame.Rect(x + w - WALL_THICKNESS, y, WALL_THICKNESS, h))
-        
-        return walls
+            door_colliders[room] = grid.insert(room.get_door_collision_rect(), room.is_door_blocking())
+        return grid, door_colliders
+    
+    def _create_room_grid(self, rects):
+        """Cria uma CollisionGrid com um retângulo por sala, na ordem de self.rooms"""
+        grid = CollisionGrid()
+        for rect in rects:
+            grid.insert(rect)
+        return grid
+    
+    def _door_blocking_changed(self, room):
+        """Liga/desliga o colisor da porta de room (chamado por Room.update_door)"""
+        self.collision_grid.set_active(self.door_colliders[room], room.is_door_blocking())
+    
+    def interact_door(self, room):
+        """Abre/fecha a porta de room e passa a atualizar a sua animação"""
+        room.interact_door()
+        self.moving_doors[room] = True
     
     def reset_game(self):
         """Reseta o jogo para o estado inicial"""
-        self.player.x, self.player.y = 395, 240
+        self.player.x, self.player.y = self.level["player_start"]
         for room in self.rooms:
             room.completed = False
             room.door_open = False
             room.door_progress = 0.0
+            self._door_blocking_changed(room)
         self.task_active = False
         self.task_progress = 0.0
         self.active_room = None
+        self.previous_state = None
+    
+    def snapshot(self):
+        """
+        Estado interpolável do jogo
+        ---------------------------
+        Retorna a tupla (player_x, player_y, camera_x, camera_y, rotation_angle,
+        door_progress de cada sala): o que muda continuamente entre os passos
+        de simulação e aparece na tela.
+        """
+        return (self.player.x, self.player.y, self.camera.x, self.camera.y, self.rotation_angle,
+                tuple(room.door_progress for room in self.rooms))
+    
+    def capture(self, show_controls=False):
+        """
+        Cópia imutável de tudo o que o desenho lê
+        ---------------------------
+        Retorna a tupla (state, show_controls, opção selecionada no menu, zoom,
+        task_active, task_progress, índice da sala ativa ou None, salas
+        concluídas, show_debug, snapshot()). Usada pelo modo --threaded: a simulação
+        publica capturas e o Game da thread de renderização as aplica (restore).
+        """
+        active = self.rooms.index(self.active_room) if self.active_room is not None else None
+        return (self.state, show_controls, self.menu_system.selected, self.camera.zoom,
+                self.task_active, self.task_progress, active,
+                tuple(room.completed for room in self.rooms), self.show_debug, self.snapshot())
+
+    def restore(self, captured):
+        """Aplica uma captura (ver capture) neste jogo, para desenhá-la."""
+        (self.state, self.show_controls, self.menu_system.selected, zoom,
+         self.task_active, self.task_progress, active, completed, self.show_debug, snapshot) = captured
+        self.active_room = self.rooms[active] if active is not None else None
+        for room, done in zip(self.rooms, completed):
+            room.completed = done
+
+        px, py, cx, cy, self.rotation_angle, doors = snapshot
+        self.player.x, self.player.y = px, py
+        self.camera.zoom = zoom
+        self.camera.update(cx, cy)
+        for room, door in zip(self.rooms, doors):
+            room.door_progress = door
+
+    def save_previous(self):
+        """Guarda o estado antes de um passo de simulação (chamado antes de update/update_playing)."""
+        self.previous_state = self.snapshot()
+    
+    @contextmanager
+    def interpolated(self, alpha):
+        """
+        Desenho interpolado entre passos de simulação
+        ---------------------------
+        Dentro do bloco, jogador, câmera, ângulo dos ventiladores e portas ficam
+        na posição interpolada entre o passo anterior (save_previous) e o atual:
+        anterior + (atual - anterior) * alpha. Na saída o estado do passo atual
+        é restaurado, então a simulação não é afetada pelo desenho.
+        
+        Parâmetros:
+        - alpha: Fração (0.0 a 1.0) do próximo passo já decorrida (tempo acumulado / SIM_DT)
+        """
+        previous = self.previous_state
+        if previous is None or alpha >= 1.0:
+            yield
+            return
+        
+        current = self.snapshot()
+        px, py, cx, cy, angle, doors = current
+        prev_px, prev_py, prev_cx, prev_cy, prev_angle, prev_doors = previous
+        
+        """O ângulo volta a 0 depois de 2*pi: interpola pelo caminho curto"""
+        if angle < prev_angle:
+            angle += 2 * math.pi
+        
+        def lerp(a, b):
+            return a + (b - a) * alpha
+        
+        self.player.x, self.player.y = lerp(prev_px, px), lerp(prev_py, py)
+        self.camera.update(lerp(prev_cx, cx), lerp(prev_cy, cy))
+        self.rotation_angle = lerp(prev_angle, angle)
+        for room, prev_door, door in zip(self.rooms, prev_doors, doors):
+            room.door_progress = lerp(prev_door, door)
+        try:
+            yield
+        finally:
+            self.player.x, self.player.y, cx, cy, self.rotation_angle, doors = current
+            self.camera.update(cx, cy)
+            for room, door in zip(self.rooms, doors):
+                room.door_progress = door
     
     def update(self, dt):
         """
         Atualiza o estado do jogo e Atualiza ângulo de rotação para animações.
 
         Parâmetros:
-        - dt: Delta time desde o último frame
+        - dt: Duração do passo de simulação (SIM_DT)
         """
-        import math
         self.rotation_angle += 3.0 * dt
         if self.rotation_angle > 2 * math.pi:
             self.rotation_angle -= 2 * math.pi
@@ -192,13 +280,16 @@ class Game:
         Atualiza o estado durante o gameplay
         -----------------------------------
         Atualiza a posição do jogador, câmera, interações e tarefas.
+        Velocidades e a barra de progresso são por segundo, multiplicadas por dt.
         Parâmetros:
-        - dt: Delta time desde o último frame
+        - dt: Duração do passo de simulação (SIM_DT)
         
         """
-        """Atualiza animação das portas"""
-        for room in self.rooms:
+        """Atualiza animação das portas (só as que estão abrindo ou fechando)"""
+        for room in list(self.moving_doors):
             room.update_door(dt)
+            if not room.door_opening:
+                del self.moving_doors[room]
         
         """Atualiza câmera"""
         target_x = self.player.x + self.player.w / 2
@@ -209,26 +300,21 @@ class Game:
         self.player.update_speed(keys)
         
         """Movimento do jogador"""
+        step = self.player.speed * dt
         dx, dy = 0, 0
         if keys[pygame.K_w] or keys[pygame.K_UP]:
-            dy -= self.player.speed
+            dy -= step
         if keys[pygame.K_s] or keys[pygame.K_DOWN]:
-            dy += self.player.speed
+            dy += step
         if keys[pygame.K_a] or keys[pygame.K_LEFT]:
-            dx -= self.player.speed
+            dx -= step
         if keys[pygame.K_d] or keys[pygame.K_RIGHT]:
-            dx += self.player.speed
-        
-        """Colisão"""
-        collision_rects = self.walls.copy()
-        for room in self.rooms:
-            if room.is_door_blocking():
-                door_rect = room.get_door_collision_rect()
-                collision_rects.append(pygame.Rect(*door_rect))
+            dx += step
         
+        """Colisão (só testa paredes e portas próximas, via índice espacial)"""
         if dx != 0:
             self.player.x += dx
-            for wall in collision_rects:
+            for wall in self.collision_grid.query(self.player.rect()):
                 if self.player.rect().colliderect(wall):
                     if dx > 0:
                         self.player.x = wall.left - self.player.w
@@ -238,7 +324,7 @@ class Game:
         
         if dy != 0:
             self.player.y += dy
-            for wall in collision_rects:
+            for wall in self.collision_grid.query(self.player.rect()):
                 if self.player.rect().colliderect(wall):
                     if dy > 0:
                         self.player.y = wall.top - self.player.h
@@ -246,22 +332,24 @@ class Game:
                         self.player.y = wall.bottom
                     break
         
-        """ Interação com portas (teclado)"""
+        """ Interação com portas (teclado): só as salas com a área da porta perto do jogador"""
         if keys[pygame.K_e]:
             if not self.e_key_pressed:
                 self.e_key_pressed = True
-                for room in self.rooms:
+                for index in self.door_grid.query_indices(self.player.rect()):
+                    room = self.rooms[index]
                     interaction_rect = room.get_door_interaction_rect()
                     if self._intersects(self.player.rect(), interaction_rect):
-                        room.interact_door()
+                        self.interact_door(room)
                         break
         else:
             self.e_key_pressed = False
         
-        """ Interação com lousas (teclado)"""
+        """ Interação com lousas (teclado): só as lousas perto do jogador"""
         if not self.task_active:
             self.active_room = None
-            for room in self.rooms:
+            for index in self.board_grid.query_indices(self.player.rect()):
+                room = self.rooms[index]
                 if self._intersects(self.player.rect(), room.button):
                     if keys[pygame.K_e] and not room.completed:
                         self.task_active = True
@@ -269,7 +357,7 @@ class Game:
         
         """ Atualiza barra de progresso"""
         if self.task_active and self.active_room is not None:
-            self.task_progress += 1.0 / FPS
+            self.task_progress += dt / TASK_DURATION
             self.task_progress = min(self.task_progress, 1.0)
             
             if self.task_progress >= 1.0:
@@ -279,7 +367,7 @@ class Game:
                 
                 # Check for victory
                 completed_count = sum(1 for r in self.rooms if r.completed)
-                if completed_count >= MAX_TASKS:
+                if completed_count >= self.max_tasks:
                     self.state = GAME_STATE_CONGRATS
     
     def handle_mouse_click(self, mouse_x, mouse_y):
@@ -297,7 +385,7 @@ class Game:
             """Click na porta"""
             pdx, pdy, pdw, pdh = room.get_door_interaction_rect()
             if pdx <= world_x <= pdx + pdw and pdy <= world_y <= pdy + pdh:
-                room.interact_door()
+                self.interact_door(room)
                 return
             
             """ Click na lousa """
@@ -308,31 +396,89 @@ class Game:
                     self.active_room = room
                 return
     
+    def cull(self):
+        """
+        Etapa de culling
+        ------------------------
+        Testa o retângulo de cada sala e de cada ventilador no mundo contra
+        a Janela da câmera (Camera.get_window_bounds) antes de desenhar.
+        Os móveis ficam na camada em cache da sala e são descartados junto com ela.
+        Guarda as salas visíveis, a lista de (índice, x, y) dos ventiladores visíveis
+        e quantos objetos foram descartados no frame (culled_count).
+        """
+        fans = [(i, fx, fy) for i, (fx, fy) in enumerate(self.fan_positions)]
+        if not self.culling:
+            self.culled_rooms = self.culled_fans = self.culled_count = 0
+            self.visible_rooms, self.visible_fans = self.rooms, fans
+            return self.visible_rooms, self.visible_fans
+        
+        """Margem: camada da sala tem PAD pixels ao redor; ventilador tem raio 12 + espessura"""
+        margin = RoomLayerCache.PAD
+        rooms = [room for room in self.rooms
+                 if self.camera.is_visible(room.x, room.y, room.w, room.h, margin)]
+        fans = [(i, fx, fy) for i, fx, fy in fans
+                if self.camera.is_visible(fx - FAN_RADIUS - 1, fy - FAN_RADIUS - 1,
+                                          2 * FAN_RADIUS + 2, 2 * FAN_RADIUS + 2, 1)]
+        
+        self.culled_rooms = len(self.rooms) - len(rooms)
+        self.culled_fans = len(self.fan_positions) - len(fans)
+        self.culled_count = self.culled_rooms + self.culled_fans
+        self.visible_rooms, self.visible_fans = rooms, fans
+        return rooms, fans
+    
+    def draw_stages(self):
+        """
+        Etapas de desenho do gameplay, na ordem
+        ------------------------
+        Lista de (nome, função). draw_playing executa todas; o benchmark
+        (benchmark.py frames) mede o tempo de cada uma separadamente.
+        """
+        return [
+            ("rooms", self.draw_rooms),
+            ("fans", self.draw_fans),
+            ("player", self.draw_player),
+            ("minimap", self.draw_minimap),
+            ("hud", self.draw_hud),
+        ]
+    
     def draw_playing(self):
         """Desenha o estado de gameplay"""
-        for room in self.rooms:
-            room.draw()
-        
-        """ Desenha ventiladores animados"""
-        for i, (fx, fy) in enumerate(self.fan_positions):
+        for _, draw in self.draw_stages():
+            draw()
+    
+    def draw_rooms(self):
+        """Culling + desenho das salas visíveis (camadas em cache + portas)"""
+        rooms, _ = self.cull()
+        for room in rooms:
+            self.room_layers.draw(room)
+    
+    def draw_fans(self):
+        """ Desenha ventiladores animados (os visíveis, calculados em cull; quadros pré-renderizados)"""
+        for i, fx, fy in self.visible_fans:
             speed_mult = 1.0 + i * 0.3
-            self.graphics.draw_fan(fx, fy, 12, self.rotation_angle * speed_mult, WHITE, use_camera=True)
+            self.graphics.blit_fan(fx, fy, FAN_RADIUS, self.rotation_angle * speed_mult, WHITE, use_camera=True)
+    
+    def draw_player(self):
+        """Desenha o jogador (superfície em cache por zoom, ver PlayerSpriteCache)"""
+        self.player_sprite.draw(self.player)
+    
+    def draw_minimap(self):
+        """ Desenha viewport"""
+        viewport_matrix = self.viewport.update_matrix(self.player, self.rooms, self.walls, self.fan_positions,
+                                                      self.minimap_width, self.minimap_height)
+        self.viewport.draw(viewport_matrix, WIDTH - 280, 20, vp_scale=3)
+    
+    def draw_hud(self):
+        """Desenha a barra de progresso da tarefa, a barra de tarefas e as instruções"""
         
         """ Barra de progresso"""
         if self.task_active and self.active_room is not None:
-            task_text = self.game_font.render("Task em progresso...", True, BLACK)
+            task_text = self.graphics.render_text("Task em progresso...", 18, BLACK, bold=True)
             text_rect = task_text.get_rect(center=(WIDTH // 2, HEIGHT - 80))
-            self.screen.blit(task_text, text_rect)
+            self.graphics.blit(task_text, text_rect)
             
             self.graphics.draw_progress_bar(WIDTH // 2 - 100, HEIGHT - 60, 200, self.task_progress)
         
-        """Desenha jogador"""
-        self.player.draw()
-        
-        """ Desenha viewport"""
-        viewport_matrix = self.viewport.create_matrix(self.player, self.rooms, self.walls, self.fan_positions)
-        self.viewport.draw(viewport_matrix, WIDTH - 280, 20, vp_scale=3)
-        
         """ HUD: Barra de Tarefas (Among Us Style) """
         bar_x, bar_y = 10, 10
         bar_w, bar_h = 200, 20
@@ -343,25 +489,34 @@ class Game:
         
         # Progresso
         completed_count = sum(1 for r in self.rooms if r.completed)
-        progress_ratio = completed_count / MAX_TASKS
+        progress_ratio = completed_count / self.max_tasks
         fill_w = int(bar_w * progress_ratio)
         
         if fill_w > 0:
             self.graphics.fill_rect(bar_x, bar_y, fill_w, bar_h, GREEN, use_camera=False)
             
         # Segments
-        segment_w = bar_w / MAX_TASKS
-        for i in range(1, MAX_TASKS):
+        segment_w = bar_w / self.max_tasks
+        segments = []
+        for i in range(1, self.max_tasks):
             sx = int(bar_x + i * segment_w)
-            self.graphics.draw_line(sx, bar_y, sx, bar_y + bar_h, BLACK, use_camera=False)
+            segments.append((sx, bar_y, sx, bar_y + bar_h))
+        self.graphics.draw_lines(segments, BLACK, use_camera=False)
             
         # Texto
-        task_text = self.small_font.render(f"Tarefas: {completed_count}/{MAX_TASKS}", True, WHITE)
-        self.screen.blit(task_text, (bar_x, bar_y + bar_h + 5))
+        task_text = self.graphics.render_text(f"Tarefas: {completed_count}/{self.max_tasks}", 14, WHITE)
+        self.graphics.blit(task_text, (bar_x, bar_y + bar_h + 5))
+        
+        """ Depuração (F3): objetos descartados pelo culling neste frame"""
+        if self.show_debug:
+            debug_text = self.graphics.render_text(
+                f"Culling: {self.culled_count} descartados (salas {self.culled_rooms}, ventiladores {self.culled_fans})"
+                f" | desenhados: {len(self.visible_rooms)} salas, {len(self.visible_fans)} ventiladores", 14, BLACK)
+            self.graphics.blit(debug_text, (bar_x, bar_y + bar_h + 25))
         
         """ Instruções"""
-        help_text = self.small_font.render("WASD: Mover | SHIFT: Correr | E: Interagir | ESC: Pausar | + Zoom in | - Zoom out" , True, BLACK)
-        self.screen.blit(help_text, (10, HEIGHT - 25))
+        help_text = self.graphics.render_text("WASD: Mover | SHIFT: Correr | E: Interagir | ESC: Pausar | + Zoom in | - Zoom out", 14, BLACK)
+        self.graphics.blit(help_text, (10, HEIGHT - 25))
     
     def _intersects(self, r1, r2):
         """
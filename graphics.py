@@ -1,6 +1,93 @@
 import math
-from constants import WIDTH, HEIGHT, GRAY
-from clipping import cohen_sutherland_clip
+import pygame
+from collections import OrderedDict
+from contextlib import contextmanager
+from constants import GRAY, FAN_ROTATION_FRAMES
+from camera import Camera
+from clipping import cohen_sutherland_clip, cohen_sutherland_clip_many, clip_rect
+from fonts import TextCache
+from circles import CircleCache
+from transformations import Affine
+
+
+""" Período (largura, altura) em pixels de cada textura procedural """
+TEXTURE_PERIODS = {
+    "brick": (16, 16),
+    "checker": (16, 16),
+    "stripes": (1, 12),
+    "dots": (8, 8),
+}
+
+
+def texture_color(texture_type, lx, ly):
+    """
+    Cor da textura procedural no pixel local (lx, ly) do retângulo.
+    Texturas: "brick", "checker", "stripes", "dots"
+    """
+    if texture_type == "brick":
+        brick_w, brick_h = 16, 8
+        mortar = 1
+        row = ly // brick_h
+        offset = (brick_w // 2) if row % 2 else 0
+        bx = (lx + offset) % brick_w
+        by = ly % brick_h
+        if bx < mortar or by < mortar:
+            return (100, 100, 100)
+        return (160, 80, 60)
+    
+    elif texture_type == "checker":
+        tile_size = 8
+        if ((lx // tile_size) + (ly // tile_size)) % 2 == 0:
+            return (200, 200, 200)
+        return (100, 100, 100)
+    
+    elif texture_type == "stripes":
+        stripe_w = 6
+        if (ly // stripe_w) % 2 == 0:
+            return (180, 180, 100)
+        return (140, 140, 80)
+    
+    elif texture_type == "dots":
+        dot_spacing = 8
+        dx = lx % dot_spacing
+        dy = ly % dot_spacing
+        if dx < 2 and dy < 2:
+            return (255, 255, 200)
+        return (100, 80, 60)
+    
+    return GRAY
+
+
+def rect_segments(x, y, w, h):
+    """
+    Os 4 segmentos (x0, y0, x1, y1) da borda do retângulo (x, y, w, h),
+    com os cantos em x + w e y + h (mesma convenção de draw_rect).
+    """
+    return [
+        (x, y, x + w, y),
+        (x, y, x, y + h),
+        (x + w, y, x + w, y + h),
+        (x, y + h, x + w, y + h),
+    ]
+
+
+""" Direção (cos, sin) de cada uma das 4 pás do ventilador, no espaço local """
+FAN_BLADE_DIRECTIONS = ((1, 0), (0, 1), (-1, 0), (0, -1))
+
+
+def fan_model(radius):
+    """
+    Modelo das pás do ventilador no espaço local (centro na origem, ângulo 0)
+    ------------------------
+    Retorna os segmentos (x0, y0, x1, y1): cada pá tem 3 traços paralelos,
+    deslocados de -1, 0 e 1 na direção perpendicular à pá.
+    """
+    segments = []
+    for ux, uy in FAN_BLADE_DIRECTIONS:
+        for offset in (-1, 0, 1):
+            ox, oy = -offset * uy, offset * ux
+            segments.append((ox, oy, radius * ux + ox, radius * uy + oy))
+    return segments
 
 
 class Graphics:
@@ -9,18 +96,138 @@ class Graphics:
     ----------------
     Gerencia todas as operações de desenho usando set_pixel como base.
     Recebe a referência da tela (screen) e da câmera.
+    
+    Framebuffer: as primitivas escrevem em um pygame.PixelArray da tela
+    em vez de chamar screen.set_at para cada pixel. No modo framebuffer
+    o array fica travado durante todo o frame e só é liberado em flush()
+    (antes de pygame.display.flip()) ou antes de um blit.
+    
+    Retângulos sujos: se dirty (DirtyRegion) estiver definido, cada primitiva
+    e cada blit registra o retângulo de tela que alterou (mark_dirty), para o
+    loop principal apresentar só essas áreas. Camadas renderizadas com
+    render_target não são registradas (não desenham na tela).
+    
+    Tiles: se tiles (tiles.TileRenderer) estiver definido e a tela for o
+    framebuffer compartilhado dele, os preenchimentos grandes (fill_rect,
+    fill_rect_textured, fill_dither) são desenhados pelos processos de
+    renderização, cada um nos seus tiles (run_tiles).
     """
     
-    def __init__(self, screen, camera):
+    def __init__(self, screen, camera, use_framebuffer=True):
         """
         Inicializa o sistema gráfico.
         
         Parâmetros:
         - screen: Superfície do Pygame para desenhar
         - camera: Instância da classe Camera
+        - use_framebuffer: Se True, mantém o PixelArray travado durante o frame.
+                           Se False, trava e libera a tela a cada primitiva.
         """
         self.screen = screen
         self.camera = camera
+        self.width, self.height = screen.get_size()
+        self.use_framebuffer = use_framebuffer
+        self.pixels = None
+        self.textures = {}
+        self.text_cache = TextCache()
+        self.circle_cache = CircleCache()
+        self.fan_sprites = FanSpriteCache(self)
+        self.dirty = None
+        self.tiles = None
+    
+    def lock(self):
+        """
+        Retorna o PixelArray da tela (framebuffer), criando-o se necessário.
+        Enquanto o array existe a superfície fica travada para blit.
+        """
+        if self.pixels is None:
+            self.pixels = pygame.PixelArray(self.screen)
+        return self.pixels
+    
+    def unlock(self):
+        """Libera o framebuffer ao fim de uma primitiva (apenas fora do modo framebuffer)."""
+        if not self.use_framebuffer:
+            self.flush()
+    
+    def flush(self):
+        """
+        Libera o framebuffer do frame atual.
+        Deve ser chamado uma vez antes de pygame.display.flip().
+        """
+        if self.pixels is not None:
+            self.pixels.close()
+            self.pixels = None
+    
+    def blit(self, surface, dest):
+        """
+        Desenha uma superfície (ex: texto) na tela.
+        Libera o framebuffer antes, pois o Pygame não permite blit em superfície travada.
+        """
+        self.flush()
+        rect = self.screen.blit(surface, dest)
+        self.mark_dirty(rect.x, rect.y, rect.w, rect.h)
+        return rect
+    
+    def clear(self, color):
+        """Pinta a tela inteira com uma cor (screen.fill), liberando o framebuffer antes."""
+        self.flush()
+        self.screen.fill(color)
+        self.mark_dirty(0, 0, self.width, self.height)
+    
+    def mark_dirty(self, x, y, w, h):
+        """Registra o retângulo (x, y, w, h) de tela alterado, se o modo de retângulos sujos estiver ativo."""
+        if self.dirty is not None:
+            self.dirty.add(x, y, w, h)
+    
+    def run_tiles(self, area, name, x, y, w, h, *args):
+        """
+        Desenha um preenchimento com os processos de renderização (modo --tiles)
+        ------------------------
+        area é a área visível (já recortada); name, x, y, w, h e args formam o
+        comando em coordenadas de tela (ver tiles.run_commands). Retorna False,
+        sem desenhar, se não há TileRenderer, se o alvo não é o framebuffer
+        compartilhado, se a área é pequena demais para compensar o envio ou
+        se um processo morreu (o preenchimento é então desenhado localmente).
+        """
+        if self.tiles is None or not self.tiles.accepts(self.screen, area):
+            return False
+        self.flush()
+        return self.tiles.run([(name, x, y, w, h) + args])
+    
+    @contextmanager
+    def render_target(self, surface, camera):
+        """
+        Redireciona temporariamente todas as primitivas para outra superfície.
+        ------------------------------------------------------------------------
+        Dentro do bloco "with", set_pixel, linhas, preenchimentos e blits
+        desenham em surface usando a câmera dada, com clipping no tamanho
+        dessa superfície. Usado para renderizar camadas estáticas (salas).
+        """
+        self.flush()
+        saved_screen, saved_camera, saved_dirty = self.screen, self.camera, self.dirty
+        self.screen, self.camera, self.dirty = surface, camera, None
+        self.width, self.height = surface.get_size()
+        try:
+            yield self
+        finally:
+            self.flush()
+            self.screen, self.camera, self.dirty = saved_screen, saved_camera, saved_dirty
+            self.width, self.height = saved_screen.get_size()
+    
+    def get_camera(self):
+        """Retorna os parâmetros da câmera do alvo de desenho atual (ver Camera.get_camera)."""
+        return self.camera.get_camera()
+    
+    def world_to_screen(self, x, y):
+        """Converte um ponto do mundo para a tela do alvo de desenho atual (ver Camera.world_to_screen)."""
+        return self.camera.world_to_screen(x, y)
+    
+    def render_text(self, text, size, color, bold=False, family="Arial"):
+        """
+        Retorna a superfície de um texto renderizado, usando o cache
+        compartilhado de fontes e textos (ver fonts.TextCache).
+        """
+        return self.text_cache.render(text, size, color, bold, family)
     
     def set_pixel(self, x, y, color, use_camera=True):
         """
@@ -34,8 +241,10 @@ class Graphics:
         else:
             screen_x, screen_y = int(x), int(y)
         
-        if 0 <= screen_x < WIDTH and 0 <= screen_y < HEIGHT:
-            self.screen.set_at((screen_x, screen_y), color)
+        if 0 <= screen_x < self.width and 0 <= screen_y < self.height:
+            self.lock()[screen_x, screen_y] = color
+            self.unlock()
+            self.mark_dirty(screen_x, screen_y, 1, 1)
     
     def draw_line(self, x0, y0, x1, y1, color, use_camera=True):
         """
@@ -50,20 +259,22 @@ class Graphics:
             sx0, sy0, sx1, sy1 = int(x0), int(y0), int(x1), int(y1)
         
         # Aplica clipping Cohen-Sutherland
-        clipped = cohen_sutherland_clip(sx0, sy0, sx1, sy1, 0, 0, WIDTH - 1, HEIGHT - 1)
+        clipped = cohen_sutherland_clip(sx0, sy0, sx1, sy1, 0, 0, self.width - 1, self.height - 1)
         if clipped is None:
             return
         
         sx0, sy0, sx1, sy1 = int(clipped[0]), int(clipped[1]), int(clipped[2]), int(clipped[3])
+        self.mark_dirty(min(sx0, sx1), min(sy0, sy1), abs(sx1 - sx0) + 1, abs(sy1 - sy0) + 1)
         
         dx = abs(sx1 - sx0)
         dy = abs(sy1 - sy0)
         stepx = 1 if sx0 < sx1 else -1
         stepy = 1 if sy0 < sy1 else -1
         err = dx - dy
+        pixels = self.lock()
 
         while True:
-            self.screen.set_at((sx0, sy0), color)
+            pixels[sx0, sy0] = color
             if sx0 == sx1 and sy0 == sy1:
                 break
             e2 = err * 2
@@ -73,11 +284,98 @@ class Graphics:
             if e2 < dx:
                 err += dx
                 sy0 += stepy
+        self.unlock()
+    
+    def draw_lines(self, segments, color, use_camera=True):
+        """
+        Desenha vários segmentos de uma vez (mesmo resultado de draw_line em cada um)
+        ---------------------------------------------------
+        segments: lista de (x0, y0, x1, y1).
+        Todos os extremos são transformados em uma única passada pela câmera
+        (Camera.world_to_screen_segments); depois os segmentos são recortados
+        e rasterizados no framebuffer, que fica travado durante todo o lote.
+        Segmentos horizontais e verticais (bordas de retângulos, molduras,
+        móveis) são recortados direto e escritos como um span em uma única
+        operação; os demais são recortados juntos (cohen_sutherland_clip_many)
+        e desenhados com Bresenham.
+        """
+        if use_camera:
+            screen_segments = self.camera.world_to_screen_segments(segments)
+        else:
+            screen_segments = [(int(x0), int(y0), int(x1), int(y1)) for x0, y0, x1, y1 in segments]
+        
+        """Retângulo sujo: envolvente de todos os segmentos do lote (recortado na tela)"""
+        if self.dirty is not None and screen_segments:
+            x0s, y0s, x1s, y1s = zip(*screen_segments)
+            left, top = min(min(x0s), min(x1s)), min(min(y0s), min(y1s))
+            right, bottom = max(max(x0s), max(x1s)), max(max(y0s), max(y1s))
+            self.dirty.add(left, top, right - left + 1, bottom - top + 1)
+        
+        xmax, ymax = self.width - 1, self.height - 1
+        pixels = self.lock()
+        diagonals = []
+        
+        for segment in screen_segments:
+            sx0, sy0, sx1, sy1 = segment
+            if sy0 == sy1:
+                """Horizontal: recorte direto no intervalo [0, xmax]"""
+                if 0 <= sy0 <= ymax:
+                    start, end = max(0, min(sx0, sx1)), min(xmax, max(sx0, sx1))
+                    if start <= end:
+                        pixels[start:end + 1, sy0] = color
+            elif sx0 == sx1:
+                """Vertical"""
+                if 0 <= sx0 <= xmax:
+                    start, end = max(0, min(sy0, sy1)), min(ymax, max(sy0, sy1))
+                    if start <= end:
+                        pixels[sx0, start:end + 1] = color
+            else:
+                diagonals.append(segment)
+        
+        """Diagonais: recorte de todas de uma vez (Cohen-Sutherland em lote) e Bresenham"""
+        if diagonals:
+            x0s, y0s, x1s, y1s = zip(*diagonals)
+            clipped = cohen_sutherland_clip_many(x0s, y0s, x1s, y1s, 0, 0, xmax, ymax)
+            for sx0, sy0, sx1, sy1, accepted in zip(*clipped):
+                if not accepted:
+                    continue
+                sx0, sy0, sx1, sy1 = int(sx0), int(sy0), int(sx1), int(sy1)
+                
+                dx = abs(sx1 - sx0)
+                dy = abs(sy1 - sy0)
+                stepx = 1 if sx0 < sx1 else -1
+                stepy = 1 if sy0 < sy1 else -1
+                err = dx - dy
+                while True:
+                    pixels[sx0, sy0] = color
+                    if sx0 == sx1 and sy0 == sy1:
+                        break
+                    e2 = err * 2
+                    if e2 > -dy:
+                        err -= dy
+                        sx0 += stepx
+                    if e2 < dx:
+                        err += dx
+                        sy0 += stepy
+        self.unlock()
+    
+    def draw_polyline(self, points, color, closed=False, use_camera=True):
+        """
+        Desenha uma linha poligonal ligando os pontos [(x, y), ...] em ordem
+        (e o último ao primeiro, se closed), usando draw_lines.
+        """
+        segments = [(x0, y0, x1, y1) for (x0, y0), (x1, y1) in zip(points, points[1:])]
+        if closed and len(points) > 2:
+            (x0, y0), (x1, y1) = points[-1], points[0]
+            segments.append((x0, y0, x1, y1))
+        self.draw_lines(segments, color, use_camera)
     
     def draw_circle(self, cx, cy, radius, color, use_camera=True):
         """
         Desenha um círculo usando o Algoritmo de Bresenham (Midpoint Circle)
-        Usa apenas set_pixel para desenhar.
+        Os pontos dos 8 octantes de cada raio são calculados uma vez e
+        guardados como trechos horizontais (CircleCache.outline); cada trecho
+        é recortado e escrito de uma vez no framebuffer.
         """
         if use_camera:
             scx, scy = self.camera.world_to_screen(cx, cy)
@@ -85,36 +383,48 @@ class Graphics:
         else:
             scx, scy, sr = int(cx), int(cy), int(radius)
         
-        x = 0
-        y = sr
-        d = 3 - 2 * sr
-        
-        def draw_circle_points(cx, cy, x, y):
-            points = [
-                (cx + x, cy + y), (cx - x, cy + y),
-                (cx + x, cy - y), (cx - x, cy - y),
-                (cx + y, cy + x), (cx - y, cy + x),
-                (cx + y, cy - x), (cx - y, cy - x)
-            ]
-            for px, py in points:
-                if 0 <= px < WIDTH and 0 <= py < HEIGHT:
-                    self.screen.set_at((px, py), color)
-        
-        while x <= y:
-            draw_circle_points(scx, scy, x, y)
-            if d < 0:
-                d = d + 4 * x + 6
-            else:
-                d = d + 4 * (x - y) + 10
-                y -= 1
-            x += 1
+        """Clipping do retângulo envolvente: fora da tela não desenha; todo dentro dispensa testes por pixel"""
+        box = (scx - sr, scy - sr, 2 * sr + 1, 2 * sr + 1)
+        visible = clip_rect(*box, 0, 0, self.width - 1, self.height - 1)
+        if visible is None:
+            return
+        inside = visible == (box[0], box[1], box[0] + box[2], box[1] + box[3])
+        self.mark_dirty(*box)
+        
+        """Trechos do contorno do raio sr (tabela em cache): pixel isolado ou um slice por trecho"""
+        pixels = self.lock()
+        if inside:
+            for dy, start, end in self.circle_cache.outline(sr):
+                if end - start == 1:
+                    pixels[scx + start, scy + dy] = color
+                else:
+                    pixels[scx + start:scx + end, scy + dy] = color
+        else:
+            width, height = self.width, self.height
+            for dy, start, end in self.circle_cache.outline(sr):
+                y = scy + dy
+                if 0 <= y < height:
+                    start, end = max(0, scx + start), min(width, scx + end)
+                    if start < end:
+                        pixels[start:end, y] = color
+        self.unlock()
     
     def flood_fill(self, x, y, fill_color, boundary_color=None):
         """
-        Algoritmo Flood Fill (preenchimento por inundação)
-        ---------------------------------------------------
+        Algoritmo Flood Fill (preenchimento por inundação) por spans
+        -------------------------------------------------------------
         Preenche uma região a partir de um ponto semente (x, y).
-        Usa versão iterativa com pilha para evitar stack overflow.
+        Versão por linhas de varredura (Smith/Heckbert): cada span horizontal
+        da região é preenchido de uma vez no framebuffer e só as linhas de cima
+        e de baixo recebem sementes, uma por trecho ainda não preenchido.
+        Cada entrada da pilha é (y, x_esq, x_dir, dy): o span pai na linha y;
+        a linha a examinar é y + dy. Trechos que passam das pontas do pai
+        ("vazamentos") também são verificados na direção oposta (-dy).
+        
+        Pixels já preenchidos deixam de pertencer à região, então não há
+        conjunto de visitados. As linhas são lidas uma vez do framebuffer e
+        convertidas em uma máscara de bytes (1 = fora da região), em que as
+        bordas dos spans são achadas com find/rfind.
         
         Parâmetros:
         - x, y: Ponto semente (início do preenchimento)
@@ -126,55 +436,94 @@ class Graphics:
               No JOGO, usa-se Scanline para preenchimento.
         """
         x, y = int(x), int(y)
+        width, height = self.width, self.height
         
         # Verifica se o ponto inicial está dentro da tela
-        if not (0 <= x < WIDTH and 0 <= y < HEIGHT):
+        if not (0 <= x < width and 0 <= y < height):
             return
         
-        # Obtém a cor original do ponto semente
-        original_color = self.screen.get_at((x, y))[:3]  # Ignora alpha
+        pixels = self.lock()
+        map_rgb = self.screen.map_rgb
+        
+        # Obtém a cor original do ponto semente (valor mapeado do framebuffer, sem alpha)
+        original_color = pixels[x, y]
+        fill_value = map_rgb(fill_color[:3])
         
         # Se a cor original já é a cor de preenchimento, não faz nada
-        if original_color == fill_color[:3] if len(fill_color) >= 3 else fill_color:
+        if original_color == fill_value:
+            self.unlock()
             return
         
-        # Pilha para processamento iterativo (evita recursão profunda)
-        stack = [(x, y)]
-        visited = set()
+        # Pixel fora da região: Boundary Fill para na cor de borda (e no que já foi
+        # preenchido); Flood Fill tradicional só preenche a cor original
+        if boundary_color is not None:
+            outside = {map_rgb(boundary_color[:3]), fill_value}.__contains__
+        else:
+            outside = original_color.__ne__
+        
+        masks = {}
+        
+        def mask(row):
+            """Máscara da linha row (1 = fora da região), lida do framebuffer na primeira vez."""
+            m = masks.get(row)
+            if m is None:
+                m = masks[row] = bytearray(map(outside, pixels[:, row]))
+            return m
+        
+        if mask(y)[x]:
+            self.unlock()
+            return
+        
+        stack = []
+        
+        def push(row, left, right, dy):
+            if 0 <= row + dy < height:
+                stack.append((row, left, right, dy))
+        
+        push(y, x, x, 1)
+        push(y + 1, x, x, -1)
+        left_most, right_most, top, bottom = x, x, y, y
         
         while stack:
-            cx, cy = stack.pop()
-            
-            # Verifica limites e se já foi visitado
-            if not (0 <= cx < WIDTH and 0 <= cy < HEIGHT):
-                continue
-            if (cx, cy) in visited:
-                continue
+            row, x1, x2, dy = stack.pop()
+            row += dy
+            m = mask(row)
             
-            # Obtém a cor atual do pixel
-            current_color = self.screen.get_at((cx, cy))[:3]
-            
-            # Verifica condição de preenchimento
-            if boundary_color is not None:
-                # Boundary Fill: para quando encontra a cor de borda
-                if current_color == boundary_color[:3] if len(boundary_color) >= 3 else boundary_color:
-                    continue
-                if current_color == fill_color[:3] if len(fill_color) >= 3 else fill_color:
-                    continue
+            # Estende para a esquerda a partir de x1
+            if not m[x1]:
+                left = m.rfind(1, 0, x1) + 1
+                if left < x1:
+                    push(row, left, x1 - 1, -dy)
+                x = x1 + 1
             else:
-                # Flood Fill tradicional: só preenche se for a cor original
-                if current_color != original_color:
+                # x1 está fora: procura o primeiro pixel da região em (x1, x2]
+                x = m.find(0, x1 + 1, x2 + 1)
+                if x < 0:
                     continue
+                left = x
             
-            # Marca como visitado e preenche
-            visited.add((cx, cy))
-            self.screen.set_at((cx, cy), fill_color)
-            
-            # Adiciona vizinhos (4-conectividade)
-            stack.append((cx + 1, cy))
-            stack.append((cx - 1, cy))
-            stack.append((cx, cy + 1))
-            stack.append((cx, cy - 1))
+            while True:
+                # Estende o span para a direita e preenche [left, x) de uma vez
+                x = m.find(1, x)
+                if x < 0:
+                    x = width
+                pixels[left:x, row] = fill_value
+                m[left:x] = b"\x01" * (x - left)
+                left_most, right_most = min(left_most, left), max(right_most, x - 1)
+                top, bottom = min(top, row), max(bottom, row)
+                
+                push(row, left, x - 1, dy)
+                if x > x2 + 1:
+                    push(row, x2 + 1, x - 1, -dy)
+                
+                # Próximo trecho da região ainda sob o span pai
+                x = m.find(0, x + 1, x2 + 1)
+                if x < 0:
+                    break
+                left = x
+        
+        self.unlock()
+        self.mark_dirty(left_most, top, right_most - left_most + 1, bottom - top + 1)
     
     def flood_fill_rect(self, x, y, w, h, fill_color, border_color):
         """
@@ -199,7 +548,11 @@ class Graphics:
     
     def fill_circle(self, cx, cy, radius, color, use_camera=True):
         """
-        Preenche um círculo usando scanlines e set_pixel.
+        Preenche um círculo usando scanlines.
+        O círculo é recortado uma vez: as linhas fora da tela nem são visitadas
+        e cada span é recortado nas bordas e escrito de uma vez, sem teste por pixel.
+        A meia largura de cada linha vem da tabela do raio (CircleCache.half_widths),
+        calculada uma vez por raio.
         """
         if use_camera:
             scx, scy = self.camera.world_to_screen(cx, cy)
@@ -207,23 +560,33 @@ class Graphics:
         else:
             scx, scy, sr = int(cx), int(cy), int(radius)
         
-        for y in range(-sr, sr + 1):
-            half_width = int(math.sqrt(max(0, sr * sr - y * y)))
-            for x in range(-half_width, half_width + 1):
-                px, py = scx + x, scy + y
-                if 0 <= px < WIDTH and 0 <= py < HEIGHT:
-                    self.screen.set_at((px, py), color)
+        width = self.width
+        first = max(-sr, -scy)
+        last = min(sr, self.height - 1 - scy)
+        if first > last:
+            return
+        
+        self.mark_dirty(scx - sr, scy + first, 2 * sr + 1, last - first + 1)
+        half_widths = self.circle_cache.half_widths(sr)
+        pixels = self.lock()
+        for y in range(first, last + 1):
+            half_width = half_widths[abs(y)]
+            start = max(0, scx - half_width)
+            end = min(width, scx + half_width + 1)
+            if start < end:
+                pixels[start:end, scy + y] = color
+        self.unlock()
     
     def draw_rect(self, x, y, w, h, color, use_camera=True):
-        """Desenha um retângulo usando draw_line (que usa set_pixel)"""
-        self.draw_line(x, y, x + w, y, color, use_camera)
-        self.draw_line(x, y, x, y + h, color, use_camera)
-        self.draw_line(x + w, y, x + w, y + h, color, use_camera)
-        self.draw_line(x, y + h, x + w, y + h, color, use_camera)
+        """Desenha a borda de um retângulo (4 segmentos em um único draw_lines)"""
+        self.draw_lines(rect_segments(x, y, w, h), color, use_camera)
     
     def fill_rect(self, x, y, w, h, color, use_camera=True):
         """
-        Preenche um retângulo usando apenas set_pixel (scanline)
+        Preenche um retângulo (scanline)
+        ---------------------------------
+        Recorta o retângulo contra a tela e escreve todos os spans
+        (linhas horizontais) do bloco recortado de uma só vez no framebuffer.
         """
         if use_camera:
             sx, sy = self.camera.world_to_screen(x, y)
@@ -233,19 +596,85 @@ class Graphics:
             sx, sy, sw, sh = int(x), int(y), int(w), int(h)
         
         # Clipping
-        start_x = max(0, sx)
-        end_x = min(WIDTH, sx + sw)
-        start_y = max(0, sy)
-        end_y = min(HEIGHT, sy + sh)
+        visible = clip_rect(sx, sy, sw, sh, 0, 0, self.width - 1, self.height - 1)
+        if visible is not None:
+            start_x, start_y, end_x, end_y = visible
+            area = (end_x - start_x) * (end_y - start_y)
+            if not self.run_tiles(area, "fill_rect", sx, sy, sw, sh, color):
+                self.lock()[start_x:end_x, start_y:end_y] = color
+                self.unlock()
+            self.mark_dirty(start_x, start_y, end_x - start_x, end_y - start_y)
+    
+    def fill_dither(self, x, y, w, h, color, step=2, use_camera=True):
+        """
+        Pontilhado (dither) de um retângulo
+        ------------------------------------
+        Pinta com color um pixel a cada step, nas duas direções, a partir do
+        canto (x, y): escurece o que já está desenhado sem cobri-lo (overlay
+        do menu de pausa). Os pixels de cada coluna pontilhada são escritos de
+        uma só vez por uma fatia com passo do framebuffer.
+        """
+        if use_camera:
+            sx, sy = self.camera.world_to_screen(x, y)
+            sw = int(w * self.camera.zoom)
+            sh = int(h * self.camera.zoom)
+        else:
+            sx, sy, sw, sh = int(x), int(y), int(w), int(h)
         
-        for py in range(start_y, end_y):
-            for px in range(start_x, end_x):
-                self.screen.set_at((px, py), color)
+        visible = clip_rect(sx, sy, sw, sh, 0, 0, self.width - 1, self.height - 1)
+        if visible is None:
+            return
+        start_x, start_y, end_x, end_y = visible
+        area = (end_x - start_x) * (end_y - start_y)
+        if not self.run_tiles(area, "fill_dither", sx, sy, sw, sh, color, step):
+            """Primeiro pixel visível na fase do canto (sx, sy)"""
+            first_x = start_x + (sx - start_x) % step
+            first_y = start_y + (sy - start_y) % step
+            self.lock()[first_x:end_x:step, first_y:end_y:step] = color
+            self.unlock()
+        self.mark_dirty(start_x, start_y, end_x - start_x, end_y - start_y)
+    
+    def get_texture(self, texture_type):
+        """
+        Retorna o PixelArray da textura procedural (cache).
+        ----------------------------------------------------
+        Na primeira chamada gera um período do padrão com texture_color e o
+        repete em uma superfície do tamanho do alvo de desenho mais um período.
+        As texturas são definidas em pixels de tela relativos à origem do
+        retângulo, então não dependem do zoom; cada tipo só é gerado de novo
+        se um alvo maior (ex: camada de sala com zoom alto) precisar dele.
+        Retorna None para tipos desconhecidos.
+        """
+        if texture_type not in TEXTURE_PERIODS:
+            return None
+        tile_w, tile_h = TEXTURE_PERIODS[texture_type]
+        atlas_w = self.width + tile_w
+        atlas_h = self.height + tile_h
+        texture = self.textures.get(texture_type)
+        if texture is None or texture.shape[0] < atlas_w or texture.shape[1] < atlas_h:
+            if texture is not None:
+                atlas_w = max(atlas_w, texture.shape[0])
+                atlas_h = max(atlas_h, texture.shape[1])
+                texture.close()
+            tile = pygame.Surface((tile_w, tile_h), 0, self.screen)
+            for ly in range(tile_h):
+                for lx in range(tile_w):
+                    tile.set_at((lx, ly), texture_color(texture_type, lx, ly))
+            
+            atlas = pygame.Surface((atlas_w, atlas_h), 0, self.screen)
+            for ty in range(0, atlas_h, tile_h):
+                for tx in range(0, atlas_w, tile_w):
+                    atlas.blit(tile, (tx, ty))
+            self.textures[texture_type] = pygame.PixelArray(atlas)
+        return self.textures[texture_type]
     
     def fill_rect_textured(self, x, y, w, h, texture_type="brick", use_camera=True):
         """
         Preenche um retângulo com textura procedural.
         Texturas: "brick", "checker", "stripes", "dots"
+        
+        Copia o bloco recortado da textura em cache (get_texture) com a fase
+        correta em relação à origem do retângulo, sem calcular o padrão por pixel.
         """
         if use_camera:
             sx, sy = self.camera.world_to_screen(x, y)
@@ -254,74 +683,58 @@ class Graphics:
         else:
             sx, sy, sw, sh = int(x), int(y), int(w), int(h)
         
-        start_x = max(0, sx)
-        end_x = min(WIDTH, sx + sw)
-        start_y = max(0, sy)
-        end_y = min(HEIGHT, sy + sh)
+        texture = self.get_texture(texture_type)
+        if texture is None:
+            self.fill_rect(sx, sy, sw, sh, GRAY, use_camera=False)
+            return
         
-        for py in range(start_y, end_y):
-            for px in range(start_x, end_x):
-                lx = px - sx
-                ly = py - sy
-                
-                if texture_type == "brick":
-                    brick_w, brick_h = 16, 8
-                    mortar = 1
-                    row = ly // brick_h
-                    offset = (brick_w // 2) if row % 2 else 0
-                    bx = (lx + offset) % brick_w
-                    by = ly % brick_h
-                    if bx < mortar or by < mortar:
-                        color = (100, 100, 100)
-                    else:
-                        color = (160, 80, 60)
-                        
-                elif texture_type == "checker":
-                    tile_size = 8
-                    if ((lx // tile_size) + (ly // tile_size)) % 2 == 0:
-                        color = (200, 200, 200)
-                    else:
-                        color = (100, 100, 100)
-                        
-                elif texture_type == "stripes":
-                    stripe_w = 6
-                    if (ly // stripe_w) % 2 == 0:
-                        color = (180, 180, 100)
-                    else:
-                        color = (140, 140, 80)
-                        
-                elif texture_type == "dots":
-                    dot_spacing = 8
-                    dx = lx % dot_spacing
-                    dy = ly % dot_spacing
-                    if dx < 2 and dy < 2:
-                        color = (255, 255, 200)
-                    else:
-                        color = (100, 80, 60)
-                else:
-                    color = GRAY
-                
-                self.screen.set_at((px, py), color)
+        visible = clip_rect(sx, sy, sw, sh, 0, 0, self.width - 1, self.height - 1)
+        if visible is None:
+            return
+        start_x, start_y, end_x, end_y = visible
+        area = (end_x - start_x) * (end_y - start_y)
+        if self.run_tiles(area, "fill_rect_textured", sx, sy, sw, sh, texture_type):
+            self.mark_dirty(start_x, start_y, end_x - start_x, end_y - start_y)
+            return
+        
+        """Fase da textura: posição local (lx, ly) do primeiro pixel visível, módulo o período"""
+        tile_w, tile_h = TEXTURE_PERIODS[texture_type]
+        phase_x = (start_x - sx) % tile_w
+        phase_y = (start_y - sy) % tile_h
+        
+        self.lock()[start_x:end_x, start_y:end_y] = texture[
+            phase_x:phase_x + (end_x - start_x),
+            phase_y:phase_y + (end_y - start_y)
+        ]
+        self.unlock()
+        self.mark_dirty(start_x, start_y, end_x - start_x, end_y - start_y)
     
     def draw_fan(self, cx, cy, radius, angle, color, use_camera=True):
         """
         Desenha um ventilador (hélice) com 4 pás rotacionando.
         Demonstra animação + rotação + primitivas.
+        As pás (fan_model) são levadas para o mundo por uma matriz afim
+        (translação @ rotação), com seno e cosseno calculados uma vez por
+        ventilador em vez de uma vez por pá e por traço; draw_lines as leva
+        para a tela pela câmera.
         """
-        num_blades = 4
-        
-        for i in range(num_blades):
-            blade_angle = angle + (i * math.pi / 2)
-            end_x = cx + radius * math.cos(blade_angle)
-            end_y = cy + radius * math.sin(blade_angle)
-            
-            for offset in [-1, 0, 1]:
-                ox = offset * math.cos(blade_angle + math.pi/2)
-                oy = offset * math.sin(blade_angle + math.pi/2)
-                self.draw_line(cx + ox, cy + oy, end_x + ox, end_y + oy, color, use_camera)
+        """Modelo no espaço local -> mundo com uma única matriz"""
+        transform = Affine.translation(cx, cy) @ Affine.rotation(angle)
+        self.draw_lines(transform.apply_segments(fan_model(radius)), color, use_camera)
         
         self.draw_circle(cx, cy, 3, (255, 255, 255), use_camera)
     
+    def blit_fan(self, cx, cy, radius, angle, color, use_camera=True):
+        """
+        Desenha um ventilador a partir dos quadros de rotação pré-renderizados
+        (FanSpriteCache): o quadro mais próximo de angle é copiado com um blit.
+        Com FAN_ROTATION_FRAMES = 0 as pás são desenhadas a cada chamada (draw_fan).
+        """
+        if self.fan_sprites.frames <= 0:
+            self.draw_fan(cx, cy, radius, angle, color, use_camera)
+        else:
+            self.fan_sprites.draw(cx, cy, radius, angle, color, use_camera)
+    
     def draw_progress_bar(self, x, y, w, progress):
         """
         Barra de Progresso usando set_pixel
@@ -339,3 +752,88 @@ class Graphics:
             int(color[1] * f),
             int(color[2] * f),
         )
+
+
+class FanSpriteCache:
+    """
+    Classe FanSpriteCache
+    ----------------------
+    Quadros de rotação pré-renderizados dos ventiladores.
+    Em vez de calcular e rasterizar as 12 linhas das pás e o círculo central a
+    cada frame, cada ventilador (raio, cor, zoom) é renderizado uma vez em
+    frames ângulos igualmente espaçados (uma volta completa), e a cada frame
+    o quadro mais próximo do ângulo pedido é apenas copiado (blit).
+    
+    As 4 pás são iguais e estão a 90 graus uma da outra, então o desenho se
+    repete a cada quarto de volta: com frames múltiplo de 4 só frames / 4
+    quadros distintos são guardados.
+    
+    frames regula a precisão angular (passo de 360 / frames graus) contra a
+    memória: cada quadro ocupa (2 * (raio * zoom + 2 + PAD) + 1)^2 pixels. Os
+    quadros ficam em um cache LRU de até max_sprites superfícies (o zoom muda
+    e cada zoom tem os seus quadros).
+    """
+    
+    """Cor transparente (colorkey) do fundo dos quadros"""
+    COLORKEY = (255, 0, 255)
+    
+    """Margem (em pixels) ao redor do ventilador"""
+    PAD = 2
+    
+    def __init__(self, graphics, frames=FAN_ROTATION_FRAMES, max_sprites=256):
+        """
+        Parâmetros:
+        - graphics: Instância de Graphics (usada para renderizar os quadros)
+        - frames: Quadros por volta completa (precisão angular)
+        - max_sprites: Número máximo de quadros guardados
+        """
+        self.graphics = graphics
+        self.frames = frames
+        self.max_sprites = max_sprites
+        self.sprites = OrderedDict()
+    
+    def frame_index(self, angle):
+        """Índice do quadro mais próximo de angle, já reduzido pela simetria das 4 pás."""
+        index = round(angle / (2 * math.pi) * self.frames)
+        distinct = self.frames // 4 if self.frames % 4 == 0 else self.frames
+        return index % distinct
+    
+    def get_sprite(self, radius, color, zoom, index):
+        """
+        Retorna o quadro index do ventilador (raio, cor) no zoom dado, renderizando-o
+        se necessário. O centro do ventilador fica no pixel (half, half) do quadro;
+        retorna (superfície, half).
+        """
+        key = (radius, tuple(color), zoom, index)
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            self.sprites.move_to_end(key)
+            return sprite
+        
+        half = int(radius * zoom) + 2 + self.PAD
+        surface = pygame.Surface((2 * half + 1, 2 * half + 1), 0, self.graphics.screen)
+        surface.fill(self.COLORKEY)
+        surface.set_colorkey(self.COLORKEY)
+        
+        """Câmera do quadro: centro do ventilador (origem) no pixel (half, half)"""
+        sprite_camera = Camera(2 * half, 2 * half)
+        sprite_camera.zoom = zoom
+        angle = index * 2 * math.pi / self.frames
+        with self.graphics.render_target(surface, sprite_camera):
+            self.graphics.draw_fan(0, 0, radius, angle, color, use_camera=True)
+        
+        sprite = self.sprites[key] = (surface, half)
+        if len(self.sprites) > self.max_sprites:
+            self.sprites.popitem(last=False)
+        return sprite
+    
+    def draw(self, cx, cy, radius, angle, color, use_camera=True):
+        """Desenha o ventilador em (cx, cy): um blit do quadro mais próximo de angle."""
+        if use_camera:
+            zoom = self.graphics.camera.zoom
+            sx, sy = self.graphics.camera.world_to_screen(cx, cy)
+        else:
+            zoom = 1.0
+            sx, sy = int(cx), int(cy)
+        surface, half = self.get_sprite(radius, color, zoom, self.frame_index(angle))
+        self.graphics.blit(surface, (sx - half, sy - half))
@@ -0,0 +1,227 @@
+import json
+import marshal
+import math
+import os
+
+from constants import WIDTH, HEIGHT, WALL_THICKNESS
+from rooms import compute_door_side
+
+
+""" Versão do formato do cache binário (mudar invalida os caches existentes) """
+LEVEL_CACHE_VERSION = 1
+
+""" Fase padrão do jogo """
+DEFAULT_LEVEL = os.path.join("assets", "levels", "nc2a.json")
+
+""" Mini-mapa: tamanho mínimo da célula (pixels do mundo) e tamanho máximo da matriz """
+MINIMAP_CELL_SIZE = 10
+MINIMAP_MAX_WIDTH = 90
+MINIMAP_MAX_HEIGHT = 70
+
+""" Constantes do código usadas nos dados derivados (entram na chave do cache: mudar uma refaz o cache) """
+DERIVED_CONSTANTS = (WIDTH, HEIGHT, WALL_THICKNESS, MINIMAP_CELL_SIZE, MINIMAP_MAX_WIDTH, MINIMAP_MAX_HEIGHT)
+
+
+class LevelError(ValueError):
+    """Erro de validação de um arquivo de fase."""
+
+
+def room_walls(x, y, w, h, door, side):
+    """
+    Paredes de colisão de uma sala
+    ------------------------
+    Retorna a lista de retângulos (x, y, w, h) das 4 paredes da sala,
+    com a abertura da porta no lado side.
+    """
+    walls = []
+    dx, dy, dw, dh = door
+
+    """ Parede superior """
+    if side == "top":
+        door_start = dx
+        door_end = dx + dw
+        if door_start > x:
+            walls.append((x, y, door_start - x, WALL_THICKNESS))
+        if door_end < x + w:
+            walls.append((door_end, y, (x + w) - door_end, WALL_THICKNESS))
+    else:
+        walls.append((x, y, w, WALL_THICKNESS))
+
+    """ Parede inferior """
+    if side == "bottom":
+        door_start = dx
+        door_end = dx + dw
+        if door_start > x:
+            walls.append((x, y + h - WALL_THICKNESS, door_start - x, WALL_THICKNESS))
+        if door_end < x + w:
+            walls.append((door_end, y + h - WALL_THICKNESS, (x + w) - door_end, WALL_THICKNESS))
+    else:
+        walls.append((x, y + h - WALL_THICKNESS, w, WALL_THICKNESS))
+
+    """ Parede esquerda """
+    if side == "left":
+        door_start = dy
+        door_end = dy + dh
+        if door_start > y:
+            walls.append((x, y, WALL_THICKNESS, door_start - y))
+        if door_end < y + h:
+            walls.append((x, door_end, WALL_THICKNESS, (y + h) - door_end))
+    else:
+        walls.append((x, y, WALL_THICKNESS, h))
+
+    """ Parede direita """
+    if side == "right":
+        door_start = dy
+        door_end = dy + dh
+        if door_start > y:
+            walls.append((x + w - WALL_THICKNESS, y, WALL_THICKNESS, door_start - y))
+        if door_end < y + h:
+            walls.append((x + w - WALL_THICKNESS, door_end, WALL_THICKNESS, (y + h) - door_end))
+    else:
+        walls.append((x + w - WALL_THICKNESS, y, WALL_THICKNESS, h))
+
+    return walls
+
+
+def _int_tuple(value, size, what):
+    """Valida uma lista de size inteiros e a retorna como tupla."""
+    if (not isinstance(value, (list, tuple)) or len(value) != size
+            or not all(isinstance(v, int) and not isinstance(v, bool) for v in value)):
+        raise LevelError(f"{what} deve ser uma lista de {size} inteiros, recebido {value!r}")
+    return tuple(value)
+
+
+def _rect(value, what):
+    """Valida um retângulo [x, y, w, h] com largura e altura positivas."""
+    rect = _int_tuple(value, 4, what)
+    if rect[2] <= 0 or rect[3] <= 0:
+        raise LevelError(f"{what} deve ter largura e altura positivas, recebido {value!r}")
+    return rect
+
+
+def _inside(inner, outer):
+    """Verifica se o retângulo inner está contido em outer."""
+    ix, iy, iw, ih = inner
+    ox, oy, ow, oh = outer
+    return ox <= ix and oy <= iy and ix + iw <= ox + ow and iy + ih <= oy + oh
+
+
+def parse_level(data, source="<fase>"):
+    """
+    Valida e pré-processa os dados de uma fase
+    ------------------------
+    Recebe o conteúdo do arquivo da fase (dicionário) e retorna a fase pronta
+    para o jogo, com os dados derivados já calculados:
+    - door_side de cada sala e posição do ventilador
+    - retângulos de colisão das paredes de todas as salas
+    - tamanho do mini-mapa (tamanho da célula, largura, altura), a partir dos limites do mundo
+    Lança LevelError se os dados forem inválidos.
+    """
+    if not isinstance(data, dict):
+        raise LevelError(f"{source}: a fase deve ser um objeto JSON")
+    raw_rooms = data.get("rooms")
+    if not isinstance(raw_rooms, list) or not raw_rooms:
+        raise LevelError(f"{source}: 'rooms' deve ser uma lista não vazia de salas")
+
+    rooms = []
+    walls = []
+    fans = []
+    for index, raw in enumerate(raw_rooms):
+        what = f"{source}: sala {index}"
+        if not isinstance(raw, dict):
+            raise LevelError(f"{what} deve ser um objeto JSON")
+
+        rect = _rect(raw.get("rect"), f"{what} 'rect'")
+        door = _rect(raw.get("door"), f"{what} 'door'")
+        board = _rect(raw.get("board"), f"{what} 'board'")
+        if not _inside(door, rect):
+            raise LevelError(f"{what}: a porta {door} está fora da sala {rect}")
+        if not _inside(board, rect):
+            raise LevelError(f"{what}: a lousa {board} está fora da sala {rect}")
+
+        text = raw.get("text", "Tarefa")
+        if not isinstance(text, str):
+            raise LevelError(f"{what} 'text' deve ser um texto")
+        meeting = raw.get("meeting", False)
+        if not isinstance(meeting, bool):
+            raise LevelError(f"{what} 'meeting' deve ser true ou false")
+
+        x, y, w, h = rect
+        if "fan" in raw:
+            fan = _int_tuple(raw["fan"], 2, f"{what} 'fan'")
+        else:
+            fan = (x + w - 40, y + 30)
+
+        door_side = compute_door_side(x, y, w, h, door)
+        rooms.append({
+            "text": text,
+            "rect": rect,
+            "door": door,
+            "board": board,
+            "meeting": meeting,
+            "door_side": door_side,
+            "fan": fan,
+        })
+        walls += room_walls(x, y, w, h, door, door_side)
+        fans.append(fan)
+
+    player_start = _int_tuple(data.get("player_start", [0, 0]), 2, f"{source}: 'player_start'")
+
+    """Limites do mundo e mini-mapa (a matriz cobre pelo menos uma tela e no máximo 90x70 células)"""
+    right = max(r["rect"][0] + r["rect"][2] for r in rooms)
+    bottom = max(r["rect"][1] + r["rect"][3] for r in rooms)
+    world_w = max(WIDTH, right)
+    world_h = max(HEIGHT, bottom)
+    cell_size = max(
+        MINIMAP_CELL_SIZE,
+        math.ceil(world_w / MINIMAP_MAX_WIDTH),
+        math.ceil(world_h / MINIMAP_MAX_HEIGHT),
+    )
+
+    return {
+        "player_start": player_start,
+        "rooms": rooms,
+        "walls": walls,
+        "fans": fans,
+        "minimap": (cell_size, math.ceil(world_w / cell_size), math.ceil(world_h / cell_size)),
+    }
+
+
+def load_level(path=DEFAULT_LEVEL):
+    """
+    Carrega uma fase
+    ------------------------
+    Lê o arquivo JSON da fase, valida e pré-processa (parse_level).
+    O resultado é guardado em um arquivo binário ao lado (path + ".cache",
+    formato marshal) junto com a versão do cache, as constantes do código
+    usadas nos dados derivados (DERIVED_CONSTANTS: espessura das paredes,
+    tela e mini-mapa), o tamanho e a data de modificação do JSON; enquanto
+    nenhum deles muda, a fase é lida direto do cache.
+    """
+    stat = os.stat(path)
+    key = (LEVEL_CACHE_VERSION, DERIVED_CONSTANTS, stat.st_size, stat.st_mtime_ns)
+    cache_path = path + ".cache"
+
+    try:
+        with open(cache_path, "rb") as f:
+            cached_key, level = marshal.loads(f.read())
+        if cached_key == key:
+            return level
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except json.JSONDecodeError as e:
+        raise LevelError(f"{path}: JSON inválido ({e})") from e
+
+    level = parse_level(data, path)
+
+    try:
+        with open(cache_path, "wb") as f:
+            f.write(marshal.dumps((key, level)))
+    except OSError:
+        pass
+
+    return level
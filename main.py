@@ -3,7 +3,7 @@ import sys
 import os
 
 from constants import (
-    WIDTH, HEIGHT, FPS, BLACK, WHITE,
+    WIDTH, HEIGHT, FPS, SIM_RATE, SIM_DT, MAX_SIM_STEPS, BLACK, WHITE,
     GAME_STATE_MENU, GAME_STATE_PLAYING, GAME_STATE_PAUSED, GAME_STATE_SPLASH, GAME_STATE_CONGRATS
 )
 from camera import Camera
@@ -12,12 +12,46 @@ from viewport import Viewport
 from menu import MenuSystem
 from game import Game
 from player import Player
+from dirty import DirtyRegion
+from render_thread import SnapshotBuffer, FrameBuffer, RenderThread
+from tiles import TileRenderer
 
-def draw_background(screen, width, height):
+
+""" Telas estáticas (estado, tela de controles): no modo de retângulos sujos são desenhadas uma vez só """
+STATIC_SCREENS = {
+    (GAME_STATE_SPLASH, False),
+    (GAME_STATE_MENU, True),
+    (GAME_STATE_CONGRATS, False),
+}
+
+"""
+Fundo de cada tela (estado, tela de controles); as que não aparecem aqui usam
+o gradiente (draw_background). None: a própria tela pinta a tela inteira
+(splash, parabéns, controles e o menu com textura), então o fundo seria todo
+coberto e não é desenhado.
+"""
+STATE_BACKGROUNDS = {
+    (GAME_STATE_SPLASH, False): None,
+    (GAME_STATE_MENU, False): None,
+    (GAME_STATE_MENU, True): None,
+    (GAME_STATE_CONGRATS, False): None,
+}
+
+""" Fundos prontos do gradiente, por tamanho de tela (ver draw_background) """
+BACKGROUND_CACHE = {}
+
+
+def render_background(width, height, screen=None):
     """
     Gera um fundo com gradiente vertical para o jogo.
+    Retorna uma superfície nova de width x height (no formato de pixel de
+    screen, se dada, para o blit não precisar converter).
     """
-    screen.fill((245, 245, 245))
+    if screen is not None:
+        surface = pygame.Surface((width, height), 0, screen)
+    else:
+        surface = pygame.Surface((width, height))
+    surface.fill((245, 245, 245))
 
     for y in range(height):
         factor = y / height
@@ -29,9 +63,81 @@ def draw_background(screen, width, height):
             245 - shade
         )
 
-        pygame.draw.line(screen, color, (0, y), (width, y))
+        pygame.draw.line(surface, color, (0, y), (width, y))
+    return surface
+
+
+def draw_background(screen, width, height):
+    """
+    Desenha o fundo com gradiente vertical
+    ------------------------
+    O gradiente é gerado uma vez por tamanho de tela (render_background,
+    guardado em BACKGROUND_CACHE na primeira vez que o tamanho aparece:
+    no início ou depois de redimensionar) e a cada frame só é copiado.
+    """
+    background = BACKGROUND_CACHE.get((width, height))
+    if background is None:
+        background = render_background(width, height, screen)
+        BACKGROUND_CACHE[(width, height)] = background
+    screen.blit(background, (0, 0))
+
+def create_game(screen):
+    """
+    Cria os sistemas do jogo desenhando em screen
+    ------------------------
+    Câmera, Graphics, mini-mapa, menus, jogador (com as funções de desenho do
+    graphics) e o Game. Retorna (camera, graphics, menu_system, game).
+    """
+    camera = Camera()
+    graphics = Graphics(screen, camera)
+    viewport = Viewport(screen, graphics)
+    menu_system = MenuSystem(screen, graphics)
+    
+    """Cria o jogador (usa funções de desenho do graphics)"""
+    player = Player(395, 240, graphics.draw_line, graphics.fill_rect, 
+                    graphics.get_camera, screen, blit=graphics.blit,
+                    render_text=graphics.render_text,
+                    world_to_screen=graphics.world_to_screen)
+    
+    """Cria o jogo (gerencia salas, colisão, tarefas)"""
+    game = Game(screen, graphics, camera, player, menu_system, viewport)
+    return camera, graphics, menu_system, game
+
 
-def main():
+def draw_frame(game, show_controls):
+    """
+    Desenha o frame do estado atual do jogo
+    ------------------------
+    Fundo da tela (STATE_BACKGROUNDS) e o desenho de cada estado. Não altera
+    o estado do jogo (a entrada e a simulação ficam no loop principal), então
+    pode rodar na thread de renderização do modo --threaded.
+    """
+    screen, menu_system = game.screen, game.menu_system
+    background = STATE_BACKGROUNDS.get((game.state, show_controls), draw_background)
+    if background is not None:
+        background(screen, *screen.get_size())
+    
+    if game.state == GAME_STATE_SPLASH:
+        menu_system.draw_splash_screen()
+    
+    elif game.state == GAME_STATE_MENU:
+        if show_controls:
+            menu_system.draw_controls_screen()
+        else:
+            menu_system.draw_main_menu(game.rotation_angle)
+    
+    elif game.state == GAME_STATE_PLAYING:
+        game.draw_playing()
+    
+    elif game.state == GAME_STATE_PAUSED:
+        """ Desenha jogo por baixo (congelado)"""
+        game.draw_playing()
+        menu_system.draw_pause_menu()
+    
+    elif game.state == GAME_STATE_CONGRATS:
+        menu_system.draw_congrats_screen()
+
+def main(dirty_rects=False, threaded=False, tiles=0):
     """
         Ponto de Entrada do Jogo NC2A
         =========================================
@@ -50,6 +156,38 @@ def main():
         - game.py            : Lógica principal do jogo (salas, colisão, tarefas)
         - rooms.py           : Classe das salas (portas, lousas, animação)
         - player.py          : Classe do jogador (movimento, desenho)
+        - dirty.py           : Registro de retângulos sujos (modo --dirty-rects)
+        - render_thread.py   : Thread de renderização e buffers duplos (modo --threaded)
+        - tiles.py           : Renderização em tiles com vários processos (modo --tiles)
+        
+        Loop principal:
+        ---------------
+        A simulação roda em passo fixo (SIM_DT): o tempo real de cada frame
+        entra em um acumulador e Game.update/update_playing rodam quantas vezes
+        couberem nele (até MAX_SIM_STEPS por frame). O desenho acontece uma vez
+        por frame, interpolado entre os dois últimos passos (Game.interpolated)
+        com alpha = sobra do acumulador / SIM_DT. Assim a velocidade do jogo não
+        depende do FPS: com renderização lenta o jogo pula frames de desenho,
+        não passos de simulação.
+        
+        Parâmetros:
+        - dirty_rects: Se True, cada frame apresenta só os retângulos alterados
+          (pygame.display.update(rects)) em vez da tela inteira, as telas
+          estáticas (STATIC_SCREENS) não são redesenhadas depois de apresentadas
+          e a fração da tela apresentada no frame aparece no título da janela.
+        - threaded: Se True, o desenho roda em uma thread própria (RenderThread)
+          com um segundo Game que só desenha. A thread principal trata a entrada,
+          simula a SIM_RATE passos por segundo e publica uma captura imutável do
+          estado (Game.capture) em um SnapshotBuffer a cada volta; o frame pronto
+          volta por um FrameBuffer e é apresentado aqui. A latência da entrada
+          deixa de depender do tempo da rasterização. Ignora dirty_rects.
+        - tiles: Número de processos de renderização em tiles (0 desliga). O jogo
+          desenha em um framebuffer em memória compartilhada (TileRenderer) e
+          os preenchimentos de tela cheia são divididos entre os processos;
+          os tiles não são copiados na composição, mas a cada frame o
+          framebuffer inteiro ainda é copiado uma vez para a janela antes de
+          apresentar (o Pygame não apresenta a memória compartilhada direto).
+          Experimental: só compensa em máquinas com vários núcleos livres.
     """
 
     """Inicialização do Pygame"""
@@ -70,174 +208,242 @@ def main():
     except pygame.error as e:
         print(f"Erro ao carregar música: {e}")
     
-    """Inicializa sistemas"""
-    camera = Camera()
-    graphics = Graphics(screen, camera)
-    viewport = Viewport(screen, graphics)
-    menu_system = MenuSystem(screen, graphics)
+    """Renderização em tiles: o jogo desenha no framebuffer compartilhado com os processos"""
+    tile_renderer = None
+    if tiles:
+        tile_renderer = TileRenderer(WIDTH, HEIGHT, tiles)
     
-    """Cria o jogador (usa funções de desenho do graphics)"""
-    player = Player(395, 240, graphics.draw_line, graphics.fill_rect, 
-                    camera.get_camera, screen)
+    renderer = None
+    try:
+        """Inicializa sistemas"""
+        target = screen if threaded or tile_renderer is None else tile_renderer.surface
+        camera, graphics, menu_system, game = create_game(target)
+        if target is not screen:
+            graphics.tiles = tile_renderer
     
-    """Cria o jogo (gerencia salas, colisão, tarefas)"""
-    game = Game(screen, graphics, camera, player, menu_system, viewport)
+        """Configuração inicial"""
+        game.state = GAME_STATE_SPLASH
+        splash_start_time = pygame.time.get_ticks()
     
-    """Configuração inicial"""
-    game.state = GAME_STATE_SPLASH
-    splash_start_time = pygame.time.get_ticks()
+        """Variáveis de estado local"""
+        show_controls = False
     
-    """Variáveis de estado local"""
-    show_controls = False
+        """Modo com thread de renderização: um segundo jogo desenha no canvas do FrameBuffer"""
+        if threaded:
+            dirty_rects = False
+            frames = FrameBuffer(screen, tile_renderer.surface if tile_renderer is not None else None)
+            render_game = create_game(frames.canvas)[3]
+            render_game.graphics.tiles = tile_renderer
+            renderer = RenderThread(render_game, SnapshotBuffer(), frames, draw_frame)
+            renderer.start()
     
-    """Loop principal do jogo"""
-    running = True
-    while running:
-        dt = clock.tick(FPS) / 1000.0
-        
-        game.update(dt)
-        draw_background(screen, WIDTH, HEIGHT)
+        """Modo de retângulos sujos: Graphics registra as áreas alteradas em dirty"""
+        dirty = None
+        if dirty_rects:
+            dirty = DirtyRegion(WIDTH, HEIGHT)
+            dirty.mark_all()
+            graphics.dirty = dirty
+        presented_screen = None
+        shown_ratio = None
+    
+        """Tempo real ainda não simulado (em segundos)"""
+        accumulator = 0.0
+    
+        """Loop principal do jogo"""
+        running = True
+        while running:
+            """Com a thread de renderização o loop só trata entrada e simulação: roda a SIM_RATE voltas por segundo"""
+            frame_time = clock.tick(SIM_RATE if threaded else FPS) / 1000.0
 
-        mouse_x, mouse_y = pygame.mouse.get_pos()
-        mouse_clicked = False
+            mouse_x, mouse_y = pygame.mouse.get_pos()
+            mouse_clicked = False
         
-        """Processamento de eventos"""
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
+            """Processamento de eventos"""
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
             
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                if event.button == 1:
-                    mouse_clicked = True
+                elif event.type == pygame.WINDOWEXPOSED:
+                    """Janela exposta: a próxima apresentação precisa ser completa"""
+                    presented_screen = None
+                    if dirty is not None:
+                        dirty.mark_all()
             
-            elif event.type == pygame.KEYDOWN:
-                if game.state == GAME_STATE_SPLASH:
+                elif event.type == pygame.MOUSEBUTTONDOWN:
+                    if event.button == 1:
+                        mouse_clicked = True
+            
+                elif event.type == pygame.KEYDOWN:
+                    if game.state == GAME_STATE_SPLASH:
+                        game.state = GAME_STATE_MENU
+                        if not pygame.mixer.music.get_busy():
+                            try: pygame.mixer.music.play(-1)
+                            except: pass
+                    elif game.state == GAME_STATE_CONGRATS:
+                        game.state = GAME_STATE_MENU
+                        game.reset_game()
+                    elif game.state == GAME_STATE_MENU:
+                        if show_controls:
+                            show_controls = False
+                        elif event.key in (pygame.K_w, pygame.K_UP):
+                            menu_system.selected = (menu_system.selected - 1) % 3
+                        elif event.key in (pygame.K_s, pygame.K_DOWN):
+                            menu_system.selected = (menu_system.selected + 1) % 3
+                        elif event.key in (pygame.K_RETURN, pygame.K_SPACE):
+                            if menu_system.selected == 0:
+                                game.state = GAME_STATE_PLAYING
+                            elif menu_system.selected == 1:
+                                show_controls = True
+                            elif menu_system.selected == 2:
+                                running = False
+                
+                        """ Jogando"""
+                    elif game.state == GAME_STATE_PLAYING:
+                        if event.key == pygame.K_ESCAPE:
+                            game.state = GAME_STATE_PAUSED
+                            menu_system.selected = 0
+                        elif event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+                            camera.zoom_in()
+                        elif event.key in (pygame.K_MINUS, pygame.K_UNDERSCORE, pygame.K_KP_MINUS):
+                            camera.zoom_out()
+                        elif event.key in (pygame.K_0, pygame.K_KP0):
+                            camera.reset_zoom()
+                        elif event.key == pygame.K_F3:
+                            game.show_debug = not game.show_debug
+                
+                        """ Pausado"""
+                    elif game.state == GAME_STATE_PAUSED:
+                        if event.key == pygame.K_ESCAPE:
+                            game.state = GAME_STATE_PLAYING
+                        elif event.key in (pygame.K_w, pygame.K_UP):
+                            menu_system.selected = (menu_system.selected - 1) % 3
+                        elif event.key in (pygame.K_s, pygame.K_DOWN):
+                            menu_system.selected = (menu_system.selected + 1) % 3
+                        elif event.key in (pygame.K_RETURN, pygame.K_SPACE):
+                            if menu_system.selected == 0:
+                                game.state = GAME_STATE_PLAYING
+                            elif menu_system.selected == 1:
+                                game.state = GAME_STATE_MENU
+                                menu_system.selected = 0
+                                game.reset_game()
+                            elif menu_system.selected == 2:
+                                running = False
+        
+            """Simulação em passo fixo: roda os passos que cabem no tempo acumulado"""
+            keys = pygame.key.get_pressed()
+            accumulator += frame_time
+            steps = 0
+            while accumulator >= SIM_DT and steps < MAX_SIM_STEPS:
+                game.save_previous()
+                game.update(SIM_DT)
+                if game.state == GAME_STATE_PLAYING:
+                    game.update_playing(SIM_DT, keys)
+                accumulator -= SIM_DT
+                steps += 1
+            if accumulator >= SIM_DT:
+                """Atraso maior que MAX_SIM_STEPS passos: é descartado (o jogo desacelera em vez de travar)"""
+                accumulator %= SIM_DT
+            alpha = accumulator / SIM_DT
+        
+            """Lógica por estado (tempo da splash, mouse nos menus e no jogo)"""
+        
+            if game.state == GAME_STATE_SPLASH:
+                if pygame.time.get_ticks() - splash_start_time > 3000:
                     game.state = GAME_STATE_MENU
                     if not pygame.mixer.music.get_busy():
                         try: pygame.mixer.music.play(-1)
                         except: pass
-                elif game.state == GAME_STATE_CONGRATS:
-                    game.state = GAME_STATE_MENU
-                    game.reset_game()
-                elif game.state == GAME_STATE_MENU:
-                    if show_controls:
-                        show_controls = False
-                    elif event.key in (pygame.K_w, pygame.K_UP):
-                        menu_system.selected = (menu_system.selected - 1) % 3
-                    elif event.key in (pygame.K_s, pygame.K_DOWN):
-                        menu_system.selected = (menu_system.selected + 1) % 3
-                    elif event.key in (pygame.K_RETURN, pygame.K_SPACE):
-                        if menu_system.selected == 0:
-                            game.state = GAME_STATE_PLAYING
-                        elif menu_system.selected == 1:
-                            show_controls = True
-                        elif menu_system.selected == 2:
-                            running = False
-                
-                    """ Jogando"""
-                elif game.state == GAME_STATE_PLAYING:
-                    if event.key == pygame.K_ESCAPE:
-                        game.state = GAME_STATE_PAUSED
-                        menu_system.selected = 0
-                    elif event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
-                        camera.zoom_in()
-                    elif event.key in (pygame.K_MINUS, pygame.K_UNDERSCORE, pygame.K_KP_MINUS):
-                        camera.zoom_out()
-                    elif event.key in (pygame.K_0, pygame.K_KP0):
-                        camera.reset_zoom()
-                
-                    """ Pausado"""
-                elif game.state == GAME_STATE_PAUSED:
-                    if event.key == pygame.K_ESCAPE:
-                        game.state = GAME_STATE_PLAYING
-                    elif event.key in (pygame.K_w, pygame.K_UP):
-                        menu_system.selected = (menu_system.selected - 1) % 3
-                    elif event.key in (pygame.K_s, pygame.K_DOWN):
-                        menu_system.selected = (menu_system.selected + 1) % 3
-                    elif event.key in (pygame.K_RETURN, pygame.K_SPACE):
-                        if menu_system.selected == 0:
-                            game.state = GAME_STATE_PLAYING
-                        elif menu_system.selected == 1:
-                            game.state = GAME_STATE_MENU
-                            menu_system.selected = 0
-                            game.reset_game()
-                        elif menu_system.selected == 2:
-                            running = False
+
+            elif game.state == GAME_STATE_MENU:
+                if not show_controls:
+                    """Interação com mouse no menu"""
+                    for i in range(3):
+                        option_rect = menu_system.get_main_menu_option_rect(i)
+                        if option_rect.collidepoint(mouse_x, mouse_y):
+                            menu_system.selected = i
+                            if mouse_clicked:
+                                if i == 0:
+                                    game.state = GAME_STATE_PLAYING
+                                elif i == 1:
+                                    show_controls = True
+                                elif i == 2:
+                                    running = False
         
-        """Renderização e lógica por estado"""
+            elif game.state == GAME_STATE_PLAYING:
+                """ Processa clique do mouse (o jogo já foi atualizado nos passos de simulação)"""
+                if mouse_clicked:
+                    game.handle_mouse_click(mouse_x, mouse_y)
         
-        if game.state == GAME_STATE_SPLASH:
-            menu_system.draw_splash_screen()
-            if pygame.time.get_ticks() - splash_start_time > 3000:
-                game.state = GAME_STATE_MENU
-                if not pygame.mixer.music.get_busy():
-                    try: pygame.mixer.music.play(-1)
-                    except: pass
-
-        elif game.state == GAME_STATE_MENU:
-            if show_controls:
-                menu_system.draw_controls_screen()
-            else:
-                """Interação com mouse no menu"""
+            elif game.state == GAME_STATE_PAUSED:
+                """ Interação com mouse no menu de pausa"""
                 for i in range(3):
-                    option_rect = menu_system.get_main_menu_option_rect(i)
+                    option_rect = menu_system.get_pause_menu_option_rect(i)
                     if option_rect.collidepoint(mouse_x, mouse_y):
                         menu_system.selected = i
                         if mouse_clicked:
                             if i == 0:
                                 game.state = GAME_STATE_PLAYING
                             elif i == 1:
-                                show_controls = True
+                                game.state = GAME_STATE_MENU
+                                menu_system.selected = 0
+                                game.reset_game()
                             elif i == 2:
                                 running = False
-                
-                menu_system.draw_main_menu(game.rotation_angle)
-
         
-        elif game.state == GAME_STATE_PLAYING:
-            """ Captura teclas"""
-            keys = pygame.key.get_pressed()
-            
-            """ Atualiza o jogo"""
-            game.update_playing(dt, keys)
-            
-            """ Processa clique do mouse"""
-            if mouse_clicked:
-                game.handle_mouse_click(mouse_x, mouse_y)
-            
-            """ Desenha o jogo"""
-            game.draw_playing()
+            if renderer is not None:
+                """Publica o estado para a thread de renderização e apresenta o último frame pronto"""
+                if not renderer.is_alive():
+                    renderer.stop()
+                renderer.snapshots.publish(game.capture(show_controls))
+                if renderer.frames.present(screen):
+                    pygame.display.flip()
+                continue
         
+            """Tela estática já apresentada (modo de retângulos sujos): o frame não é redesenhado"""
+            screen_key = (game.state, show_controls)
+            redraw = dirty is None or screen_key not in STATIC_SCREENS or screen_key != presented_screen
         
-        elif game.state == GAME_STATE_PAUSED:
-            """ Desenha jogo por baixo (congelado)"""
-            game.draw_playing()
-            
-            """ Interação com mouse no menu de pausa"""
-            for i in range(3):
-                option_rect = menu_system.get_pause_menu_option_rect(i)
-                if option_rect.collidepoint(mouse_x, mouse_y):
-                    menu_system.selected = i
-                    if mouse_clicked:
-                        if i == 0:
-                            game.state = GAME_STATE_PLAYING
-                        elif i == 1:
-                            game.state = GAME_STATE_MENU
-                            menu_system.selected = 0
-                            game.reset_game()
-                        elif i == 2:
-                            running = False
-            
-            menu_system.draw_pause_menu()
-        
-        elif game.state == GAME_STATE_CONGRATS:
-            menu_system.draw_congrats_screen()
+            """Renderização (interpolada entre os dois últimos passos de simulação)"""
+            if redraw:
+                with game.interpolated(alpha):
+                    draw_frame(game, show_controls)
         
-        pygame.display.flip()
+            """Libera o framebuffer (escreve o frame na tela) antes de apresentar"""
+            graphics.flush()
+            if target is not screen:
+                """Modo de tiles: uma cópia do framebuffer inteiro para a janela por frame"""
+                screen.blit(target, (0, 0))
+            if dirty is None:
+                pygame.display.flip()
+            else:
+                """Apresenta só os retângulos alterados (frame atual + anterior)"""
+                if redraw:
+                    pygame.display.update(dirty.present())
+                    presented_screen = screen_key
+                else:
+                    dirty.skip()
+            
+                percent = round(dirty.ratio * 100)
+                if percent != shown_ratio:
+                    shown_ratio = percent
+                    pygame.display.set_caption(f"NC2A - Game | área suja: {percent}%")
     
+    finally:
+        """Mesmo com erro no loop: encerra a thread de desenho e os processos de tiles (libera a memória compartilhada)"""
+        try:
+            if renderer is not None:
+                renderer.stop()
+        finally:
+            if tile_renderer is not None:
+                tile_renderer.close()
     pygame.quit()
     sys.exit()
 
 
 if __name__ == "__main__":
-    main()
+    """--tiles N: N processos de renderização em tiles (--tiles sozinho: um por núcleo). Experimental: só compensa com vários núcleos livres"""
+    tiles = 0
+    if "--tiles" in sys.argv[1:]:
+        index = sys.argv.index("--tiles") + 1
+        tiles = int(sys.argv[index]) if index < len(sys.argv) and sys.argv[index].isdigit() else os.cpu_count()
+    main(dirty_rects="--dirty-rects" in sys.argv[1:], threaded="--threaded" in sys.argv[1:], tiles=tiles)
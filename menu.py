@@ -20,26 +20,21 @@ class MenuSystem:
         self.screen = screen
         self.graphics = graphics
         
-        pygame.font.init()
-        self.menu_font = pygame.font.SysFont('Arial', 36, bold=True)
-        self.game_font = pygame.font.SysFont('Arial', 18, bold=True)
-        self.small_font = pygame.font.SysFont('Arial', 14)
-        
         self.selected = 0
     
     def draw_splash_screen(self):
         """
         Desenha a Splash Screen (Intro)
         """
-        self.screen.fill(BLACK)
+        self.graphics.clear(BLACK)
         
         # Title
-        title = self.menu_font.render("Trabalho de Computação Gráfica", True, YELLOW)
-        self.screen.blit(title, (WIDTH // 2 - title.get_width() // 2, HEIGHT // 3))
+        title = self.graphics.render_text("Trabalho de Computação Gráfica", 36, YELLOW, bold=True)
+        self.graphics.blit(title, (WIDTH // 2 - title.get_width() // 2, HEIGHT // 3))
         
         # Team Header
-        team_header = self.game_font.render("Equipe:", True, BLUE)
-        self.screen.blit(team_header, (WIDTH // 2 - team_header.get_width() // 2, HEIGHT // 2))
+        team_header = self.graphics.render_text("Equipe:", 18, BLUE, bold=True)
+        self.graphics.blit(team_header, (WIDTH // 2 - team_header.get_width() // 2, HEIGHT // 2))
         
         # Team Members
         members = [
@@ -51,8 +46,8 @@ class MenuSystem:
         
         y_offset = HEIGHT // 2 + 30
         for member in members:
-            text = self.game_font.render(member, True, WHITE)
-            self.screen.blit(text, (WIDTH // 2 - text.get_width() // 2, y_offset))
+            text = self.graphics.render_text(member, 18, WHITE, bold=True)
+            self.graphics.blit(text, (WIDTH // 2 - text.get_width() // 2, y_offset))
             y_offset += 25
 
     def draw_main_menu(self, rotation_angle):
@@ -78,8 +73,8 @@ class MenuSystem:
         self.graphics.flood_fill_rect(box_x, box_y, box_w, box_h, DARK_GRAY, WHITE)
         
         """Título"""
-        title = self.menu_font.render("NC2A - GAME", True, YELLOW)
-        self.screen.blit(title, (WIDTH // 2 - title.get_width() // 2, box_y + 30))
+        title = self.graphics.render_text("NC2A - GAME", 36, YELLOW, bold=True)
+        self.graphics.blit(title, (WIDTH // 2 - title.get_width() // 2, box_y + 30))
         
         """Opções"""
         options = ["Iniciar Jogo", "Controles de Teclas", "Sair"]
@@ -92,22 +87,20 @@ class MenuSystem:
             else:
                 self.graphics.draw_circle(box_x + 50, option_y + 15, 8, WHITE, use_camera=False)
             
-            text = self.game_font.render(option, True, color)
-            self.screen.blit(text, (box_x + 80, option_y))
+            text = self.graphics.render_text(option, 18, color, bold=True)
+            self.graphics.blit(text, (box_x + 80, option_y))
             option_y += 50
         
-        instructions = self.small_font.render("W/S ou Mouse: navegar | ENTER/Click: selecionar", True, WHITE)
-        self.screen.blit(instructions, (WIDTH // 2 - instructions.get_width() // 2, box_y + box_h - 40))
+        instructions = self.graphics.render_text("W/S ou Mouse: navegar | ENTER/Click: selecionar", 14, WHITE)
+        self.graphics.blit(instructions, (WIDTH // 2 - instructions.get_width() // 2, box_y + box_h - 40))
         
         """Ventiladores animados"""
-        self.graphics.draw_fan(box_x + 350, box_y + 50, 25, rotation_angle, WHITE, use_camera=False)
-        self.graphics.draw_fan(box_x + 50, box_y + 300, 20, -rotation_angle * 1.5, BLUE, use_camera=False)
+        self.graphics.blit_fan(box_x + 350, box_y + 50, 25, rotation_angle, WHITE, use_camera=False)
+        self.graphics.blit_fan(box_x + 50, box_y + 300, 20, -rotation_angle * 1.5, BLUE, use_camera=False)
     
     def draw_pause_menu(self):
         """Desenha o menu de pausa"""
-        for y in range(0, HEIGHT, 2):
-            for x in range(0, WIDTH, 2):
-                self.screen.set_at((x, y), (0, 0, 0))
+        self.graphics.fill_dither(0, 0, WIDTH, HEIGHT, (0, 0, 0), 2, use_camera=False)
         
         box_w, box_h = 300, 200
         box_x = (WIDTH - box_w) // 2
@@ -116,8 +109,8 @@ class MenuSystem:
         self.graphics.fill_rect(box_x, box_y, box_w, box_h, DARK_GRAY, use_camera=False)
         self.graphics.draw_rect(box_x, box_y, box_w, box_h, WHITE, use_camera=False)
         
-        title = self.game_font.render("PAUSADO", True, YELLOW)
-        self.screen.blit(title, (WIDTH // 2 - title.get_width() // 2, box_y + 20))
+        title = self.graphics.render_text("PAUSADO", 18, YELLOW, bold=True)
+        self.graphics.blit(title, (WIDTH // 2 - title.get_width() // 2, box_y + 20))
         
         options = ["Continuar", "Menu Principal", "Sair"]
         option_y = box_y + 70
@@ -129,13 +122,13 @@ class MenuSystem:
             else:
                 self.graphics.draw_circle(box_x + 30, option_y + 10, 6, WHITE, use_camera=False)
             
-            text = self.small_font.render(option, True, color)
-            self.screen.blit(text, (box_x + 50, option_y))
+            text = self.graphics.render_text(option, 14, color)
+            self.graphics.blit(text, (box_x + 50, option_y))
             option_y += 40
 
     def draw_congrats_screen(self):
         """Desenha a tela de Parabéns"""
-        self.screen.fill(BLACK)
+        self.graphics.clear(BLACK)
         
         # Confetti effect (simple random dots)
         import random
@@ -145,21 +138,21 @@ class MenuSystem:
             color = random.choice([YELLOW, BLUE, GREEN, WHITE])
             self.graphics.set_pixel(x, y, color, use_camera=False)
             
-        title = self.menu_font.render("PARABÉNS!", True, GREEN)
-        self.screen.blit(title, (WIDTH // 2 - title.get_width() // 2, HEIGHT // 2 - 50))
+        title = self.graphics.render_text("PARABÉNS!", 36, GREEN, bold=True)
+        self.graphics.blit(title, (WIDTH // 2 - title.get_width() // 2, HEIGHT // 2 - 50))
         
-        subtitle = self.game_font.render("Todas as tarefas foram completadas.", True, WHITE)
-        self.screen.blit(subtitle, (WIDTH // 2 - subtitle.get_width() // 2, HEIGHT // 2 + 10))
+        subtitle = self.graphics.render_text("Todas as tarefas foram completadas.", 18, WHITE, bold=True)
+        self.graphics.blit(subtitle, (WIDTH // 2 - subtitle.get_width() // 2, HEIGHT // 2 + 10))
         
-        info = self.small_font.render("Pressione qualquer tecla para voltar ao menu...", True, DARK_GRAY)
-        self.screen.blit(info, (WIDTH // 2 - info.get_width() // 2, HEIGHT - 50))
+        info = self.graphics.render_text("Pressione qualquer tecla para voltar ao menu...", 14, DARK_GRAY)
+        self.graphics.blit(info, (WIDTH // 2 - info.get_width() // 2, HEIGHT - 50))
     
     def draw_controls_screen(self):
         """Desenha tela de controles"""
         self.graphics.fill_rect(0, 0, WIDTH, HEIGHT, DARK_GRAY, use_camera=False)
         
-        title = self.menu_font.render("CONTROLES", True, YELLOW)
-        self.screen.blit(title, (WIDTH // 2 - title.get_width() // 2, 50))
+        title = self.graphics.render_text("CONTROLES", 36, YELLOW, bold=True)
+        self.graphics.blit(title, (WIDTH // 2 - title.get_width() // 2, 50))
         
         controls = [
             "W/Seta Cima - Mover para cima",
@@ -171,16 +164,17 @@ class MenuSystem:
             "Mouse - Navegar menus e clicar em portas/lousas",
             "+  Zoom in",
             "-  Zoom out",
+            "F3 - Mostrar objetos descartados (culling)",
         ]
         
         y = 150
         for control in controls:
-            text = self.game_font.render(control, True, WHITE)
-            self.screen.blit(text, (WIDTH // 2 - text.get_width() // 2, y))
+            text = self.graphics.render_text(control, 18, WHITE, bold=True)
+            self.graphics.blit(text, (WIDTH // 2 - text.get_width() // 2, y))
             y += 40
         
-        back = self.small_font.render("Pressione qualquer tecla para voltar", True, YELLOW)
-        self.screen.blit(back, (WIDTH // 2 - back.get_width() // 2, HEIGHT - 50))
+        back = self.graphics.render_text("Pressione qualquer tecla para voltar", 14, YELLOW)
+        self.graphics.blit(back, (WIDTH // 2 - back.get_width() // 2, HEIGHT - 50))
     
     def get_main_menu_option_rect(self, index):
         """Retorna o retângulo de uma opção do menu principal para detecção de mouse"""
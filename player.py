@@ -1,4 +1,5 @@
 import pygame
+from camera import Camera
 
 """ Cores usadas no personagem """
 GRAY  = (160, 160, 160)
@@ -10,8 +11,88 @@ BLACK = (0, 0, 0)
 BROWN = (20, 20, 20)
 
 
+def face_pixels():
+    """
+    Pixels dos detalhes faciais
+    --------------------------
+    Retorna {(dx, dy): cor} com a posição de cada pixel relativa ao canto
+    da cabeça (10x10), desenhados na ordem: cabelo, franja, olhos, pupilas,
+    lentes e armação dos óculos, ponte, hastes, nariz e boca
+    (cada elemento cobre os anteriores).
+    """
+    head_w = 10
+    hair_color = BROWN
+    eye_color = (50, 50, 50)
+    eye_white = WHITE
+    mouth_color = (180, 80, 80)
+    nose_color = (230, 180, 150)
+    glasses_color = (40, 40, 40)
+    lens_color = (180, 220, 255)
+
+    pixels = {}
+
+    """ Cabelo (3 linhas) e franja (pixels alternados) """
+    for hy in range(3):
+        for hx in range(head_w):
+            pixels[(hx, hy)] = hair_color
+    for fx in range(0, head_w - 2, 2):
+        pixels[(1 + fx, 2)] = hair_color
+
+    """ Olhos (2x2 brancos) e pupilas """
+    for eye_x in (2, 7):
+        for ey in range(2):
+            for ex in range(2):
+                pixels[(eye_x + ex, 4 + ey)] = eye_white
+    for eye_x in (3, 7):
+        pixels[(eye_x, 5)] = eye_color
+
+    """ Óculos: lentes 3x3 com armação, ponte e hastes """
+    for lens_x in (1, 6):
+        for ly in range(3):
+            for lx in range(3):
+                border = ly == 0 or ly == 2 or lx == 0 or lx == 2
+                pixels[(lens_x + lx, 3 + ly)] = glasses_color if border else lens_color
+    for bx in range(2):
+        pixels[(4 + bx, 4)] = glasses_color
+    pixels[(0, 4)] = glasses_color
+    pixels[(head_w - 1, 4)] = glasses_color
+
+    """ Nariz e boca """
+    for ny in range(2):
+        pixels[(head_w // 2, 5 + ny)] = nose_color
+    for mx in range(4):
+        pixels[(3 + mx, 8)] = mouth_color
+
+    return pixels
+
+
+def compile_runs(pixels):
+    """
+    Compacta pixels {(x, y): cor} em spans horizontais
+    --------------------------
+    Retorna a lista de (x, y, comprimento, cor): cada sequência de pixels
+    vizinhos da mesma cor em uma linha vira um único span (run-length).
+    """
+    runs = []
+    for y in sorted({y for _, y in pixels}):
+        xs = sorted(x for x, py in pixels if py == y)
+        start = prev = xs[0]
+        for x in xs[1:] + [None]:
+            if x is not None and x == prev + 1 and pixels[(x, y)] == pixels[(start, y)]:
+                prev = x
+                continue
+            runs.append((start, y, prev - start + 1, pixels[(start, y)]))
+            if x is not None:
+                start = prev = x
+    return runs
+
+
+""" Spans dos detalhes faciais, calculados uma vez """
+FACE_RUNS = compile_runs(face_pixels())
+
+
 class Player:
-    def __init__(self, x, y, draw_line, fill_rect, get_camera=None, screen=None):
+    def __init__(self, x, y, draw_line, fill_rect, get_camera=None, screen=None, blit=None, render_text=None, world_to_screen=None):
 
         """ 
         Posição inicial do personagem 
@@ -20,25 +101,32 @@ class Player:
         e faz referência às funções de desenho passadas como parâmetros.
         São recebidos as posições x e y e as funções draw_line e fill_rect
         como parametros para desenhar o personagem.
+        O parâmetro opcional blit desenha o texto da camisa (padrão: screen.blit)
+        e render_text o renderiza pelo cache compartilhado de textos
+        (ver Graphics.render_text; padrão: renderiza a cada frame).
+        world_to_screen converte a posição do texto para a tela pela câmera
+        (ver Graphics.world_to_screen; padrão: conversão feita a partir
+        de get_camera).
         
         """
         self.x, self.y = x, y
         """ largura/altura do "corpo" lógico usado para colisão """
         self.w, self.h = 20, 32
         
-        """ Velocidade melhorada + sprint """
-        self.base_speed = 8       
-        self.sprint_speed = 14    
+        """ Velocidade melhorada + sprint (em unidades do mundo por segundo) """
+        self.base_speed = 480
+        self.sprint_speed = 840
         self.speed = self.base_speed
         
         self.draw_line = draw_line
         self.fill_rect = fill_rect
         self.get_camera = get_camera
         self.screen = screen
+        self.blit = blit if blit is not None or screen is None else screen.blit
+        self.render_text = render_text
+        self.world_to_screen = world_to_screen if world_to_screen is not None else self._world_to_screen
         
-        """ Fonte pequena para nome na camisa """
         pygame.font.init()
-        self.name_font = pygame.font.SysFont('Arial', 5)
     
     def update_speed(self, keys):
         """
@@ -51,6 +139,11 @@ class Player:
         else:
             self.speed = self.base_speed
 
+    def _world_to_screen(self, x, y):
+        """Converte um ponto do mundo para a tela com os parâmetros de get_camera (ver Camera.world_to_screen)."""
+        cam_x, cam_y, zoom, width, height = self.get_camera()
+        return int((x - cam_x) * zoom + width / 2), int((y - cam_y) * zoom + height / 2)
+
     def draw(self):
         """ 
         Desenha o personagem
@@ -91,139 +184,20 @@ class Player:
         
         """
         ========================================
-        DETALHES FACIAIS - Usando APENAS set_pixel e Scanline
+        DETALHES FACIAIS - Spans pré-calculados (FACE_RUNS)
         ========================================
-        Desenha cabelo, olhos, nariz, boca e óculos
-        diretamente com screen.set_at() (set_pixel)
+        Cabelo, olhos, óculos, nariz e boca: cada pixel do mundo vira um
+        bloco de int(zoom) x int(zoom) pixels na tela. Com zoom inteiro os
+        blocos de um span encostam, então o span inteiro é um único fill_rect.
         """
-        if self.screen is not None and self.get_camera is not None:
-            cam_x, cam_y, zoom, width, height = self.get_camera()
-            
-            hair_color = BROWN  
-            eye_color = (50, 50, 50)      
-            eye_white = WHITE
-            mouth_color = (180, 80, 80)  
-            nose_color = (230, 180, 150) 
-            glasses_color = (40, 40, 40)  
-            lens_color = (180, 220, 255)  
-            
-            def world_to_screen(wx, wy):
-                """Converte coordenadas do mundo para tela"""
-                sx = int((wx - cam_x) * zoom + width / 2)
-                sy = int((wy - cam_y) * zoom + height / 2)
-                return sx, sy
-            
-            def set_pixel_safe(sx, sy, color):
-                """Set pixel com verificação de limites"""
-                if 0 <= sx < width and 0 <= sy < height:
-                    self.screen.set_at((sx, sy), color)
-            
-
-            hair_start_x = head_x
-            hair_start_y = head_y
-            hair_w = head_w
-            hair_h = 3
-            
-            for hy in range(hair_h):
-                world_y = hair_start_y + hy
-                for hx in range(hair_w):
-                    world_x = hair_start_x + hx
-                    sx, sy = world_to_screen(world_x, world_y)
-                    for dzy in range(int(zoom)):
-                        for dzx in range(int(zoom)):
-                            set_pixel_safe(sx + dzx, sy + dzy, hair_color)
-            
-            fringe_y = head_y + 2
-            for fx in range(head_w - 2):
-                world_x = head_x + 1 + fx
-                sx, sy = world_to_screen(world_x, fringe_y)
-                if fx % 2 == 0: 
-                    for dzy in range(int(zoom)):
-                        for dzx in range(int(zoom)):
-                            set_pixel_safe(sx + dzx, sy + dzy, hair_color)
-            
-
-            left_eye_x = head_x + 2
-            left_eye_y = head_y + 4
-            
-            right_eye_x = head_x + 7
-            right_eye_y = head_y + 4
-            
-            for eye_x in [left_eye_x, right_eye_x]:
-                for ey in range(2):
-                    for ex in range(2):
-                        wx = eye_x + ex
-                        wy = left_eye_y + ey
-                        sx, sy = world_to_screen(wx, wy)
-                        for dzy in range(int(zoom)):
-                            for dzx in range(int(zoom)):
-                                set_pixel_safe(sx + dzx, sy + dzy, eye_white)
-            
-            for eye_x in [left_eye_x + 1, right_eye_x]:
-                sx, sy = world_to_screen(eye_x, left_eye_y + 1)
-                for dzy in range(int(zoom)):
-                    for dzx in range(int(zoom)):
-                        set_pixel_safe(sx + dzx, sy + dzy, eye_color)
-            
-
-            lens_left_x = head_x + 1
-            lens_y = head_y + 3
-            
-            lens_right_x = head_x + 6
-            
-            for lens_x in [lens_left_x, lens_right_x]:
-                for ly in range(3):
-                    for lx in range(3):
-                        wx = lens_x + lx
-                        wy = lens_y + ly
-                        sx, sy = world_to_screen(wx, wy)
-                        if ly == 0 or ly == 2 or lx == 0 or lx == 2:
-                            for dzy in range(int(zoom)):
-                                for dzx in range(int(zoom)):
-                                    set_pixel_safe(sx + dzx, sy + dzy, glasses_color)
-                        else:
-                            for dzy in range(int(zoom)):
-                                for dzx in range(int(zoom)):
-                                    set_pixel_safe(sx + dzx, sy + dzy, lens_color)
-            
-            bridge_y = head_y + 4
-            for bx in range(2):
-                wx = head_x + 4 + bx
-                sx, sy = world_to_screen(wx, bridge_y)
-                for dzy in range(int(zoom)):
-                    for dzx in range(int(zoom)):
-                        set_pixel_safe(sx + dzx, sy + dzy, glasses_color)
-            
-            """ Hastes do óculos (lados) """
-            sx, sy = world_to_screen(head_x, head_y + 4)
-            for dzy in range(int(zoom)):
-                for dzx in range(int(zoom)):
-                    set_pixel_safe(sx + dzx, sy + dzy, glasses_color)
-            
-            sx, sy = world_to_screen(head_x + head_w - 1, head_y + 4)
-            for dzy in range(int(zoom)):
-                for dzx in range(int(zoom)):
-                    set_pixel_safe(sx + dzx, sy + dzy, glasses_color)
-
-            nose_x = head_x + head_w // 2
-            nose_y = head_y + 5
-            
-            for ny in range(2):
-                sx, sy = world_to_screen(nose_x, nose_y + ny)
-                for dzy in range(int(zoom)):
-                    for dzx in range(int(zoom)):
-                        set_pixel_safe(sx + dzx, sy + dzy, nose_color)
-            
-            mouth_x = head_x + 3
-            mouth_y = head_y + 8
-            mouth_width = 4
-            
-            for mx in range(mouth_width):
-                wx = mouth_x + mx
-                sx, sy = world_to_screen(wx, mouth_y)
-                for dzy in range(int(zoom)):
-                    for dzx in range(int(zoom)):
-                        set_pixel_safe(sx + dzx, sy + dzy, mouth_color)
+        if self.get_camera is not None:
+            zoom = self.get_camera()[2]
+            for dx, dy, length, color in FACE_RUNS:
+                if zoom == int(zoom):
+                    self.fill_rect(head_x + dx, head_y + dy, length, 1, color)
+                else:
+                    for i in range(length):
+                        self.fill_rect(head_x + dx + i, head_y + dy, 1, 1, color)
 
         """ Tronco (camisa) """
         body_w = self.w
@@ -232,17 +206,16 @@ class Player:
         body_y = head_y + head_h
         filled_rect(body_x, body_y, body_w, body_h, shirt_color, WHITE)
         
-        if self.screen is not None and self.get_camera is not None:
-            cam_x, cam_y, zoom, width, height = self.get_camera()
-            text_world_x = body_x + body_w // 2
-            text_world_y = body_y + body_h // 2
-            screen_x = int((text_world_x - cam_x) * zoom + width / 2)
-            screen_y = int((text_world_y - cam_y) * zoom + height / 2)
+        if self.blit is not None and self.get_camera is not None:
+            zoom = self.get_camera()[2]
+            screen_x, screen_y = self.world_to_screen(body_x + body_w // 2, body_y + body_h // 2)
             scaled_size = max(4, int(5 * zoom))
-            scaled_font = pygame.font.SysFont('Arial', scaled_size)
-            name_surface = scaled_font.render("GESAD", True, WHITE)
+            if self.render_text is not None:
+                name_surface = self.render_text("GESAD", scaled_size, WHITE)
+            else:
+                name_surface = pygame.font.SysFont('Arial', scaled_size).render("GESAD", True, WHITE)
             name_rect = name_surface.get_rect(center=(screen_x, screen_y))
-            self.screen.blit(name_surface, name_rect)
+            self.blit(name_surface, name_rect)
 
         """ Calça """
         pants_w = self.w
@@ -272,4 +245,70 @@ class Player:
         filled_rect(right_leg_x, legs_y, leg_w, leg_h, shoes_color, WHITE)
 
     def rect(self):
-        return pygame.Rect(self.x, self.y, self.w, self.h)
\ No newline at end of file
+        return pygame.Rect(self.x, self.y, self.w, self.h)
+
+
+class PlayerSpriteCache:
+    """
+    PlayerSpriteCache
+    --------------------------
+    Cache do desenho do personagem.
+    O personagem (Player.draw: corpo, detalhes faciais e nome na camisa) não muda
+    de um frame para outro, só de posição. Ele é renderizado uma única vez em uma
+    superfície, na escala do zoom atual da câmera, e a cada frame essa superfície
+    é apenas copiada (blit) na posição do personagem na tela.
+    A superfície é refeita somente quando Camera.zoom muda.
+    """
+    
+    """Cor transparente (colorkey) do fundo da superfície"""
+    COLORKEY = (255, 0, 255)
+    
+    """Margem (em pixels) ao redor do personagem"""
+    PAD = 2
+    
+    """Retângulo desenhado em relação a (x, y): braços de 4 de largura dos lados, sapatos embaixo"""
+    LEFT, WIDTH, HEIGHT = 4, 28, 34
+    
+    def __init__(self, graphics, camera):
+        """
+        Parâmetros:
+        - graphics: Instância de Graphics (usada para renderizar o personagem)
+        - camera: Câmera principal do jogo
+        """
+        self.graphics = graphics
+        self.camera = camera
+        self.zoom = None
+        self.surface = None
+    
+    def get_sprite(self, player):
+        """
+        Retorna a superfície do personagem, renderizando-a se o zoom mudou.
+        O canto (x - LEFT, y) do personagem fica no pixel (PAD, PAD) da superfície.
+        """
+        if self.surface is not None and self.zoom == self.camera.zoom:
+            return self.surface
+        
+        self.zoom = self.camera.zoom
+        sprite_w = int(self.WIDTH * self.zoom) + 2 * self.PAD
+        sprite_h = int(self.HEIGHT * self.zoom) + 2 * self.PAD
+        
+        surface = pygame.Surface((sprite_w, sprite_h), 0, self.graphics.screen)
+        surface.fill(self.COLORKEY)
+        surface.set_colorkey(self.COLORKEY)
+        
+        """Câmera da superfície: canto do personagem no pixel (PAD, PAD), como em RoomLayerCache"""
+        sprite_camera = Camera(2 * self.PAD, 2 * self.PAD)
+        sprite_camera.zoom = self.zoom
+        sprite_camera.update(player.x - self.LEFT, player.y)
+        
+        with self.graphics.render_target(surface, sprite_camera):
+            player.draw()
+        
+        self.surface = surface
+        return surface
+    
+    def draw(self, player):
+        """Desenha o personagem: um blit da superfície em cache na posição dele na tela."""
+        surface = self.get_sprite(player)
+        sx, sy = self.camera.world_to_screen(player.x - self.LEFT, player.y)
+        self.graphics.blit(surface, (sx - self.PAD, sy - self.PAD))
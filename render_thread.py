@@ -0,0 +1,163 @@
+import threading
+import time
+
+import pygame
+
+from constants import SIM_DT
+
+
+class SnapshotBuffer:
+    """
+    Classe SnapshotBuffer
+    ----------------------
+    Buffer duplo de estados do jogo entre a simulação e a renderização.
+    A simulação publica (publish) uma cópia imutável do estado (Game.capture)
+    depois de cada grupo de passos; o renderizador lê (read) os dois últimos
+    estados publicados para desenhar interpolando entre eles.
+
+    Como os estados são tuplas imutáveis, publicar é só trocar referências
+    sob o lock: a simulação nunca espera o desenho terminar e o renderizador
+    nunca vê um estado pela metade.
+    """
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.previous = None
+        self.current = None
+        self.sequence = 0
+        self.closed = False
+
+    def publish(self, snapshot):
+        """Publica um novo estado (com o instante da publicação) e acorda o renderizador."""
+        with self.condition:
+            self.previous, self.current = self.current, (time.perf_counter(), snapshot)
+            self.sequence += 1
+            self.condition.notify_all()
+
+    def read(self):
+        """Retorna (sequência, anterior, atual); anterior e atual são (instante, estado) ou None."""
+        with self.condition:
+            return self.sequence, self.previous, self.current
+
+    def wait(self, sequence, timeout=None):
+        """Espera um estado mais novo que sequence (ou close). Retorna False se o buffer foi fechado."""
+        with self.condition:
+            self.condition.wait_for(lambda: self.closed or self.sequence != sequence, timeout)
+            return not self.closed
+
+    def close(self):
+        """Encerra o buffer: quem estiver esperando em wait é liberado."""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+
+class FrameBuffer:
+    """
+    Classe FrameBuffer
+    -------------------
+    Buffer duplo de frames entre a renderização e a apresentação.
+    O renderizador desenha em canvas (a tela do jogo de renderização) e, ao
+    terminar o frame, copia-o para front (publish). A thread principal, que é
+    a única que pode apresentar na janela, copia front para a tela e chama
+    pygame.display.flip() só quando há um frame novo (present).
+    """
+
+    def __init__(self, screen, canvas=None):
+        """
+        Parâmetros:
+        - screen: Superfície da janela (define tamanho e formato dos buffers)
+        - canvas: Superfície onde o renderizador desenha (padrão: uma nova, como screen);
+                  ex: o framebuffer compartilhado do TileRenderer
+        """
+        size = screen.get_size()
+        self.canvas = canvas if canvas is not None else pygame.Surface(size, 0, screen)
+        self.front = pygame.Surface(size, 0, screen)
+        self.lock = threading.Lock()
+        self.frame = 0
+        self.presented = 0
+
+    def publish(self):
+        """Copia o frame terminado em canvas para front."""
+        with self.lock:
+            self.front.blit(self.canvas, (0, 0))
+            self.frame += 1
+
+    def present(self, screen):
+        """Copia o último frame para screen se ele ainda não foi apresentado. Retorna True nesse caso."""
+        with self.lock:
+            if self.frame == self.presented:
+                return False
+            screen.blit(self.front, (0, 0))
+            self.presented = self.frame
+            return True
+
+
+class RenderThread(threading.Thread):
+    """
+    Classe RenderThread
+    --------------------
+    Thread de renderização (modo --threaded do loop principal).
+    Tem o seu próprio Game (com Graphics, câmera, menus e jogador desenhando
+    em FrameBuffer.canvas), que nunca é simulado: a cada frame o estado mais
+    recente de SnapshotBuffer é aplicado nele (Game.restore) e desenhado com
+    draw_frame, interpolado entre os dois últimos estados publicados.
+
+    Assim a rasterização em Python puro fica fora da thread principal, que
+    trata a entrada e simula em passo fixo sem esperar o desenho.
+    """
+
+    def __init__(self, game, snapshots, frames, draw_frame):
+        """
+        Parâmetros:
+        - game: Game de renderização (desenha em frames.canvas)
+        - snapshots: SnapshotBuffer publicado pela simulação
+        - frames: FrameBuffer lido pela thread principal
+        - draw_frame: Função draw_frame(game, show_controls) que desenha um frame completo
+        """
+        super().__init__(name="render", daemon=True)
+        self.game = game
+        self.snapshots = snapshots
+        self.frames = frames
+        self.draw_frame = draw_frame
+        self.error = None
+        self.rendered = 0
+
+    def run(self):
+        """Desenha um frame por estado publicado até o SnapshotBuffer ser fechado."""
+        try:
+            sequence = 0
+            while self.snapshots.wait(sequence):
+                sequence, previous, current = self.snapshots.read()
+                self.render(previous, current)
+        except Exception as error:
+            self.error = error
+            self.snapshots.close()
+
+    def render(self, previous, current):
+        """
+        Desenha o estado current, interpolado a partir de previous
+        ------------------------
+        alpha é o tempo desde a publicação de current em passos de simulação
+        (limitado a 1.0): o desenho fica no máximo um passo atrás da simulação.
+        """
+        published_at, snapshot = current
+        self.game.restore(snapshot)
+        self.game.previous_state = None
+        if previous is not None and previous[1][0] == snapshot[0]:
+            self.game.previous_state = previous[1][-1]
+        alpha = min(1.0, (time.perf_counter() - published_at) / SIM_DT)
+
+        with self.game.interpolated(alpha):
+            self.draw_frame(self.game, self.game.show_controls)
+        self.game.graphics.flush()
+        self.frames.publish()
+        self.rendered += 1
+
+    def stop(self, timeout=1.0):
+        """Fecha o buffer de estados, espera a thread terminar e repassa um erro do desenho, se houve (uma vez)."""
+        self.snapshots.close()
+        self.join(timeout)
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
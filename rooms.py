@@ -1,5 +1,9 @@
 import pygame
 import math
+from collections import OrderedDict
+from camera import Camera
+from graphics import rect_segments
+from transformations import Affine
 
 
 """ Cores usadas na sala e objetos """
@@ -17,6 +21,42 @@ BROWN = (139, 90, 43)
 DARK_BROWN = (101, 67, 33)      
 LIGHT_BROWN = (181, 137, 87)    
 
+""" Rotação do encosto da cadeira para cada direção (0 = encosto para cima) """
+FACING_ANGLES = {
+    "up": 0.0,
+    "right": math.pi / 2,
+    "down": math.pi,
+    "left": 3 * math.pi / 2,
+}
+
+def compute_door_side(x, y, w, h, door):
+    """
+    Lado da sala em que a porta está
+    ----------------------
+    Retorna "top", "bottom", "left" ou "right": o lado da sala (x, y, w, h)
+    mais próximo do centro da porta (dx, dy, dw, dh).
+    """
+    dx, dy, dw, dh = door
+
+    door_cx = dx + dw / 2
+    door_cy = dy + dh / 2
+
+    dist_top = abs(door_cy - y)
+    dist_bottom = abs(door_cy - (y + h))
+    dist_left = abs(door_cx - x)
+    dist_right = abs(door_cx - (x + w))
+
+    return min(
+        [
+            (dist_top, "top"),
+            (dist_bottom, "bottom"),
+            (dist_left, "left"),
+            (dist_right, "right"),
+        ],
+        key=lambda t: t[0],
+    )[1]
+
+
 class Room:
     """ 
     Rom
@@ -26,7 +66,7 @@ class Room:
     usando interpolação linear entre keyframes discretos.
     A lousa dentro da sala exibe uma tarefa que pode ser marcada como concluída.
     """
-    def __init__(self, x, y, w, h, door, button, draw_line, fill_rect, screen, board_text="Tarefa", get_camera=None, fill_circle=None, is_meeting_room=False, fill_rect_textured=None):
+    def __init__(self, x, y, w, h, door, button, draw_line, fill_rect, screen, board_text="Tarefa", get_camera=None, fill_circle=None, is_meeting_room=False, fill_rect_textured=None, blit=None, door_side=None, render_text=None, draw_lines=None, world_to_screen=None, on_door_blocking=None):
         
         """
         Inicializa a sala com posição, dimensões, porta, lousa e funções de desenho.
@@ -43,6 +83,18 @@ class Room:
         - get_camera: Função para obter parâmetros da câmera (opcional)
         - fill_circle: Função para desenhar círculos preenchidos (para sala de reunião)
         - is_meeting_room: Se True, é sala de reunião (mesa redonda); se False, sala de aula
+        - fill_rect_textured: Função para preencher retângulos com textura procedural (opcional)
+        - blit: Função para desenhar superfícies de texto (padrão: screen.blit)
+        - door_side: Lado da porta ("top", "bottom", "left", "right"); se None é calculado
+        - render_text: Função render_text(texto, tamanho, cor) que usa o cache compartilhado
+          de textos (ver Graphics.render_text); se None, o texto é renderizado a cada frame
+        - draw_lines: Função para desenhar vários segmentos de uma vez (ver Graphics.draw_lines);
+          se None, cada segmento é desenhado com draw_line
+        - world_to_screen: Função que converte um ponto do mundo para a tela pela câmera
+          (ver Graphics.world_to_screen); se None, a conversão é feita a partir
+          de get_camera
+        - on_door_blocking: Função chamada com a sala quando is_door_blocking() muda durante
+          a animação da porta (ex: ligar/desligar o colisor da porta na CollisionGrid)
         
         """
         self.x, self.y = x, y
@@ -58,36 +110,22 @@ class Room:
         self.get_camera = get_camera
         self.is_meeting_room = is_meeting_room 
         
-        pygame.font.init()
-        self.font = pygame.font.SysFont('Arial', 12)
+        """Fonte própria: só criada se não houver render_text (ver _render_text)"""
+        self.font = None
 
        
         self.door_open = False        
         self.door_opening = False     
         self.door_progress = 0.0      
         self.door_speed = 2.0         
-        dx, dy, dw, dh = self.door
-        x0, y0, w0, h0 = self.x, self.y, self.w, self.h
-
-        door_cx = dx + dw / 2
-        door_cy = dy + dh / 2
-
-        dist_top = abs(door_cy - y0)
-        dist_bottom = abs(door_cy - (y0 + h0))
-        dist_left = abs(door_cx - x0)
-        dist_right = abs(door_cx - (x0 + w0))
-
-        self.door_side = min(
-            [
-                (dist_top, "top"),
-                (dist_bottom, "bottom"),
-                (dist_left, "left"),
-                (dist_right, "right"),
-            ],
-            key=lambda t: t[0],
-        )[1]
+        self.door_side = door_side if door_side is not None else compute_door_side(x, y, w, h, door)
 
         self.fill_rect_textured = fill_rect_textured
+        self.blit = blit if blit is not None else screen.blit
+        self.render_text = render_text
+        self.draw_lines = draw_lines if draw_lines is not None else self._draw_lines
+        self.world_to_screen = world_to_screen if world_to_screen is not None else self._world_to_screen
+        self.on_door_blocking = on_door_blocking
 
     def interact_door(self):
         """
@@ -113,7 +151,9 @@ class Room:
         - Keyframe 1 (t=1): door_progress = 1.0 (porta aberta)
         
         A posição atual da porta é calculada por interpolação linear entre os keyframes.
+        Se a porta passa a bloquear ou deixa de bloquear, avisa on_door_blocking.
         """
+        blocking = self.is_door_blocking()
         if self.door_opening:
             if not self.door_open:
                 self.door_progress += self.door_speed * dt
@@ -127,6 +167,9 @@ class Room:
                     self.door_progress = 0.0
                     self.door_open = False
                     self.door_opening = False
+        
+        if self.on_door_blocking is not None and self.is_door_blocking() != blocking:
+            self.on_door_blocking(self)
 
     def get_door_collision_rect(self):
         """
@@ -155,17 +198,19 @@ class Room:
         """Verifica se a porta está bloqueando passagem (não totalmente aberta)"""
         return self.door_progress < 0.9  
 
+    def _draw_lines(self, segments, color):
+        """Desenha os segmentos (x0, y0, x1, y1) um a um com draw_line (sem draw_lines)."""
+        for x0, y0, x1, y1 in segments:
+            self.draw_line(x0, y0, x1, y1, color)
+
     def draw_desk(self, x, y, w, h):
         """
-        Desenha uma mesa usando fill_rect (Scanline) e set_pixel
+        Desenha uma mesa usando fill_rect (Scanline) e draw_lines
         ------------------------
         Mesa retangular com tampo marrom e bordas
         """
         self.fill_rect(x, y, w, h, LIGHT_BROWN)
-        self.draw_line(x, y, x + w, y, DARK_BROWN)
-        self.draw_line(x, y + h, x + w, y + h, DARK_BROWN)
-        self.draw_line(x, y, x, y + h, DARK_BROWN)
-        self.draw_line(x + w, y, x + w, y + h, DARK_BROWN)
+        self.draw_lines(rect_segments(x, y, w, h), DARK_BROWN)
         leg_w, leg_h = 3, 4
         self.fill_rect(x + 2, y + h, leg_w, leg_h, BROWN)
         self.fill_rect(x + w - leg_w - 2, y + h, leg_w, leg_h, BROWN)
@@ -181,19 +226,21 @@ class Room:
         back_thickness = 3
         
         self.fill_rect(x, y, seat_w, seat_h, BROWN)
-        self.draw_line(x, y, x + seat_w, y, DARK_BROWN)
-        self.draw_line(x, y + seat_h, x + seat_w, y + seat_h, DARK_BROWN)
-        self.draw_line(x, y, x, y + seat_h, DARK_BROWN)
-        self.draw_line(x + seat_w, y, x + seat_w, y + seat_h, DARK_BROWN)
-        
-        if facing == "up":
-            self.fill_rect(x, y - back_thickness, seat_w, back_thickness, DARK_BROWN)
-        elif facing == "down":
-            self.fill_rect(x, y + seat_h, seat_w, back_thickness, DARK_BROWN)
-        elif facing == "left":
-            self.fill_rect(x - back_thickness, y, back_thickness, seat_h, DARK_BROWN)
-        elif facing == "right":
-            self.fill_rect(x + seat_w, y, back_thickness, seat_h, DARK_BROWN)
+        self.draw_lines(rect_segments(x, y, seat_w, seat_h), DARK_BROWN)
+        
+        if facing not in FACING_ANGLES:
+            return
+        
+        """Direção do encosto: a direção "para cima" (0, -1) rotacionada pela orientação"""
+        dx, dy = Affine.rotation(FACING_ANGLES[facing]).apply(0, -1)
+        dx, dy = round(dx), round(dy)
+        
+        """O encosto encosta no lado do assento apontado por (dx, dy)"""
+        back_x = x + seat_w if dx > 0 else x - back_thickness if dx < 0 else x
+        back_y = y + seat_h if dy > 0 else y - back_thickness if dy < 0 else y
+        back_w = back_thickness if dx else seat_w
+        back_h = back_thickness if dy else seat_h
+        self.fill_rect(back_x, back_y, back_w, back_h, DARK_BROWN)
 
     def draw_classroom_furniture(self):
         """
@@ -237,11 +284,13 @@ class Room:
         table_radius = 30
         
         self.fill_circle(table_cx, table_cy, table_radius, LIGHT_BROWN)
+        outline = []
         for angle in range(0, 360, 5):
             rad = math.radians(angle)
             px = table_cx + int(table_radius * math.cos(rad))
             py = table_cy + int(table_radius * math.sin(rad))
-            self.draw_line(px, py, px + 1, py, DARK_BROWN)
+            outline.append((px, py, px + 1, py))
+        self.draw_lines(outline, DARK_BROWN)
         
         # Desenha 6 cadeiras ao redor da mesa no GESAD
         chair_distance = table_radius + 20
@@ -273,6 +322,75 @@ class Room:
         e a lousa dentro da sala com o texto da tarefa.
         Usa as funções draw_line e fill_rect com transformação de câmera.
         """
+        self.draw_static()
+        self.draw_door()
+
+    def get_static_state(self):
+        """
+        Estado que altera a parte estática da sala (lousa concluída e texto).
+        Usado como chave da camada em cache (RoomLayerCache).
+        """
+        return (self.completed, self.board_text)
+
+    def _world_to_screen(self, x, y):
+        """Converte um ponto do mundo para a tela com os parâmetros de get_camera (ver Camera.world_to_screen)."""
+        cam_x, cam_y, zoom, width, height = self.get_camera()
+        return int((x - cam_x) * zoom + width / 2), int((y - cam_y) * zoom + height / 2)
+
+    def _render_text(self, text, size, color):
+        """
+        Renderiza um texto em Arial (pelo cache compartilhado, se houver).
+        Sem render_text, a fonte de tamanho 12 é criada no primeiro uso e
+        guardada; os outros tamanhos são criados a cada chamada.
+        """
+        if self.render_text is not None:
+            return self.render_text(text, size, color)
+        pygame.font.init()
+        if size != 12:
+            return pygame.font.SysFont('Arial', size).render(text, True, color)
+        if self.font is None:
+            self.font = pygame.font.SysFont('Arial', 12)
+        return self.font.render(text, True, color)
+
+    def draw_door(self):
+        """
+        Desenha a Porta (retângulo amarelo) com animação
+        ------------------------
+        Parte dinâmica da sala: muda a cada frame durante a animação,
+        por isso não faz parte da camada estática (ver RoomLayerCache).
+        Usa Interpolação Linear para posição da porta:
+        pos_atual = pos_inicial + (pos_final - pos_inicial) * progress
+        Ou seja: pos_atual = lerp(pos_inicial, pos_final, progress)
+        Onde progress varia de 0.0 (fechada) a 1.0 (aberta).
+        """
+        dx, dy, dw, dh = self.door
+        side = self.door_side
+        
+        if side in ["top", "bottom"]:
+            offset = int(dw * self.door_progress)  
+            door_draw_x = dx + offset
+            door_draw_w = dw - offset 
+            
+            if door_draw_w > 0:
+                self.fill_rect(door_draw_x, dy, door_draw_w, dh, YELLOW)
+                self.draw_lines(rect_segments(door_draw_x, dy, door_draw_w, dh), DARK_YELLOW)
+        else:
+            offset = int(dh * self.door_progress)
+            door_draw_y = dy + offset
+            door_draw_h = dh - offset  
+            
+            if door_draw_h > 0:
+                self.fill_rect(dx, door_draw_y, dw, door_draw_h, YELLOW)
+                self.draw_lines(rect_segments(dx, door_draw_y, dw, door_draw_h), DARK_YELLOW)
+
+    def draw_static(self):
+        """
+        Desenha a parte estática da sala
+        ------------------------
+        Piso, borda, paredes, móveis e lousa com o texto da tarefa.
+        Só muda com o zoom ou com get_static_state(), por isso pode ser
+        renderizada uma vez em uma camada (RoomLayerCache).
+        """
 
         WALL_TEXTURE = "brick"
         WALL_THICKNESS = 10
@@ -290,10 +408,7 @@ class Room:
         
         """ Borda preta do retângulo da sala """
         BLACK = (0, 0, 0)
-        self.draw_line(self.x, self.y, self.x + self.w, self.y, BLACK)
-        self.draw_line(self.x, self.y + self.h, self.x + self.w, self.y + self.h, BLACK)
-        self.draw_line(self.x, self.y, self.x, self.y + self.h, BLACK)
-        self.draw_line(self.x + self.w, self.y, self.x + self.w, self.y + self.h, BLACK)
+        self.draw_lines(rect_segments(self.x, self.y, self.w, self.h), BLACK)
         
         dx, dy, dw, dh = self.door
         x, y, w, h = self.x, self.y, self.w, self.h
@@ -325,38 +440,6 @@ class Room:
         else:
             wall(x + w - WALL_THICKNESS, y, WALL_THICKNESS, h)
 
-        """ 
-        Desenha a Porta (retângulo amarelo) com animação
-        ------------------------
-        Usa Interpolação Linear para posição da porta:
-        pos_atual = pos_inicial + (pos_final - pos_inicial) * progress
-        Ou seja: pos_atual = lerp(pos_inicial, pos_final, progress)
-        Onde progress varia de 0.0 (fechada) a 1.0 (aberta).
-        """
-        
-        if side in ["top", "bottom"]:
-            offset = int(dw * self.door_progress)  
-            door_draw_x = dx + offset
-            door_draw_w = dw - offset 
-            
-            if door_draw_w > 0:
-                self.fill_rect(door_draw_x, dy, door_draw_w, dh, YELLOW)
-                self.draw_line(door_draw_x, dy, door_draw_x + door_draw_w, dy, DARK_YELLOW)
-                self.draw_line(door_draw_x, dy + dh, door_draw_x + door_draw_w, dy + dh, DARK_YELLOW)
-                self.draw_line(door_draw_x, dy, door_draw_x, dy + dh, DARK_YELLOW)
-                self.draw_line(door_draw_x + door_draw_w, dy, door_draw_x + door_draw_w, dy + dh, DARK_YELLOW)
-        else:
-            offset = int(dh * self.door_progress)
-            door_draw_y = dy + offset
-            door_draw_h = dh - offset  
-            
-            if door_draw_h > 0:
-                self.fill_rect(dx, door_draw_y, dw, door_draw_h, YELLOW)
-                self.draw_line(dx, door_draw_y, dx + dw, door_draw_y, DARK_YELLOW)
-                self.draw_line(dx, door_draw_y + door_draw_h, dx + dw, door_draw_y + door_draw_h, DARK_YELLOW)
-                self.draw_line(dx, door_draw_y, dx, door_draw_y + door_draw_h, DARK_YELLOW)
-                self.draw_line(dx + dw, door_draw_y, dx + dw, door_draw_y + door_draw_h, DARK_YELLOW)
-
         """ Desenha móveis (mesas e cadeiras) """
         if self.is_meeting_room:
             self.draw_meeting_room_furniture()
@@ -371,18 +454,14 @@ class Room:
         frame_color = (139, 90, 43)  
         frame_thickness = 3
         
-        """Borda externa (moldura)"""
+        """Borda externa (moldura): frame_thickness retângulos, um pixel maior a cada volta"""
+        frame = []
         for i in range(frame_thickness):
-            self.draw_line(bx - i, by - i, bx + bw + i, by - i, frame_color)          
-            self.draw_line(bx - i, by + bh + i, bx + bw + i, by + bh + i, frame_color)  
-            self.draw_line(bx - i, by - i, bx - i, by + bh + i, frame_color)          
-            self.draw_line(bx + bw + i, by - i, bx + bw + i, by + bh + i, frame_color)  
+            frame += rect_segments(bx - i, by - i, bw + 2 * i, bh + 2 * i)
+        self.draw_lines(frame, frame_color)
         
         """Borda interna branca (giz)"""
-        self.draw_line(bx, by, bx + bw, by, CHALK)          
-        self.draw_line(bx, by, bx, by + bh, CHALK)           
-        self.draw_line(bx + bw, by, bx + bw, by + bh, CHALK)  
-        self.draw_line(bx, by + bh, bx + bw, by + bh, CHALK)  
+        self.draw_lines(rect_segments(bx, by, bw, bh), CHALK)
         
         """Desenha o texto na lousa (como se fosse escrito com giz), quando a tarefa está completa"""
         if self.completed:
@@ -394,14 +473,114 @@ class Room:
         
         """Renderiza o texto e desenha na tela (com transformação de câmera)"""
         if self.get_camera:
-            cam_x, cam_y, zoom, width, height = self.get_camera()
-            screen_x = int((bx + bw // 2 - cam_x) * zoom + width / 2)
-            screen_y = int((by + bh // 2 - cam_y) * zoom + height / 2)
-            scaled_font = pygame.font.SysFont('Arial', int(12 * zoom))
-            text_surface = scaled_font.render(text, True, text_color)
+            zoom = self.get_camera()[2]
+            screen_x, screen_y = self.world_to_screen(bx + bw // 2, by + bh // 2)
+            text_surface = self._render_text(text, int(12 * zoom), text_color)
             text_rect = text_surface.get_rect(center=(screen_x, screen_y))
         else:
-            text_surface = self.font.render(text, True, text_color)
+            text_surface = self._render_text(text, 12, text_color)
             text_rect = text_surface.get_rect(center=(bx + bw // 2, by + bh // 2))
         
-        self.screen.blit(text_surface, text_rect)
\ No newline at end of file
+        self.blit(text_surface, text_rect)
+
+class RoomLayerCache:
+    """
+    RoomLayerCache
+    ----------------------
+    Cache de camadas estáticas das salas.
+    A parte estática de cada sala (Room.draw_static) é renderizada uma única vez
+    em uma superfície no espaço do mundo, na escala do zoom atual da câmera.
+    A cada frame a camada é apenas copiada (blit) na posição da sala na tela
+    e a porta (parte dinâmica) é desenhada por cima.
+    
+    A camada de uma sala é refeita quando o zoom muda (zoom_in, zoom_out,
+    reset_zoom) ou quando o estado estático da sala muda (Room.get_static_state).
+    
+    O cache é LRU com orçamento de pixels: no zoom 5 a camada de uma sala de
+    400x180 tem cerca de 1,8 milhão de pixels (7 MB), então guardar todas as
+    salas de uma fase grande esgotaria a memória. Quando a soma das camadas
+    passa de max_pixels, as camadas desenhadas há mais tempo (salas que
+    saíram da tela) são descartadas e refeitas se voltarem a aparecer.
+    """
+    
+    """Cor transparente (colorkey) das margens da camada"""
+    COLORKEY = (255, 0, 255)
+    
+    """Margem (em pixels) ao redor da sala, para as bordas desenhadas em x + w e y + h"""
+    PAD = 2
+    
+    def __init__(self, graphics, camera, max_pixels=16 * 1024 * 1024):
+        """
+        Parâmetros:
+        - graphics: Instância de Graphics (usada para renderizar as camadas)
+        - camera: Câmera principal do jogo
+        - max_pixels: Soma máxima dos pixels das camadas guardadas (16 M = 64 MB
+                      em 32 bits: folga para as salas visíveis no zoom máximo)
+        """
+        self.graphics = graphics
+        self.camera = camera
+        self.zoom = camera.zoom
+        self.max_pixels = max_pixels
+        self.layers = OrderedDict()
+        self.pixels = 0
+    
+    def invalidate(self, room=None):
+        """Descarta a camada de uma sala (ou de todas, se room for None)."""
+        if room is None:
+            self.layers.clear()
+            self.pixels = 0
+        else:
+            cached = self.layers.pop(room, None)
+            if cached is not None:
+                self.pixels -= cached[1].get_width() * cached[1].get_height()
+    
+    def get_layer(self, room):
+        """
+        Retorna a superfície da camada da sala, renderizando-a
+        se ainda não existe ou se está desatualizada.
+        O canto (room.x, room.y) da sala fica no pixel (PAD, PAD) da camada.
+        """
+        if self.camera.zoom != self.zoom:
+            self.zoom = self.camera.zoom
+            self.invalidate()
+        
+        state = room.get_static_state()
+        cached = self.layers.get(room)
+        if cached is not None and cached[0] == state:
+            self.layers.move_to_end(room)
+            return cached[1]
+        self.invalidate(room)
+        
+        layer_w = int(room.w * self.zoom) + 2 * self.PAD
+        layer_h = int(room.h * self.zoom) + 2 * self.PAD
+        
+        surface = pygame.Surface((layer_w, layer_h), 0, self.graphics.screen)
+        surface.fill(self.COLORKEY)
+        surface.set_colorkey(self.COLORKEY)
+        
+        """
+        Câmera da camada: posicionada no canto da sala, com área de desenho
+        de 2*PAD pixels, de modo que o canto caia exatamente no pixel (PAD, PAD)
+        """
+        layer_camera = Camera(2 * self.PAD, 2 * self.PAD)
+        layer_camera.zoom = self.zoom
+        layer_camera.update(room.x, room.y)
+        
+        with self.graphics.render_target(surface, layer_camera):
+            room.draw_static()
+        
+        self.layers[room] = (state, surface)
+        self.pixels += layer_w * layer_h
+        
+        """Descarta as camadas usadas há mais tempo até caber no orçamento (a nova sempre fica)"""
+        while self.pixels > self.max_pixels and len(self.layers) > 1:
+            _, (_, old) = self.layers.popitem(last=False)
+            self.pixels -= old.get_width() * old.get_height()
+        return surface
+    
+    def draw(self, room):
+        """Desenha a sala: copia a camada estática e desenha a porta por cima."""
+        surface = self.get_layer(room)
+        sx, sy = self.camera.world_to_screen(room.x, room.y)
+        self.graphics.blit(surface, (sx - self.PAD, sy - self.PAD))
+        room.draw_door()
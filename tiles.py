@@ -0,0 +1,193 @@
+import multiprocessing
+import os
+from multiprocessing import shared_memory
+
+import pygame
+
+from constants import TILE_SIZE, TILE_MIN_AREA
+from camera import Camera
+from graphics import Graphics
+
+
+""" Formato dos pixels do framebuffer compartilhado (4 bytes por pixel, sem canal alfa) """
+PIXEL_FORMAT = "RGBX"
+
+
+def tile_rects(width, height, size=TILE_SIZE):
+    """
+    Divide a tela em tiles
+    ------------------------
+    Retorna a lista de (x, y, w, h) dos tiles de size x size que cobrem a
+    tela width x height, linha por linha (os da borda podem ser menores).
+    """
+    return [(x, y, min(size, width - x), min(size, height - y))
+            for y in range(0, height, size)
+            for x in range(0, width, size)]
+
+
+def run_commands(graphics, commands, tiles):
+    """
+    Executa os comandos de desenho nos tiles dados
+    ------------------------
+    Cada comando é (nome do método do Graphics, x, y, w, h, *argumentos),
+    em coordenadas de tela. Em cada tile o Graphics desenha em uma
+    subsuperfície do framebuffer (que divide os pixels com ele, sem cópia),
+    com o comando transladado para a origem do tile: o recorte de cada
+    primitiva fica restrito ao tile e as texturas mantêm a fase da tela.
+    """
+    for tx, ty, tw, th in tiles:
+        tile_commands = [command for command in commands
+                         if command[1] < tx + tw and command[1] + command[3] > tx
+                         and command[2] < ty + th and command[2] + command[4] > ty]
+        if not tile_commands:
+            continue
+        with graphics.render_target(graphics.screen.subsurface((tx, ty, tw, th)), graphics.camera):
+            for name, x, y, w, h, *args in tile_commands:
+                getattr(graphics, name)(x - tx, y - ty, w, h, *args, use_camera=False)
+
+
+def _tile_worker(connection, name, width, height, tiles):
+    """
+    Processo de renderização
+    ------------------------
+    Abre o framebuffer compartilhado, espera listas de comandos pela
+    conexão, desenha-as nos seus tiles (run_commands) e responde quando
+    termina. None encerra o processo.
+    """
+    memory = shared_memory.SharedMemory(name=name)
+    surface = pygame.image.frombuffer(memory.buf, (width, height), PIXEL_FORMAT)
+    graphics = Graphics(surface, Camera(width, height))
+    try:
+        while True:
+            commands = connection.recv()
+            if commands is None:
+                break
+            run_commands(graphics, commands, tiles)
+            connection.send(True)
+    finally:
+        graphics.flush()
+        del graphics, surface
+        memory.close()
+
+
+class TileRenderer:
+    """
+    Classe TileRenderer
+    --------------------
+    Renderização em tiles com vários processos (modo --tiles do loop principal).
+    O framebuffer do jogo fica em memória compartilhada
+    (multiprocessing.shared_memory): surface é uma superfície do Pygame sobre
+    essa memória, usada como tela do Graphics. Os preenchimentos de tela
+    cheia (fill_rect, fill_rect_textured, fill_dither com área visível de
+    pelo menos min_area pixels) são enviados a todos os processos, e cada
+    um desenha a sua parte dos tiles direto na memória compartilhada.
+    Nenhum tile é copiado na composição: o frame já está pronto em surface
+    quando todos respondem. Para apresentar, porém, surface ainda é copiada
+    inteira para a janela uma vez por frame (o Pygame não usa uma memória
+    externa como superfície da janela).
+
+    Os tiles são distribuídos alternadamente entre os processos, para que
+    cada um receba partes de todas as regiões da tela.
+
+    Se um processo morre (conexão quebrada), os outros são encerrados e o
+    TileRenderer passa a recusar os preenchimentos (failed): o Graphics
+    volta a desenhar tudo localmente no mesmo framebuffer.
+
+    Experimental: o envio dos comandos e a espera pelos processos custam
+    mais que o desenho em máquinas com poucos núcleos; só compensa com
+    vários núcleos livres.
+    """
+
+    def __init__(self, width, height, workers, tile_size=TILE_SIZE, min_area=TILE_MIN_AREA):
+        """
+        Parâmetros:
+        - width, height: Tamanho do framebuffer (tela)
+        - workers: Número de processos de renderização
+        - tile_size: Lado dos tiles em pixels
+        - min_area: Área visível mínima (pixels) de um preenchimento para ir aos processos
+        """
+        self.width = width
+        self.height = height
+        self.min_area = min_area
+        self.memory = shared_memory.SharedMemory(create=True, size=width * height * 4)
+        self.surface = pygame.image.frombuffer(self.memory.buf, (width, height), PIXEL_FORMAT)
+        self.tiles = tile_rects(width, height, tile_size)
+        self.failed = False
+
+        """spawn: os processos não herdam o estado do Pygame (janela, áudio) do processo principal"""
+        context = multiprocessing.get_context("spawn")
+        os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+        self.connections = []
+        self.processes = []
+        for index in range(workers):
+            connection, child = context.Pipe()
+            process = context.Process(
+                target=_tile_worker, name=f"tiles-{index}", daemon=True,
+                args=(child, self.memory.name, width, height, self.tiles[index::workers]))
+            process.start()
+            self.connections.append(connection)
+            self.processes.append(process)
+
+    def accepts(self, surface, area):
+        """True se um preenchimento de area pixels em surface deve ir aos processos."""
+        return not self.failed and surface is self.surface and area >= self.min_area
+
+    def run(self, commands):
+        """
+        Envia os comandos a todos os processos e espera todos terminarem os seus tiles
+        ------------------------
+        Retorna False se algum processo morreu (BrokenPipeError no envio,
+        EOFError na resposta): nesse caso nenhum processo continua desenhando
+        e quem chamou deve desenhar os comandos localmente.
+        """
+        if self.failed:
+            return False
+        try:
+            for connection in self.connections:
+                connection.send(commands)
+            for connection in self.connections:
+                connection.recv()
+        except (EOFError, OSError):
+            self.fail()
+            return False
+        return True
+
+    def fail(self):
+        """
+        Desiste dos processos depois que um deles morreu
+        ------------------------
+        Os restantes são terminados (e esperados) para que nenhum escreva no
+        framebuffer depois do desenho local; a memória compartilhada continua
+        sendo a tela do jogo até close.
+        """
+        print("Aviso: um processo de renderização em tiles terminou; desenhando sem tiles")
+        self.failed = True
+        for process in self.processes:
+            process.terminate()
+        for process in self.processes:
+            process.join(1.0)
+        for connection in self.connections:
+            connection.close()
+        self.connections, self.processes = [], []
+
+    def close(self):
+        """Encerra os processos (mesmo que algum já tenha morrido) e libera a memória compartilhada."""
+        for connection in self.connections:
+            try:
+                connection.send(None)
+            except OSError:
+                pass
+        for process in self.processes:
+            process.join(1.0)
+            if process.is_alive():
+                process.terminate()
+        for connection in self.connections:
+            connection.close()
+        self.connections, self.processes = [], []
+        self.surface = None
+        try:
+            self.memory.close()
+        except BufferError:
+            """Ainda há superfícies do jogo sobre a memória: ela é liberada no fim do processo"""
+            pass
+        self.memory.unlink()
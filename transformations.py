@@ -52,3 +52,76 @@ def translate_point(x, y, dx, dy):
     - Tupla com as coordenadas transladadas
     """
     return x + dx, y + dy
+
+
+class Affine:
+    """
+    Classe Affine
+    --------------
+    Transformação afim 2D representada por uma matriz 3x3 em coordenadas homogêneas:
+    
+        | a  b  c |   | x |
+        | d  e  f | * | y |
+        | 0  0  1 |   | 1 |
+    
+    ou seja, x' = a*x + b*y + c e y' = d*x + e*y + f.
+    
+    As transformações são compostas com o operador @ (produto de matrizes):
+    (A @ B) aplica primeiro B e depois A. Assim um modelo inteiro (pás de um
+    ventilador, por exemplo) é levado do espaço local para o mundo com uma única
+    matriz (translate @ rotate @ scale), calculando seno e cosseno uma vez só,
+    e aplicada a todos os segmentos em uma passada (apply_segments); a
+    conversão para a tela fica com a câmera.
+    """
+    
+    __slots__ = ("a", "b", "c", "d", "e", "f")
+    
+    def __init__(self, a=1.0, b=0.0, c=0.0, d=0.0, e=1.0, f=0.0):
+        """Cria a matriz a partir das duas primeiras linhas (padrão: identidade)."""
+        self.a, self.b, self.c = a, b, c
+        self.d, self.e, self.f = d, e, f
+    
+    @classmethod
+    def translation(cls, dx, dy):
+        """Matriz de translação por (dx, dy)."""
+        return cls(1.0, 0.0, dx, 0.0, 1.0, dy)
+    
+    @classmethod
+    def rotation(cls, angle, cx=0.0, cy=0.0):
+        """Matriz de rotação por angle (radianos) em torno de (cx, cy)."""
+        cos_a = math.cos(angle)
+        sin_a = math.sin(angle)
+        return cls(
+            cos_a, -sin_a, cx - cx * cos_a + cy * sin_a,
+            sin_a, cos_a, cy - cx * sin_a - cy * cos_a,
+        )
+    
+    @classmethod
+    def scaling(cls, sx, sy=None, cx=0.0, cy=0.0):
+        """Matriz de escala por (sx, sy) em relação a (cx, cy); sy = sx se omitido."""
+        if sy is None:
+            sy = sx
+        return cls(sx, 0.0, cx - cx * sx, 0.0, sy, cy - cy * sy)
+    
+    def __matmul__(self, other):
+        """Composição: (self @ other) aplica other e depois self."""
+        a, b, c, d, e, f = self.a, self.b, self.c, self.d, self.e, self.f
+        return Affine(
+            a * other.a + b * other.d, a * other.b + b * other.e, a * other.c + b * other.f + c,
+            d * other.a + e * other.d, d * other.b + e * other.e, d * other.c + e * other.f + f,
+        )
+    
+    def apply(self, x, y):
+        """Transforma um ponto (x, y)."""
+        return self.a * x + self.b * y + self.c, self.d * x + self.e * y + self.f
+    
+    def apply_segments(self, segments):
+        """Transforma uma lista de segmentos [(x0, y0, x1, y1), ...] em uma passada."""
+        a, b, c, d, e, f = self.a, self.b, self.c, self.d, self.e, self.f
+        return [
+            (a * x0 + b * y0 + c, d * x0 + e * y0 + f, a * x1 + b * y1 + c, d * x1 + e * y1 + f)
+            for x0, y0, x1, y1 in segments
+        ]
+    
+    def __repr__(self):
+        return f"Affine({self.a!r}, {self.b!r}, {self.c!r}, {self.d!r}, {self.e!r}, {self.f!r})"
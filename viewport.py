@@ -1,6 +1,9 @@
 import pygame
 import math
-from constants import WIDTH, HEIGHT, BLACK, WHITE, GRAY, RED
+from constants import BLACK, WHITE, GRAY, RED
+
+""" Cada célula do mini-mapa representa CELL_SIZE x CELL_SIZE pixels do mundo """
+CELL_SIZE = 10
 
 """ Cores para móveis no mini-mapa """
 BROWN = (139, 90, 43)
@@ -24,18 +27,44 @@ class Viewport:
         """
         self.screen = screen
         self.graphics = graphics
-        self.title_font = pygame.font.SysFont('Arial', 12)
+        
+        """Tamanho (em pixels do mundo) de cada célula do mini-mapa; definido pela fase"""
+        self.cell_size = CELL_SIZE
+        
+        """Matriz persistente do mini-mapa (ver update_matrix)"""
+        self.matrix_key = None
+        self.background = None
+        self.matrix = None
+        self.dynamic_layers = []
+        self.dynamic_colors = []
+        self.player_cells_drawn = []
+        self.dirty = set()
+        
+        """Superfícies em cache do mini-mapa (ver upload_matrix)"""
+        self.cell_surface = None
+        self.scaled_surface = None
+        self.scaled_scale = None
     
-    def create_matrix(self, player, rooms, walls, fan_positions=None, grid_width=90, grid_height=70):
+    def build_layers(self, rooms, fan_positions=None, grid_width=90, grid_height=70):
         """
-        Cria a matriz do mini-mapa
+        Camadas do mini-mapa
         ---------------------------
-        Converte o mundo de coordenadas para uma matriz com cores reais.
-        Cada célula da matriz representa 10x10 pixels do mundo.
-        Inclui mesas, cadeiras e ventiladores.
+        Converte o mundo para uma lista de camadas (células, cor) na ordem de pintura.
+        Cada célula da matriz representa cell_size x cell_size pixels do mundo.
+        Inclui salas, paredes, portas, lousas, mesas, cadeiras e ventiladores.
+        A cor das portas e lousas depende do estado da sala, por isso é uma
+        função (chamada a cada frame); as demais cores são fixas.
         """
-        cell_size = 10
-        matrix = [[WHITE for _ in range(grid_width)] for _ in range(grid_height)]
+        cell_size = self.cell_size
+        layers = []
+        
+        def rect_cells(i_start, i_end, j_start, j_end):
+            """Células (i, j) do intervalo [i_start, i_end) x [j_start, j_end) dentro da matriz"""
+            return [
+                (i, j)
+                for i in range(max(0, i_start), min(grid_height, i_end))
+                for j in range(max(0, j_start), min(grid_width, j_end))
+            ]
         
         for room in rooms:
             x_start = room.x // cell_size
@@ -43,61 +72,43 @@ class Viewport:
             x_end = (room.x + room.w) // cell_size
             y_end = (room.y + room.h) // cell_size
             
-            for i in range(max(0, y_start), min(grid_height, y_end)):
-                for j in range(max(0, x_start), min(grid_width, x_end)):
-                    matrix[i][j] = GRAY
+            layers.append((rect_cells(y_start, y_end, x_start, x_end), GRAY))
             
-            """Desenha as paredes da sala (preto para contrastar com fundo branco)"""
-            for j in range(max(0, x_start), min(grid_width, x_end)):
-                if 0 <= y_start < grid_height:
-                    matrix[y_start][j] = BLACK
-            for j in range(max(0, x_start), min(grid_width, x_end)):
-                if 0 <= y_end - 1 < grid_height:
-                    matrix[y_end - 1][j] = BLACK
-            for i in range(max(0, y_start), min(grid_height, y_end)):
-                if 0 <= x_start < grid_width:
-                    matrix[i][x_start] = BLACK
-            for i in range(max(0, y_start), min(grid_height, y_end)):
-                if 0 <= x_end - 1 < grid_width:
-                    matrix[i][x_end - 1] = BLACK
+            """Paredes da sala (preto para contrastar com fundo branco)"""
+            walls = []
+            if 0 <= y_start < grid_height:
+                walls += rect_cells(y_start, y_start + 1, x_start, x_end)
+            if 0 <= y_end - 1 < grid_height:
+                walls += rect_cells(y_end - 1, y_end, x_start, x_end)
+            if 0 <= x_start < grid_width:
+                walls += rect_cells(y_start, y_end, x_start, x_start + 1)
+            if 0 <= x_end - 1 < grid_width:
+                walls += rect_cells(y_start, y_end, x_end - 1, x_end)
+            layers.append((walls, BLACK))
 
-            """Desenha a porta na sala"""
+            """Porta da sala (amarela fechada, cinza aberta)"""
             dx, dy, dw, dh = room.door
-            door_x_start = dx // cell_size
-            door_y_start = dy // cell_size
-            door_x_end = (dx + dw) // cell_size
-            door_y_end = (dy + dh) // cell_size
-            
-            door_color = (255, 220, 0) if room.is_door_blocking() else (100, 100, 100)
-            
-            for i in range(max(0, door_y_start), min(grid_height, door_y_end + 1)):
-                for j in range(max(0, door_x_start), min(grid_width, door_x_end + 1)):
-                    if 0 <= i < grid_height and 0 <= j < grid_width:
-                        matrix[i][j] = door_color
+            door_cells = rect_cells(dy // cell_size, (dy + dh) // cell_size + 1,
+                                    dx // cell_size, (dx + dw) // cell_size + 1)
+            layers.append((door_cells, lambda room=room: (255, 220, 0) if room.is_door_blocking() else (100, 100, 100)))
 
+            """Lousa (verde claro quando a tarefa foi concluída)"""
             bx, by, bw, bh = room.button
-            btn_color = (40, 120, 40) if room.completed else (20, 80, 20)
-            btn_x_start = bx // cell_size
-            btn_y_start = by // cell_size
-            btn_x_end = (bx + bw) // cell_size
-            btn_y_end = (by + bh) // cell_size
+            btn_cells = rect_cells(by // cell_size, (by + bh) // cell_size + 1,
+                                   bx // cell_size, (bx + bw) // cell_size + 1)
+            layers.append((btn_cells, lambda room=room: (40, 120, 40) if room.completed else (20, 80, 20)))
             
-            for i in range(max(0, btn_y_start), min(grid_height, btn_y_end + 1)):
-                for j in range(max(0, btn_x_start), min(grid_width, btn_x_end + 1)):
-                    if 0 <= i < grid_height and 0 <= j < grid_width:
-                        matrix[i][j] = btn_color
-            
-            """ Desenha mesas e cadeiras no mini-mapa """
+            """ Mesas e cadeiras no mini-mapa """
             if room.is_meeting_room:
                 table_cx = (room.x + room.w // 2) // cell_size
                 table_cy = (room.y + room.h // 2 + 10) // cell_size
                 table_r = 3  
+                table_cells = []
                 for dy in range(-table_r, table_r + 1):
                     for dx in range(-table_r, table_r + 1):
                         if dx*dx + dy*dy <= table_r*table_r:
-                            ti, tj = table_cy + dy, table_cx + dx
-                            if 0 <= ti < grid_height and 0 <= tj < grid_width:
-                                matrix[ti][tj] = LIGHT_BROWN
+                            table_cells += rect_cells(table_cy + dy, table_cy + dy + 1, table_cx + dx, table_cx + dx + 1)
+                layers.append((table_cells, LIGHT_BROWN))
             else:
                 base_x = room.x + 30
                 base_y = room.y + 80
@@ -110,60 +121,144 @@ class Viewport:
                         my = base_y + row * gap_y
                         
                         """ Mesa no mini-mapa """
-                        mx_start = mx // cell_size
-                        my_start = my // cell_size
-                        mx_end = (mx + desk_w) // cell_size
-                        my_end = (my + desk_h) // cell_size
-                        
-                        for i in range(max(0, my_start), min(grid_height, my_end + 1)):
-                            for j in range(max(0, mx_start), min(grid_width, mx_end + 1)):
-                                if 0 <= i < grid_height and 0 <= j < grid_width:
-                                    matrix[i][j] = LIGHT_BROWN
-                        
-                        chair_x = mx + (desk_w - 12) // 2
-                        chair_y = my + desk_h + 5
-                        cx_start = chair_x // cell_size
-                        cy_start = chair_y // cell_size
+                        desk_cells = rect_cells(my // cell_size, (my + desk_h) // cell_size + 1,
+                                                mx // cell_size, (mx + desk_w) // cell_size + 1)
+                        layers.append((desk_cells, LIGHT_BROWN))
                         
-                        if 0 <= cy_start < grid_height and 0 <= cx_start < grid_width:
-                            matrix[cy_start][cx_start] = BROWN
+                        chair_x = (mx + (desk_w - 12) // 2) // cell_size
+                        chair_y = (my + desk_h + 5) // cell_size
+                        layers.append((rect_cells(chair_y, chair_y + 1, chair_x, chair_x + 1), BROWN))
         
         """ventiladores no mini-mapa"""
         if fan_positions is not None:
             fan_color = (100, 200, 255)  # Azul claro para os ventiladores
+            fan_radius = 1  # 1 célula de raio
             for fx, fy in fan_positions:
                 fan_cx = fx // cell_size
                 fan_cy = fy // cell_size
-                fan_radius = 1  # 1 célula de raio
                 
-                # Desenha círculo simples no minimapa
+                # Círculo simples no minimapa
+                fan_cells = []
                 for dy in range(-fan_radius, fan_radius + 1):
                     for dx in range(-fan_radius, fan_radius + 1):
                         if dx*dx + dy*dy <= fan_radius*fan_radius:
-                            fi = fan_cy + dy
-                            fj = fan_cx + dx
-                            if 0 <= fi < grid_height and 0 <= fj < grid_width:
-                                matrix[fi][fj] = fan_color
-        
-        """Desenha o jogador (vermelho, maior para visibilidade)"""
-        player_x = player.x // cell_size
-        player_y = player.y // cell_size
-        player_w = max(2, player.w // cell_size)
-        player_h = max(3, player.h // cell_size)
-        
-        for i in range(max(0, player_y), min(grid_height, player_y + player_h)):
-            for j in range(max(0, player_x), min(grid_width, player_x + player_w)):
-                if 0 <= i < grid_height and 0 <= j < grid_width:
-                    matrix[i][j] = RED
+                            fan_cells += rect_cells(fan_cy + dy, fan_cy + dy + 1, fan_cx + dx, fan_cx + dx + 1)
+                layers.append((fan_cells, fan_color))
+        
+        return layers
+    
+    def player_cells(self, player, grid_width=90, grid_height=70):
+        """Células ocupadas pelo jogador no mini-mapa (vermelho, maior para visibilidade)"""
+        player_x = int(player.x) // self.cell_size
+        player_y = int(player.y) // self.cell_size
+        player_w = max(2, player.w // self.cell_size)
+        player_h = max(3, player.h // self.cell_size)
+        return [
+            (i, j)
+            for i in range(max(0, player_y), min(grid_height, player_y + player_h))
+            for j in range(max(0, player_x), min(grid_width, player_x + player_w))
+        ]
+    
+    def create_matrix(self, player, rooms, walls, fan_positions=None, grid_width=90, grid_height=70):
+        """
+        Cria a matriz do mini-mapa do zero
+        ---------------------------
+        Pinta todas as camadas (build_layers) e o jogador em uma matriz nova.
+        O jogo usa update_matrix, que mantém a matriz entre frames.
+        """
+        matrix = [[WHITE for _ in range(grid_width)] for _ in range(grid_height)]
+        
+        for cells, color in self.build_layers(rooms, fan_positions, grid_width, grid_height):
+            if callable(color):
+                color = color()
+            for i, j in cells:
+                matrix[i][j] = color
+        
+        for i, j in self.player_cells(player, grid_width, grid_height):
+            matrix[i][j] = RED
         
         return matrix
     
+    def update_matrix(self, player, rooms, walls, fan_positions=None, grid_width=90, grid_height=70):
+        """
+        Atualiza a matriz persistente do mini-mapa
+        ---------------------------
+        Na primeira chamada (ou se as salas/tamanho mudarem) pinta o fundo
+        estático uma vez e guarda, para cada camada dinâmica (portas e lousas),
+        as células em que ela é a camada visível. Nos frames seguintes só
+        repinta as células dessas camadas cuja cor mudou e as células da
+        posição antiga e nova do jogador.
+        As células alteradas ficam em self.dirty até serem consumidas pelo draw.
+        Retorna a mesma matriz (self.matrix) a cada frame.
+        """
+        key = (id(rooms), len(rooms), id(fan_positions), grid_width, grid_height, self.cell_size)
+        if key != self.matrix_key:
+            self._build_background(rooms, fan_positions, grid_width, grid_height)
+            self.matrix_key = key
+        
+        background = self.background
+        matrix = self.matrix
+        changed = []
+        
+        """Camadas dinâmicas (porta aberta/fechada, lousa concluída)"""
+        for index, (color_fn, cells) in enumerate(self.dynamic_layers):
+            color = color_fn()
+            if color != self.dynamic_colors[index]:
+                self.dynamic_colors[index] = color
+                for i, j in cells:
+                    background[i][j] = color
+                changed += cells
+        
+        """Jogador: restaura as células antigas e pinta as novas"""
+        new_cells = self.player_cells(player, grid_width, grid_height)
+        moved = new_cells != self.player_cells_drawn
+        if moved:
+            changed += self.player_cells_drawn
+            self.player_cells_drawn = new_cells
+        
+        player_set = set(new_cells)
+        for i, j in changed:
+            if (i, j) not in player_set:
+                matrix[i][j] = background[i][j]
+        if changed or moved:
+            for i, j in new_cells:
+                matrix[i][j] = RED
+            self.dirty.update(changed)
+            self.dirty.update(new_cells)
+        
+        return matrix
+    
+    def _build_background(self, rooms, fan_positions, grid_width, grid_height):
+        """Pinta o fundo do mini-mapa e registra as células visíveis de cada camada dinâmica."""
+        background = [[WHITE for _ in range(grid_width)] for _ in range(grid_height)]
+        owner = [[None for _ in range(grid_width)] for _ in range(grid_height)]
+        
+        layers = self.build_layers(rooms, fan_positions, grid_width, grid_height)
+        for index, (cells, color) in enumerate(layers):
+            if callable(color):
+                color = color()
+            for i, j in cells:
+                background[i][j] = color
+                owner[i][j] = index
+        
+        self.dynamic_layers = []
+        self.dynamic_colors = []
+        for index, (cells, color) in enumerate(layers):
+            if callable(color):
+                visible = [(i, j) for i, j in cells if owner[i][j] == index]
+                self.dynamic_layers.append((color, visible))
+                self.dynamic_colors.append(background[visible[0][0]][visible[0][1]] if visible else None)
+        
+        self.background = background
+        self.matrix = [row[:] for row in background]
+        self.player_cells_drawn = []
+        self.dirty = {(i, j) for i in range(grid_height) for j in range(grid_width)}
     
     def draw_camera_bounds(self, camera, vp_x, vp_y, vp_scale=3):
         """Desenha um retângulo no mini-mapa mostrando a Janela (Window) atual."""
         from constants import BLUE
         
-        cell_size = 10  # Cada célula do minimapa = 10x10 pixels do mundo
+        cell_size = self.cell_size  # Cada célula do minimapa = cell_size x cell_size pixels do mundo
         
         # Obtém limites da Janela no mundo
         wx_min, wy_min, wx_max, wy_max = camera.get_window_bounds()
@@ -183,57 +278,71 @@ class Viewport:
         # Desenha retângulo azul mostrando a "Janela" atual
         for thickness in range(2):
             t = thickness
-            # Topo
-            self.graphics.draw_line(
-                rect_x + t, rect_y + t,
-                rect_x + rect_w - t, rect_y + t,
-                BLUE, use_camera=False
-            )
-            # Direita
-            self.graphics.draw_line(
-                rect_x + rect_w - t, rect_y + t,
-                rect_x + rect_w - t, rect_y + rect_h - t,
-                BLUE, use_camera=False
-            )
-            # Baixo
-            self.graphics.draw_line(
-                rect_x + rect_w - t, rect_y + rect_h - t,
-                rect_x + t, rect_y + rect_h - t,
-                BLUE, use_camera=False
-            )
-            # Esquerda
-            self.graphics.draw_line(
-                rect_x + t, rect_y + rect_h - t,
-                rect_x + t, rect_y + t,
-                BLUE, use_camera=False
+            # Topo, direita, baixo e esquerda
+            self.graphics.draw_polyline([
+                (rect_x + t, rect_y + t),
+                (rect_x + rect_w - t, rect_y + t),
+                (rect_x + rect_w - t, rect_y + rect_h - t),
+                (rect_x + t, rect_y + rect_h - t),
+            ], BLUE, closed=True, use_camera=False)
+    def upload_matrix(self, matrix, vp_scale):
+        """
+        Atualiza a superfície em cache do mini-mapa
+        ---------------------------
+        A matriz é copiada para uma superfície pequena com 1 pixel por célula
+        e depois ampliada para vp_scale em uma única operação.
+        Quando a matriz é a persistente (update_matrix), só as células em
+        self.dirty são reenviadas; se nada mudou a superfície ampliada é reaproveitada.
+        Retorna a superfície ampliada.
+        """
+        grid_height = len(matrix)
+        grid_width = len(matrix[0]) if grid_height > 0 else 0
+        
+        surface = self.cell_surface
+        if surface is None or surface.get_size() != (grid_width, grid_height) or matrix is not self.matrix:
+            surface = pygame.Surface((grid_width, grid_height), 0, self.screen)
+            pixels = pygame.PixelArray(surface)
+            for i, row in enumerate(matrix):
+                for j, color in enumerate(row):
+                    pixels[j, i] = color
+            pixels.close()
+            self.cell_surface = surface
+            self.scaled_surface = None
+        elif self.dirty:
+            pixels = pygame.PixelArray(surface)
+            for i, j in self.dirty:
+                pixels[j, i] = matrix[i][j]
+            pixels.close()
+            self.scaled_surface = None
+        self.dirty.clear()
+        
+        if self.scaled_surface is None or self.scaled_scale != vp_scale:
+            self.scaled_surface = pygame.transform.scale(
+                surface, (grid_width * vp_scale, grid_height * vp_scale)
             )
+            self.scaled_scale = vp_scale
+        return self.scaled_surface
+    
     def draw(self, matrix, vp_x, vp_y, vp_scale=3):
         """
-        Desenha o mini-mapa usando APENAS set_pixel
+        Desenha o mini-mapa
+        ---------------------------
+        Copia a superfície em cache do mini-mapa (upload_matrix) na posição
+        (vp_x, vp_y) e desenha a borda, o título e a Janela da câmera por cima.
         """
         grid_height = len(matrix)
         grid_width = len(matrix[0]) if grid_height > 0 else 0
         
-        for i, row in enumerate(matrix):
-            for j, color in enumerate(row):
-                for dy in range(vp_scale):
-                    for dx in range(vp_scale):
-                        px = vp_x + j * vp_scale + dx
-                        py = vp_y + i * vp_scale + dy
-                        if 0 <= px < WIDTH and 0 <= py < HEIGHT:
-                            self.screen.set_at((px, py), color)
+        self.graphics.blit(self.upload_matrix(matrix, vp_scale), (vp_x, vp_y))
         
         """Borda da viewport"""
         vp_width = grid_width * vp_scale
         vp_height = grid_height * vp_scale
-        self.graphics.draw_line(vp_x - 1, vp_y - 1, vp_x + vp_width, vp_y - 1, BLACK, False)
-        self.graphics.draw_line(vp_x - 1, vp_y + vp_height, vp_x + vp_width, vp_y + vp_height, BLACK, False)
-        self.graphics.draw_line(vp_x - 1, vp_y - 1, vp_x - 1, vp_y + vp_height, BLACK, False)
-        self.graphics.draw_line(vp_x + vp_width, vp_y - 1, vp_x + vp_width, vp_y + vp_height, BLACK, False)
+        self.graphics.draw_rect(vp_x - 1, vp_y - 1, vp_width + 1, vp_height + 1, BLACK, False)
         
         """Título do mini-mapa"""
-        title = self.title_font.render("MAPA NC2A", True, BLACK)
-        self.screen.blit(title, (vp_x + vp_width // 2 - title.get_width() // 2, vp_y - 15))
+        title = self.graphics.render_text("MAPA NC2A", 12, BLACK)
+        self.graphics.blit(title, (vp_x + vp_width // 2 - title.get_width() // 2, vp_y - 15))
         
         #desenha janela no minimapa        
         self.draw_camera_bounds(self.graphics.camera, vp_x, vp_y, vp_scale)
\ No newline at end of file